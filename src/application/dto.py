@@ -1,6 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List
 from src.domain.metrics.base import MetricResult
+from src.domain.common.tracing import Span
 
 
 # DATA TRANSFER OBJECT
@@ -18,4 +19,5 @@ class ExperimentDTO:
     algorithm_name: str
     metric_results: List[MetricResult]
     metadata: Dict[str, Any]
+    spans: List[Span] = field(default_factory=list)
 
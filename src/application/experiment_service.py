@@ -1,15 +1,23 @@
 from __future__ import annotations
 
-import time
-from typing import Any, Optional, Dict
+import os
+from typing import Any, List, Optional, Dict, Tuple
+
+import numpy as np
 
 from src.domain.transforms.registry import TransformRegistry
+from src.domain.transforms.base import GraphTransform
+from src.domain.transforms.pipeline import Pipeline, is_pipeline, stage_names
 from src.domain.graph_model import Graph, RunParams
 from src.domain.experiment import Experiment
 from src.domain.sparsifiers.registry import SparsifierRegistry
 from src.domain.metrics.registry import MetricRegistry
 from src.domain.metrics.base import MetricResult
+from src.domain.metrics.plan import ExecutionPlan
+from src.domain.common.tracing import Tracer, span
+from src.domain.oracle import LandmarkIndex
 
+from src.infrastructure.generators import DEFAULT_CHUNK
 from src.infrastructure.graph_gateway import GraphGateway, GraphSource
 from src.infrastructure.persistence.repo import GraphRepository, ExperimentRepository
 from src.infrastructure.persistence.unit_of_work import UnitOfWork
@@ -31,7 +39,9 @@ class ExperimentService:
         """
         imports a graph into the service store and returns an internal handle
         """
-        graph = self.gateway.load(source)
+        return self._store(self.gateway.load(source))
+
+    def _store(self, graph: Graph) -> str:
         key = graph.name
 
         # TODO: collision logic
@@ -40,11 +50,7 @@ class ExperimentService:
             while self.graph_repo.get(f"{key}_{i}") is not None:
                 i += 1
             key = f"{key}_{i}"
-            graph = Graph.from_networkx(
-                graph.to_networkx(copy=True),
-                name=key,
-                metadata=dict(graph.metadata)
-            )
+            graph = graph.view(name=key, metadata=graph.metadata)
         self.graph_repo.save(graph)
         return key
 
@@ -58,6 +64,27 @@ class ExperimentService:
     def list_graphs(self) -> list[str]:
         return self.graph_repo.list_names()
 
+    def build_index(self, graph_key: str, landmarks: int = 16, seed: int = 420,
+                    path: Optional[str] = None) -> LandmarkIndex:
+        """
+        landmark distance oracle of a stored graph, built once and kept in the repository next to
+        the graph; with `path` the tables are also written to disk (or loaded from there)
+        """
+        index = self.graph_repo.get_index(graph_key, "landmarks")
+        if index is not None and len(index.landmarks) >= landmarks:
+            return index
+
+        graph = self.get_graph(graph_key)
+        with span("index", graph=graph_key, landmarks=landmarks):
+            if path is not None and os.path.exists(path):
+                index = LandmarkIndex.load(path, graph)
+            else:
+                index = LandmarkIndex.build(graph, landmarks=landmarks, seed=seed)
+                if path is not None:
+                    index.save(path)
+        self.graph_repo.save_index(graph_key, "landmarks", index)
+        return index
+
     def run_sparsifier(
         self,
         graph_key: str,
@@ -67,8 +94,6 @@ class ExperimentService:
         """
         applies a sparsifier using [LAYER SUPERTYPE] execute method and returns a graph object
         """
-        SparsifierRegistry.discover()
-
         G = self.get_graph(graph_key)
         sparsifier = SparsifierRegistry.get(sparsifier_name)
 
@@ -76,6 +101,60 @@ class ExperimentService:
         return sparsifier.execute(G, RunParams(params))
 
 
+    def stream_sparsify(
+        self,
+        source: GraphSource,
+        sparsifier_name: str,
+        params: Dict[str, Any],
+        path: str,
+        chunk_size: int = DEFAULT_CHUNK,
+    ) -> str:
+        """
+        out-of-core run of an edge-local sparsifier: the source edges are read in chunks (once per
+        pass of the sparsifier's EdgeFilter), kept edges are appended to `path` as they are decided
+        and the result is registered as a lazy graph. memory is O(n + chunk_size), never O(m)
+        (O(n log(max degree)) for local_degree). metadata["approximate"] marks filters whose
+        selection differs from the sparsifier's in-memory run()
+        """
+        sparsifier = SparsifierRegistry.get(sparsifier_name)
+        edge_filter = sparsifier.stream_filter(RunParams(params))
+        if edge_filter is None:
+            raise ValueError(f"sparsifier '{sparsifier_name}' has no streaming mode (its decisions are not edge-local)")
+
+        n, directed, weighted = self.gateway.stream_shape(source)
+        chunks = lambda: self.gateway.iter_edge_chunks(source, chunk_size)
+        counts = {"edges_in": 0, "edges_out": 0}
+
+        def kept_chunks():
+            for src, dst, weights in chunks():
+                mask = edge_filter.keep(src, dst, weights)
+                counts["edges_in"] += len(src)
+                counts["edges_out"] += int(np.count_nonzero(mask))
+                yield src[mask], dst[mask], None if weights is None else weights[mask]
+
+        with span("stream_sparsify", algorithm=sparsifier_name, source=source.name, passes=edge_filter.passes) as s:
+            edge_filter.prepare(chunks, n, directed)
+            output = self.gateway.write_edge_chunks(kept_chunks(), path, directed=directed, weighted=weighted, n=n,
+                                                    labels=self.gateway.stream_labels(source))
+            s.set(state_bytes=edge_filter.state_bytes(), **counts, **edge_filter.stats())
+
+        output.name = f"{source.name}_{sparsifier_name}_stream"
+        graph = self.gateway.load(output)
+        graph.metadata.update(
+            params,
+            algorithm=sparsifier.__class__.__name__,
+            parent_graph=source.name,
+            execution_time=s.wall_time,
+            passes=edge_filter.passes,
+            approximate=not edge_filter.exact,
+            state_bytes=edge_filter.state_bytes(),
+            edges_per_second=counts["edges_in"] * edge_filter.passes / s.wall_time if s.wall_time else 0.0,
+            path=path,
+            **counts,
+            **edge_filter.stats(),
+        )
+        return self._store(graph)
+
     def run_transform(
         self,
         graph_key: str,
@@ -85,31 +164,64 @@ class ExperimentService:
         """
         applies a transformation using [LAYER SUPERTYPE] execute method and returns a graph object
         """
-        TransformRegistry.discover()
-
         G = self.get_graph(graph_key)
         transform = TransformRegistry.get(tranform_name)
         return transform.execute(G, RunParams(params))
 
+    def run_pipeline(
+        self,
+        graph_key: str,
+        spec: str,
+        params: Dict[str, Any],
+    ) -> Tuple[Graph, List[Graph]]:
+        """
+        runs "a|b|c" as one fused [PIPES AND FILTERS] transform; returns the result and its
+        lineage (the intermediate graphs, only with params["lineage"])
+        """
+        G = self.get_graph(graph_key)
+        pipeline = Pipeline([(name, self._algorithm(name)) for name in stage_names(spec)])
+        return pipeline.execute(G, RunParams(params)), pipeline.lineage
+
+    @staticmethod
+    def _algorithm(name: str) -> GraphTransform:
+        if name in SparsifierRegistry.list():
+            return SparsifierRegistry.get(name)
+        if name in TransformRegistry.list():
+            return TransformRegistry.get(name)
+        all_algos = sorted(SparsifierRegistry.list() + TransformRegistry.list())
+        raise KeyError(f"algorithm '{name}' not found. available: {all_algos}")
 
     def compute_metrics(
         self,
         graph: Graph,
         metric_names: list[str],
+        reference: Optional[Graph] = None,
     ) -> list[MetricResult]:
-        MetricRegistry.discover()
-        results = []
+        """
+        `reference` is the graph before the reduction, for metrics comparing the two.
+        runs through an [EXECUTION PLAN]: metrics consuming the same traversal share one pass
+        (its time is split evenly between them), the plan entries land in every summary
+        """
+        metric_params = RunParams({"reference": reference} if reference is not None else {})
+        metrics = {name: MetricRegistry.get(name) for name in metric_names}
+        plan = ExecutionPlan(graph, metrics, metric_params)
+
+        with span("metric_plan", category="metric", graph=graph.name, **plan.describe()):
+            plan.prepare()
+            reduced = plan.run_traversals()
 
+        results = []
         for name in metric_names:
-            metric = MetricRegistry.get(name)
-            start = time.perf_counter()
-            result = metric.compute(graph, RunParams({}))
-            duration = time.perf_counter() - start
+            metric, group = metrics[name], plan.group_of(name)
+            with span(f"metric:{name}", category="metric", graph=graph.name) as s:
+                result = reduced[name] if name in reduced else metric.compute(graph, metric_params)
+                s.set_graph_size(graph)
 
             new_summary = dict(result.summary)
-            new_summary['execution_time'] = duration
-
-            # results.append(metric.compute(graph, RunParams({})))
+            new_summary['execution_time'] = s.wall_time
+            if group is not None:
+                new_summary['execution_time'] += group.traversal_time / len(group.metrics)
+            new_summary.update(plan.stats(name))
 
             updated_result = MetricResult(
                 metric=result.metric,
@@ -129,22 +241,25 @@ class ExperimentService:
         algorithm_name: str,
         metric_names: list[str],
         params: Optional[Dict[str, Any]] = None,
+        tracer: Optional[Tracer] = None,
     ) -> ExperimentDTO:
         """
         uses the [DTO] to orchestrate an experiment within a [UNIT OF WORK]
+        every load/parse/transform/metric/commit span of the run ends up in dto.spans
         """
         # 0. start UOW
         uow = UnitOfWork(self.graph_repo, self.experiment_repo)
         run_params = params or {}
+        tracer = tracer or Tracer()
 
-        with uow:
-            # 1. discovery
-            SparsifierRegistry.discover()
-            TransformRegistry.discover()
-            start = time.perf_counter()
+        with tracer, uow:
+            # 1. discovery happens lazily: registries only import the requested plugins
 
             # 2. polymorphic execution
-            if algorithm_name in SparsifierRegistry.list():
+            lineage: List[Graph] = []
+            if is_pipeline(algorithm_name):
+                H, lineage = self.run_pipeline(graph_key, algorithm_name, run_params)
+            elif algorithm_name in SparsifierRegistry.list():
                 H = self.run_sparsifier(graph_key, algorithm_name, run_params)
             elif algorithm_name in TransformRegistry.list():
                 H = self.run_transform(graph_key, algorithm_name, run_params)
@@ -152,12 +267,8 @@ class ExperimentService:
                 all_algos = sorted(SparsifierRegistry.list() + TransformRegistry.list())
                 raise KeyError(f"algorithm '{algorithm_name}' not found. available: {all_algos}")
 
-            transform_time = time.perf_counter() - start
-            if isinstance(H.metadata, dict):
-                H.metadata['execution_time'] = transform_time
-
             # 3. compute metrics
-            metric_results = self.compute_metrics(H, metric_names)
+            metric_results = self.compute_metrics(H, metric_names, reference=self.get_graph(graph_key))
 
             # 4. create experiment entity (domain object)
             experiment = Experiment()
@@ -166,7 +277,9 @@ class ExperimentService:
                 experiment.add_result(m.metric, m)
             experiment.finish()
 
-            # 5. register new objects
+            # 5. register new objects (intermediate graphs of a pipeline only when asked for)
+            for intermediate in lineage:
+                uow.register_new_graph(intermediate)
             uow.register_new_graph(H)
             uow.register_new_experiment(experiment)
 
@@ -183,6 +296,7 @@ class ExperimentService:
             edges_after=H.edge_count,
             algorithm_name=algorithm_name,
             metric_results=metric_results,
-            metadata=H.metadata
+            metadata=H.metadata,
+            spans=list(tracer.spans)
         )
 
@@ -6,7 +6,7 @@ sys.path.append(os.getcwd())
 from src.interfaces.api import ExperimentFacade
 
 try:
-    from src.interfaces.visualizer import save_comparison_plot
+    from src.interfaces.visualizer import cached_layout, save_comparison_plot
 
     VISUALIZE = True
 except ImportError:
@@ -125,7 +125,8 @@ def main():
         print("\n[♥] generating visualizations\n")
         repo = api._service.graph_repo
         try:
-            G = repo.get(graph_key).to_networkx()
+            G = repo.get(graph_key).to_networkx(copy=False)
+            pos = cached_layout(G)  # one layout of the original graph shared by every plot
             all_graphs = repo.list_names()
 
             for name in all_graphs:
@@ -142,8 +143,8 @@ def main():
                 elif "coarsen" in name:
                     label = "coarsening"
 
-                g_mod = repo.get(name).to_networkx()
-                save_comparison_plot(G, g_mod, label, f"demo_{label}.png")
+                g_mod = repo.get(name).to_networkx(copy=False)
+                save_comparison_plot(G, g_mod, label, f"demo_{label}.png", pos=pos)
 
         except Exception as e:
             print(f"visualization error: {e}")
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import heapq
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.domain.common.pools import usable_workers
+from src.domain.csr import CSRGraph
+from src.domain.traversal import MultiSourceBFS, connected_components
+
+BLOCK = 256  # samples per seeded block; blocks are the unit of work handed to processes
+
+_WORKER_GRAPH: Optional[tuple] = None  # (adjacency lists, n) of the graph a worker process samples
+
+
+@dataclass(frozen=True)
+class BetweennessEstimate:
+    """normalized betweenness estimate per CSR row (fraction of sampled shortest paths through it)"""
+    values: np.ndarray
+    samples: int
+    epsilon: float
+    delta: float
+    vertex_diameter: int
+
+
+def sample_size(vertex_diameter: int, epsilon: float, delta: float, c: float = 0.5) -> int:
+    """
+    riondato-kornaropoulos bound: r = c / eps^2 * (floor(log2(VD - 2)) + 1 + ln(1 / delta)) samples
+    give every estimate within eps of the truth with probability 1 - delta, VD being the vertex
+    diameter (nodes on the longest shortest path), which caps the VC dimension of the path ranges
+    """
+    vc = math.floor(math.log2(vertex_diameter - 2)) + 1 if vertex_diameter > 3 else 1
+    return max(1, math.ceil(c / epsilon ** 2 * (vc + math.log(1 / delta))))
+
+
+def vertex_diameter_bound(csr: CSRGraph, seed: int = 420) -> int:
+    """
+    upper bound on the vertex diameter (exact values need APSP). a shortest path stays inside one
+    weakly connected component, so the largest component size always bounds it. only unweighted
+    undirected graphs get the tighter 2 * eccentricity + 1 of one BFS from a random source of the
+    largest component (other components still count with their size): with directions or weights
+    a shortest path may take many more hops than the BFS distances suggest
+    """
+    if csr.n < 2:
+        return csr.n
+    labels = connected_components(csr)
+    sizes = np.bincount(labels)
+    largest = int(sizes.argmax())
+    if csr.directed or csr.weights is not None:
+        return int(sizes[largest])
+
+    rng = np.random.default_rng(seed)
+    source = int(rng.choice(np.flatnonzero(labels == largest)))
+    ecc = int(MultiSourceBFS(csr).summarize([source]).eccentricity[0])
+    others = int(np.delete(sizes, largest).max(initial=0))
+    return max(min(int(sizes[largest]), 2 * ecc + 1), others)
+
+
+def _init_worker(arrays: tuple, n: int) -> None:
+    """ships the adjacency lists once per process instead of once per block"""
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = (arrays, n)
+
+
+def _worker_block(samples: int, seed: int) -> np.ndarray:
+    arrays, n = _WORKER_GRAPH
+    return _sample_block(arrays, n, samples, seed)
+
+
+def _sample_block(arrays: Tuple[list, list, Optional[list], list, list, Optional[list]],
+                  n: int, samples: int, seed: int) -> np.ndarray:
+    """
+    hits per node of `samples` uniformly drawn shortest paths between random pairs: a search from
+    u that stops once v's distance is final (BFS level, or v settled by dijkstra) counts shortest
+    paths sigma, then one u -> v path is drawn backwards choosing predecessor w with sigma[w] / sigma[v]
+    """
+    indptr, indices, weights, rindptr, rindices, rweights = arrays
+    rng = random.Random(seed)
+    hits = np.zeros(n, dtype=np.int64)
+    for _ in range(samples):
+        u = rng.randrange(n)
+        v = rng.randrange(n - 1)
+        v += v >= u
+        dist, sigma = _count_paths(indptr, indices, weights, u, v)
+        if v not in dist:
+            continue  # unreachable pair: no path, no hits
+
+        x = v
+        while True:
+            dx = dist[x]
+            preds, counts = [], []
+            for i in range(rindptr[x], rindptr[x + 1]):
+                w = rindices[i]
+                step = 1.0 if rweights is None else rweights[i]
+                if w in dist and dist[w] + step == dx and w in sigma:
+                    preds.append(w)
+                    counts.append(sigma[w])
+            x = rng.choices(preds, weights=counts)[0]
+            if x == u:
+                break
+            hits[x] += 1
+    return hits
+
+
+def _count_paths(indptr, indices, weights, u: int, v: int):
+    """distances and shortest path counts from u, stopped once v is final"""
+    dist = {u: 0.0}
+    sigma = {u: 1}
+    if weights is None:
+        frontier = [u]
+        level = 0.0
+        while frontier and v not in sigma:
+            level += 1.0
+            nxt = []
+            for x in frontier:
+                sx = sigma[x]
+                for i in range(indptr[x], indptr[x + 1]):
+                    y = indices[i]
+                    d = dist.get(y)
+                    if d is None:
+                        dist[y] = level
+                        sigma[y] = sx
+                        nxt.append(y)
+                    elif d == level:
+                        sigma[y] += sx
+            frontier = nxt
+        return dist, sigma
+
+    heap = [(0.0, u)]
+    done = set()
+    final_sigma = {}
+    while heap:
+        d, x = heapq.heappop(heap)
+        if x in done:
+            continue
+        done.add(x)
+        final_sigma[x] = sigma[x]
+        if x == v:
+            break
+        for i in range(indptr[x], indptr[x + 1]):
+            y, nd = indices[i], d + weights[i]
+            dy = dist.get(y)
+            if dy is None or nd < dy:
+                dist[y] = nd
+                sigma[y] = sigma[x]
+                heapq.heappush(heap, (nd, y))
+            elif nd == dy and y not in done:
+                sigma[y] += sigma[x]
+    # only settled nodes have final counts and distances
+    return {x: dist[x] for x in done}, final_sigma
+
+
+def estimate_betweenness(csr: CSRGraph, epsilon: float = 0.05, delta: float = 0.1, seed: int = 420,
+                         workers: int = 1, samples: Optional[int] = None) -> BetweennessEstimate:
+    """
+    [SAMPLING] approximate normalized betweenness by shortest-path sampling. the samples are cut
+    into blocks of BLOCK, each with its own child of SeedSequence(seed), so the estimate is the
+    same for any number of worker processes
+    """
+    vd = vertex_diameter_bound(csr, seed)
+    r = samples if samples is not None else sample_size(vd, epsilon, delta)
+    if csr.n < 3:
+        return BetweennessEstimate(np.zeros(csr.n), r, epsilon, delta, vd)
+
+    reverse = csr.reverse()
+    weighted = csr.weights is not None
+    arrays = (
+        csr.indptr.tolist(), csr.indices.tolist(), csr.adjacency_weights().tolist() if weighted else None,
+        reverse.indptr.tolist(), reverse.indices.tolist(), reverse.adjacency_weights().tolist() if weighted else None,
+    )
+    sizes = [min(BLOCK, r - i) for i in range(0, r, BLOCK)]
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(sizes))]
+
+    workers = usable_workers(workers)
+    if workers <= 1 or len(sizes) == 1:
+        blocks: Sequence[np.ndarray] = [_sample_block(arrays, csr.n, k, s) for k, s in zip(sizes, seeds)]
+    else:
+        workers = min(workers, len(sizes))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(arrays, csr.n)) as pool:
+            blocks = list(pool.map(_worker_block, sizes, seeds, chunksize=max(1, len(sizes) // (4 * workers))))
+
+    hits = np.sum(blocks, axis=0)
+    return BetweennessEstimate(hits / r, r, epsilon, delta, vd)
+
+
+def top_k_rank_correlation(a: np.ndarray, b: np.ndarray, k: int) -> Tuple[float, float]:
+    """
+    (kendall tau-b, overlap) between two score vectors over the same items, restricted to the union
+    of both top-k sets; overlap is |top_k(a) & top_k(b)| / k
+    """
+    k = min(k, len(a))
+    if k == 0:
+        return 1.0, 1.0
+    top_a = set(np.argsort(-a, kind="stable")[:k].tolist())
+    top_b = set(np.argsort(-b, kind="stable")[:k].tolist())
+    items = np.array(sorted(top_a | top_b))
+    return kendall_tau(a[items], b[items]), len(top_a & top_b) / k
+
+
+def kendall_tau(x: np.ndarray, y: np.ndarray) -> float:
+    """tau-b (ties accounted for), O(len^2): meant for top-k lists"""
+    if len(x) < 2:
+        return 1.0
+    dx = np.sign(x[:, None] - x[None, :])
+    dy = np.sign(y[:, None] - y[None, :])
+    upper = np.triu_indices(len(x), 1)
+    dx, dy = dx[upper], dy[upper]
+    concordance = float((dx * dy).sum())
+    norm = math.sqrt(float(np.count_nonzero(dx)) * float(np.count_nonzero(dy)))
+    return concordance / norm if norm else 1.0
+
+
+def rows_in(csr: CSRGraph, values: np.ndarray, reference: CSRGraph) -> np.ndarray:
+    """re-indexes per-row values of csr onto the rows of `reference` (0.0 for nodes csr lacks)"""
+    out = np.zeros(reference.n)
+    index = reference.index
+    for node, value in zip(csr.nodes, values.tolist()):
+        row = index.get(node)
+        if row is not None:
+            out[row] = value
+    return out
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import ast
 import importlib
+import json
+import os
 import pkgutil
+from dataclasses import dataclass, field, asdict
 from types import ModuleType
+from typing import Any, Dict, Iterable, Optional
+
+MANIFEST_FILE = "_plugin_manifest.json"
+MANIFEST_VERSION = 1
 
 
 def discover_modules(package_name: str) -> list[ModuleType]:
@@ -15,3 +23,142 @@ def discover_modules(package_name: str) -> list[ModuleType]:
     for m in pkgutil.iter_modules(pkg.__path__, pkg.__name__ + "."):
         imported.append(importlib.import_module(m.name))
     return imported
+
+
+@dataclass(frozen=True)
+class PluginEntry:
+    """manifest row: where a registered plugin lives and what it declares, read without importing it"""
+    name: str
+    module: str
+    class_name: str
+    version: Optional[str] = None
+    capabilities: Dict[str, Any] = field(default_factory=dict)
+
+
+class PluginManifest:
+    """
+    [PLUGIN] name -> module index of a plugin package, built by parsing the package sources (ast)
+    so nothing gets imported. it is cached as json next to the modules and rebuilt whenever a
+    module file is added, removed or modified (mtime/size fingerprint)
+    """
+    def __init__(self, package_name: str, decorators: Iterable[str]):
+        self.package_name = package_name
+        self.decorators = frozenset(decorators)
+        self._entries: Optional[Dict[str, PluginEntry]] = None
+
+    @property
+    def entries(self) -> Dict[str, PluginEntry]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def get(self, name: str) -> Optional[PluginEntry]:
+        return self.entries.get(name)
+
+    def import_plugin(self, name: str) -> bool:
+        """imports the module registering `name`; False if the manifest does not know it"""
+        entry = self.get(name)
+        if entry is None:
+            return False
+        importlib.import_module(entry.module)
+        return True
+
+    def invalidate(self) -> None:
+        self._entries = None
+
+    # BUILDING
+
+    def _package_dir(self) -> str:
+        return list(importlib.import_module(self.package_name).__path__)[0]
+
+    def _fingerprint(self, directory: str) -> Dict[str, list]:
+        files = {}
+        for m in pkgutil.iter_modules([directory]):
+            path = os.path.join(directory, m.name + ".py")
+            if not m.ispkg and os.path.exists(path):
+                st = os.stat(path)
+                files[m.name] = [st.st_mtime_ns, st.st_size]
+        return files
+
+    def _load(self) -> Dict[str, PluginEntry]:
+        directory = self._package_dir()
+        fingerprint = self._fingerprint(directory)
+        path = os.path.join(directory, MANIFEST_FILE)
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("version") == MANIFEST_VERSION and cached.get("files") == fingerprint \
+                    and cached.get("decorators") == sorted(self.decorators):
+                return {name: PluginEntry(**e) for name, e in cached["plugins"].items()}
+        except (OSError, ValueError, TypeError):
+            pass
+
+        entries = self._scan(directory, fingerprint)
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": MANIFEST_VERSION,
+                    "package": self.package_name,
+                    "decorators": sorted(self.decorators),
+                    "files": fingerprint,
+                    "plugins": {name: asdict(e) for name, e in sorted(entries.items())},
+                }, f, indent=2)
+        except OSError:
+            pass  # read-only install: keep the manifest in memory only
+        return entries
+
+    def _scan(self, directory: str, fingerprint: Dict[str, list]) -> Dict[str, PluginEntry]:
+        entries: Dict[str, PluginEntry] = {}
+        for module_name in sorted(fingerprint):
+            with open(os.path.join(directory, module_name + ".py"), encoding="utf-8") as f:
+                try:
+                    tree = ast.parse(f.read())
+                except SyntaxError:
+                    continue
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef):
+                    for name in self._registered_names(node):
+                        entries[name] = self._entry(name, f"{self.package_name}.{module_name}", node)
+        return entries
+
+    def _registered_names(self, node: ast.ClassDef) -> list[str]:
+        names = []
+        for deco in node.decorator_list:
+            if not isinstance(deco, ast.Call) or not deco.args:
+                continue
+            func = deco.func
+            ident = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+            arg = deco.args[0]
+            if ident in self.decorators and isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                names.append(arg.value.strip())
+        return names
+
+    @staticmethod
+    def _entry(name: str, module: str, node: ast.ClassDef) -> PluginEntry:
+        """class-level literal attributes become capabilities, INFO(...) keywords included"""
+        capabilities: Dict[str, Any] = {}
+
+        for stmt in node.body:
+            if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                target, value = stmt.targets[0].id, stmt.value
+            elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name) and stmt.value is not None:
+                target, value = stmt.target.id, stmt.value
+            else:
+                continue
+
+            if target == "INFO" and isinstance(value, ast.Call):
+                for kw in value.keywords:
+                    try:
+                        capabilities[kw.arg] = ast.literal_eval(kw.value)
+                    except ValueError:
+                        continue
+                continue
+            try:
+                literal = ast.literal_eval(value)
+            except ValueError:
+                continue
+            capabilities[target] = sorted(literal) if isinstance(literal, (set, frozenset)) else literal
+
+        version = capabilities.pop("version", None)
+        return PluginEntry(name=name, module=module, class_name=node.name, version=version, capabilities=capabilities)
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+
+
+def usable_workers(workers: int) -> int:
+    """
+    process count a pool may actually use here: 1 inside daemonic processes (isolated benchmark
+    cases, pool workers), which are not allowed to start children
+    """
+    if mp.current_process().daemon:
+        return 1
+    return max(1, int(workers))
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import contextvars
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+
+_ACTIVE: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar("active_tracer", default=None)
+
+MEMORY_MODES = (None, "rss", "tracemalloc")
+
+
+@dataclass
+class Span:
+    """
+    [VALUE OBJECT] one timed section of the pipeline (load, parse, transform, metric, commit, ...)
+    -> start is an absolute time.perf_counter() reading, wall_time/cpu_time are in seconds
+    -> peak_memory is in bytes: the traced peak above the span's baseline for "tracemalloc",
+       the process high-water mark for "rss", None when memory is not tracked
+    """
+    name: str
+    category: str = "pipeline"
+    start: float = 0.0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: Optional[int] = None
+    depth: int = 0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def set_graph_size(self, graph: Any, prefix: str = "") -> None:
+        self.attrs[f"{prefix}nodes"] = graph.node_count
+        self.attrs[f"{prefix}edges"] = graph.edge_count
+
+
+class Tracer:
+    """
+    collects spans of everything executed while it is active (with tracer: ...)
+    memory: None, "rss" (cheap, process high-water mark) or "tracemalloc" (exact per-span peak, slow)
+    """
+    def __init__(self, memory: Optional[str] = "rss"):
+        if memory not in MEMORY_MODES:
+            raise ValueError(f"unknown memory mode '{memory}'. available: {MEMORY_MODES}")
+        self.memory = memory
+        self.spans: List[Span] = []
+        self._stack: List[Span] = []
+        self._peaks: Dict[int, int] = {}  # running tracemalloc peak of each open span
+        self._token: Optional[contextvars.Token] = None
+        self._owns_tracemalloc = False
+
+    def __enter__(self) -> "Tracer":
+        if self.memory == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._token = _ACTIVE.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        _ACTIVE.reset(self._token)
+        self._token = None
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def _fold_peak(self) -> None:
+        """propagates the tracemalloc peak since the last reset into every open span"""
+        _, peak = tracemalloc.get_traced_memory()
+        for s in self._stack:
+            self._peaks[id(s)] = max(self._peaks[id(s)], peak)
+        tracemalloc.reset_peak()
+
+    def _open(self, s: Span) -> int:
+        s.depth = len(self._stack)
+        baseline = 0
+        if self.memory == "tracemalloc":
+            self._fold_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            self._peaks[id(s)] = baseline
+        self._stack.append(s)
+        return baseline
+
+    def _close(self, s: Span, baseline: int) -> None:
+        if self.memory == "tracemalloc":
+            self._fold_peak()
+            s.peak_memory = max(0, self._peaks.pop(id(s)) - baseline)
+        elif self.memory == "rss":
+            s.peak_memory = peak_rss()
+        self._stack.remove(s)
+        self.spans.append(s)
+
+    def total(self, category: Optional[str] = None) -> float:
+        """sum of wall time over top-level spans (optionally of one category)"""
+        return sum(s.wall_time for s in self.spans if s.depth == 0 and category in (None, s.category))
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        return to_chrome_trace(self.spans)
+
+
+def active_tracer() -> Optional[Tracer]:
+    return _ACTIVE.get()
+
+
+@contextmanager
+def span(name: str, category: str = "pipeline", **attrs: Any) -> Iterator[Span]:
+    """
+    times the enclosed block; the span is always measured (so callers can read wall_time)
+    but only recorded when a Tracer is active
+    """
+    s = Span(name=name, category=category, attrs=dict(attrs))
+    tracer = _ACTIVE.get()
+    baseline = tracer._open(s) if tracer is not None else 0
+
+    cpu_start = time.process_time()
+    s.start = time.perf_counter()
+    try:
+        yield s
+    finally:
+        s.wall_time = time.perf_counter() - s.start
+        s.cpu_time = time.process_time() - cpu_start
+        if tracer is not None:
+            tracer._close(s, baseline)
+
+
+def peak_rss() -> Optional[int]:
+    """process resident-set high-water mark in bytes"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def to_chrome_trace(spans: List[Span], pid: int = 1, tid: int = 1) -> Dict[str, Any]:
+    """
+    converts spans into the chrome trace event format (complete "X" events, microseconds),
+    which loads in chrome://tracing and ui.perfetto.dev
+    """
+    origin = min((s.start for s in spans), default=0.0)
+    events = []
+
+    for s in sorted(spans, key=lambda s: (s.start, s.depth)):
+        args = dict(s.attrs)
+        args["cpu_time_ms"] = s.cpu_time * 1e3
+        if s.peak_memory is not None:
+            args["peak_memory_bytes"] = s.peak_memory
+        events.append({
+            "name": s.name,
+            "cat": s.category,
+            "ph": "X",
+            "ts": (s.start - origin) * 1e6,
+            "dur": s.wall_time * 1e6,
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        })
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from src.domain.csr import CSRGraph
+from src.domain.graph_model import Graph
+
+INF = float("inf")
+
+
+class ContractionHierarchy:
+    """
+    [INDEX] contraction hierarchy (geisberger et al.): nodes are contracted one by one in order of
+    importance, adding a shortcut u -> w whenever the path u -> v -> w is the only shortest one
+    (checked with a bounded witness search). queries run a bidirectional dijkstra that only walks
+    upwards in the order, so each side settles a small cone instead of the whole graph.
+    importance = edge difference (shortcuts added - edges removed) + contracted neighbors,
+    kept in a heap with lazy updates: a popped node is re-evaluated and re-queued if it got worse.
+    once the cheapest remaining node has more than `core_degree` neighbors (dense cores of
+    expander-like graphs) contraction stops; the remaining core keeps its edges in both search
+    directions and shares the top rank
+    """
+    def __init__(self, csr: CSRGraph, witness_settle_limit: int = 64, core_degree: int = 64):
+        self.csr = csr
+        self.witness_settle_limit = witness_settle_limit
+        self.core_degree = core_degree
+        self.rank = np.zeros(csr.n, dtype=np.int64)
+        self.core = 0
+        self.shortcuts = 0
+        self.preprocess_time = 0.0
+        # upward adjacency: up[u] = [(v, w)] with rank[v] > rank[u]; down[v] likewise for the reverse graph
+        self._up: List[List[Tuple[int, float]]] = [[] for _ in range(csr.n)]
+        self._down: List[List[Tuple[int, float]]] = [[] for _ in range(csr.n)]
+        self._via: Dict[Tuple[int, int], int] = {}  # shortcut -> contracted middle node
+
+    # PREPROCESSING
+
+    @staticmethod
+    def build(graph: Graph | CSRGraph, witness_settle_limit: int = 64, core_degree: int = 64) -> "ContractionHierarchy":
+        csr = graph.to_csr() if isinstance(graph, Graph) else graph
+        ch = ContractionHierarchy(csr, witness_settle_limit, core_degree)
+        start = time.perf_counter()
+        ch._contract_all()
+        ch.preprocess_time = time.perf_counter() - start
+        return ch
+
+    def _contract_all(self) -> None:
+        n, directed = self.csr.n, self.csr.directed
+        out: List[Dict[int, float]] = [dict() for _ in range(n)]
+        weights = self.csr.weights if self.csr.weights is not None else np.ones(self.csr.m)
+        for u, v, w in zip(self.csr.src.tolist(), self.csr.dst.tolist(), weights.tolist()):
+            if u != v and w < out[u].get(v, INF):
+                out[u][v] = w
+        if directed:
+            inn: List[Dict[int, float]] = [dict() for _ in range(n)]
+            for u in range(n):
+                for v, w in out[u].items():
+                    inn[v][u] = w
+        else:
+            for u in range(n):
+                for v, w in list(out[u].items()):
+                    if w < out[v].get(u, INF):
+                        out[v][u] = w
+            inn = out
+
+        contracted = np.zeros(n, dtype=bool)
+        deleted_neighbors = np.zeros(n, dtype=np.int64)
+
+        def priority(v: int) -> int:
+            # simulated contraction with cheaper witness searches: only an estimate is needed here
+            added = len(self._shortcuts_for(v, out, inn, settle_limit=max(1, self.witness_settle_limit // 4)))
+            removed = len(out[v]) + (len(inn[v]) if directed else 0)
+            return added - removed + int(deleted_neighbors[v])
+
+        heap = [(priority(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            if contracted[v]:
+                continue
+            if len(inn[v]) > self.core_degree or len(out[v]) > self.core_degree:
+                break
+            # lazy update: re-evaluate and requeue when v is no longer the minimum
+            current = priority(v)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+
+            for u, w, weight in self._shortcuts_for(v, out, inn):
+                out[u][w] = weight
+                inn[w][u] = weight
+                self._via[(u, w)] = v
+
+            self.rank[v] = order
+            order += 1
+            contracted[v] = True
+            for u, weight in inn[v].items():
+                self._down[v].append((u, weight))  # reversed edge u -> v, for the backward search
+                deleted_neighbors[u] += 1
+                del out[u][v]
+            for w, weight in out[v].items():
+                self._up[v].append((w, weight))
+                if directed:
+                    deleted_neighbors[w] += 1
+                    del inn[w][v]
+            if not directed:
+                self._down[v] = list(self._up[v])
+            out[v] = {}
+            if directed:
+                inn[v] = {}
+
+        # uncontracted core: same rank, every remaining edge is walked by both searches
+        for v in np.flatnonzero(~contracted).tolist():
+            self.rank[v] = order
+            self.core += 1
+            self._up[v].extend(out[v].items())
+            self._down[v].extend(inn[v].items())
+        self.shortcuts = len(self._via)
+
+    def _shortcuts_for(self, v: int, out, inn, settle_limit: Optional[int] = None) -> List[Tuple[int, int, float]]:
+        """shortcuts (u, w, weight) needed if v were contracted now"""
+        needed = []
+        directed = self.csr.directed
+        targets = out[v]
+        if not targets:
+            return needed
+        for u, w_uv in inn[v].items():
+            wanted = {w: w_uv + w_vw for w, w_vw in targets.items() if w != u and (directed or w > u)}
+            if not wanted:
+                continue  # undirected pairs are checked once, from the smaller endpoint
+            witness = self._witness_search(u, v, wanted, out, settle_limit or self.witness_settle_limit)
+            needed.extend((u, w, via) for w, via in wanted.items() if witness.get(w, INF) > via)
+        return needed
+
+    @staticmethod
+    def _witness_search(source: int, avoid: int, wanted: Dict[int, float], out, settle_limit: int) -> Dict[int, float]:
+        """
+        dijkstra from `source` skipping `avoid`; stops once every wanted target is settled, past the
+        largest wanted distance, or after settle_limit settled nodes
+        """
+        limit = max(wanted.values())
+        remaining = len(wanted)
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        settled = 0
+        while heap and settled < settle_limit:
+            d, u = heapq.heappop(heap)
+            if d > limit:
+                break
+            if d > dist[u]:
+                continue
+            settled += 1
+            if u in wanted:
+                remaining -= 1
+                if remaining == 0:
+                    break
+            for x, w in out[u].items():
+                if x == avoid:
+                    continue
+                nd = d + w
+                if nd < dist.get(x, INF):
+                    dist[x] = nd
+                    heapq.heappush(heap, (nd, x))
+        return dist
+
+    # QUERIES
+
+    def query(self, s: int, t: int) -> Tuple[float, int]:
+        """(distance, settled nodes) between rows s and t; inf when unreachable"""
+        if s == t:
+            return 0.0, 0
+        dist = ({s: 0.0}, {t: 0.0})
+        heaps = ([(0.0, s)], [(0.0, t)])
+        graphs = (self._up, self._down)
+        settled = [set(), set()]
+        best = INF
+        side = 0
+        while heaps[0] or heaps[1]:
+            if not heaps[side] or (heaps[1 - side] and heaps[1 - side][0][0] < heaps[side][0][0]):
+                side = 1 - side
+            d, u = heapq.heappop(heaps[side])
+            if d >= best:
+                heaps[side].clear()  # nothing on this side can improve the meeting point
+                continue
+            if u in settled[side]:
+                continue
+            settled[side].add(u)
+            other = dist[1 - side].get(u)
+            if other is not None and d + other < best:
+                best = d + other
+            own = dist[side]
+            for v, w in graphs[side][u]:
+                nd = d + w
+                if nd < own.get(v, INF):
+                    own[v] = nd
+                    heapq.heappush(heaps[side], (nd, v))
+        return best, len(settled[0]) + len(settled[1])
+
+    # OVERLAY GRAPH
+
+    def to_networkx(self) -> nx.Graph | nx.DiGraph:
+        """original edges plus shortcuts (edge attribute 'via'), node attribute 'rank'"""
+        nodes = self.csr.nodes
+        H = nx.DiGraph() if self.csr.directed else nx.Graph()
+        H.add_nodes_from((v, {"rank": int(r)}) for v, r in zip(nodes, self.rank.tolist()))
+        for u, edges in enumerate(self._up):
+            for v, w in edges:
+                if not self.csr.directed and self.rank[u] == self.rank[v] and u > v:
+                    continue  # core edge, already added from the other endpoint
+                via = self._via.get((u, v)) if self.csr.directed else self._via.get((min(u, v), max(u, v)))
+                H.add_edge(nodes[u], nodes[v], weight=w, via=None if via is None else nodes[via])
+        if self.csr.directed:
+            for v, edges in enumerate(self._down):
+                for u, w in edges:
+                    if self.rank[u] == self.rank[v]:
+                        continue  # core edge, already in _up
+                    via = self._via.get((u, v))
+                    H.add_edge(nodes[u], nodes[v], weight=w, via=None if via is None else nodes[via])
+        return H
+
+    @staticmethod
+    def from_networkx(G: nx.Graph | nx.DiGraph) -> Optional["ContractionHierarchy"]:
+        """rebuilds the search graphs of an overlay made by to_networkx (no preprocessing); None otherwise"""
+        if G.number_of_nodes() == 0 or any("rank" not in d for _, d in G.nodes(data=True)):
+            return None
+        ch = ContractionHierarchy(CSRGraph.from_networkx(G))
+        index = ch.csr.index
+        ch.rank = np.array([G.nodes[v]["rank"] for v in ch.csr.nodes], dtype=np.int64)
+        for a, b, d in G.edges(data=True):
+            u, v, w = index[a], index[b], float(d.get("weight", 1.0))
+            pairs = [(u, v)] if G.is_directed() else [(u, v), (v, u)]
+            for x, y in pairs:
+                if ch.rank[x] <= ch.rank[y]:
+                    ch._up[x].append((y, w))
+                if ch.rank[x] >= ch.rank[y]:
+                    ch._down[y].append((x, w))
+            if d.get("via") is not None:
+                ch.shortcuts += 1
+        top = int((ch.rank == ch.rank.max()).sum())
+        ch.core = top if top > 1 else 0
+        return ch
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import networkx as nx
+import numpy as np
+
+
+class CSRGraph:
+    """
+    [CSR] immutable compressed sparse row adjacency of a graph, the array backend of the
+    vectorized metrics.
+    -> nodes[i] is the original label of row i (nodes() order of the source graph)
+    -> src/dst/weights hold the edge list in edges() order, so edge bitmasks of views apply directly
+    -> indptr/indices/edge_ids are the out-adjacency; undirected edges are stored in both
+       directions (a self-loop appears twice, matching networkx degrees)
+    """
+    __slots__ = (
+        "nodes", "directed", "src", "dst", "weights",
+        "indptr", "indices", "edge_ids", "_index", "_in_degree", "_reverse",
+    )
+
+    def __init__(
+        self,
+        nodes: Sequence[Any],
+        src: np.ndarray,
+        dst: np.ndarray,
+        directed: bool,
+        weights: Optional[np.ndarray] = None,
+    ):
+        self.nodes: List[Any] = list(nodes)
+        self.directed = directed
+        self.src = np.asarray(src, dtype=np.int64)
+        self.dst = np.asarray(dst, dtype=np.int64)
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+        self._index: Optional[Dict[Any, int]] = None
+        self._in_degree: Optional[np.ndarray] = None
+        self._reverse: Optional[CSRGraph] = None
+
+        n, m = len(self.nodes), len(self.src)
+        if directed:
+            rows, cols, eids = self.src, self.dst, np.arange(m, dtype=np.int64)
+        else:
+            rows = np.concatenate([self.src, self.dst])
+            cols = np.concatenate([self.dst, self.src])
+            eids = np.tile(np.arange(m, dtype=np.int64), 2)
+
+        order = np.argsort(rows)  # neighbor order within a row does not matter, no stable sort needed
+        self.indices = cols[order]
+        self.edge_ids = eids[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.indptr[1:])
+
+    @property
+    def n(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def m(self) -> int:
+        return len(self.src)
+
+    @property
+    def index(self) -> Dict[Any, int]:
+        """node label -> row"""
+        if self._index is None:
+            self._index = {v: i for i, v in enumerate(self.nodes)}
+        return self._index
+
+    def neighbors(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def adjacency_weights(self) -> np.ndarray:
+        """weights aligned with `indices` (1.0 everywhere for unweighted graphs)"""
+        if self.weights is None:
+            return np.ones(len(self.indices))
+        return self.weights[self.edge_ids]
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        if not self.directed:
+            return self.out_degree()
+        if self._in_degree is None:
+            self._in_degree = np.bincount(self.indices, minlength=self.n)
+        return self._in_degree
+
+    def degree(self) -> np.ndarray:
+        """total degree per row, same values as networkx G.degree()"""
+        if not self.directed:
+            return self.out_degree()
+        return self.out_degree() + self.in_degree()
+
+    def reverse(self) -> "CSRGraph":
+        """in-adjacency (transpose); the graph itself when undirected"""
+        if not self.directed:
+            return self
+        if self._reverse is None:
+            self._reverse = CSRGraph(self.nodes, self.dst, self.src, True, self.weights)
+        return self._reverse
+
+    def to_undirected(self) -> "CSRGraph":
+        if not self.directed:
+            return self
+        return CSRGraph(self.nodes, self.src, self.dst, False, self.weights)
+
+    def subgraph(self, edge_mask: Optional[np.ndarray] = None, node_mask: Optional[np.ndarray] = None) -> "CSRGraph":
+        """
+        CSR of a masked subgraph (masks in nodes()/edges() order, as stored by GraphView);
+        kept nodes are renumbered in order, edges need both endpoints kept
+        """
+        keep = np.ones(self.m, dtype=bool) if edge_mask is None else np.asarray(edge_mask, dtype=bool).copy()
+        if len(keep) != self.m:
+            raise ValueError(f"edge mask of length {len(keep)} does not match {self.m} edges")
+
+        nodes, src, dst = self.nodes, self.src, self.dst
+        if node_mask is not None:
+            node_mask = np.asarray(node_mask, dtype=bool)
+            if len(node_mask) != self.n:
+                raise ValueError(f"node mask of length {len(node_mask)} does not match {self.n} nodes")
+            keep &= node_mask[src] & node_mask[dst]
+            relabel = np.cumsum(node_mask) - 1
+            nodes = [v for v, k in zip(self.nodes, node_mask) if k]
+            src, dst = relabel[src], relabel[dst]
+
+        weights = None if self.weights is None else self.weights[keep]
+        return CSRGraph(nodes, src[keep], dst[keep], self.directed, weights)
+
+    def simple_edge_mask(self) -> np.ndarray:
+        """
+        kept-edge mask with one edge per parallel class, the lightest (the first on ties);
+        undirected (u, v) and (v, u) are parallel
+        """
+        u, v = self.src, self.dst
+        if not self.directed:
+            u, v = np.minimum(u, v), np.maximum(u, v)
+        w = np.zeros(self.m) if self.weights is None else self.weights
+        order = np.lexsort((w, v, u))  # stable: ties keep edges() order
+        u, v = u[order], v[order]
+        first = np.ones(self.m, dtype=bool)
+        first[1:] = (u[1:] != u[:-1]) | (v[1:] != v[:-1])
+        mask = np.zeros(self.m, dtype=bool)
+        mask[order[first]] = True
+        return mask
+
+    @staticmethod
+    def from_networkx(G: nx.Graph | nx.DiGraph, weight_attr: str = "weight") -> "CSRGraph":
+        """one O(V + E) pass over the networkx graph"""
+        nodes = list(G.nodes())
+        index = {v: i for i, v in enumerate(nodes)}
+        m = G.number_of_edges()
+        src = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int64, count=m)
+        dst = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int64, count=m)
+
+        weights = None
+        if m and nx.is_weighted(G, weight=weight_attr):
+            weights = np.fromiter((w for _, _, w in G.edges(data=weight_attr, default=1.0)),
+                                  dtype=np.float64, count=m)
+        return CSRGraph(nodes, src, dst, G.is_directed(), weights)
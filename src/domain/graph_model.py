@@ -1,9 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, is_dataclass
+from itertools import compress
 from typing import Any, Mapping, MutableMapping, Optional, Dict, Iterable, Tuple, NewType, Callable
 import uuid
 import networkx as nx
+import numpy as np
+
+from src.domain.common.tracing import span
+from src.domain.csr import CSRGraph
+from src.domain.interning import NodeTable
+from src.domain.traversal import connected_components
+
+# rough resident cost of networkx dict-of-dicts storage (CPython 3, measured on G(n, m) graphs)
+NX_NODE_BYTES = 300
+NX_EDGE_BYTES = 230
+NX_WEIGHT_BYTES = 150  # extra per edge for a {"weight": w} attribute dict
 
 # VALUE OBJECTS
 
@@ -42,7 +54,7 @@ class OperationDescriptor:
 
 class Graph:
     __slots__ = (
-        "_nx", "_loader", "id", "name", "directed", "weighted", "source", "metadata"
+        "_nx", "_loader", "_csr", "_derived", "_stamp", "id", "name", "directed", "weighted", "source", "metadata"
     )
 
     def __init__(
@@ -57,6 +69,9 @@ class Graph:
     ):
         self._nx = nx_graph
         self._loader = loader
+        self._csr: Optional[CSRGraph] = None
+        self._derived: Dict[str, Any] = {}
+        self._stamp: Optional[Tuple[int, int]] = None
         self.id: GraphID = id or new_graph_id()
         self.name: str = name or f"graph-{self.id}"
         self.source: Optional[str] = source
@@ -81,7 +96,10 @@ class Graph:
         """
         if self._nx is None and self._loader is not None:
             print(f"[LAZY LOAD] loading absolutely massive graph data for '{self.name}', hold on tight... ;)")
-            self._nx = self._loader()
+            with span("load", graph=self.name) as s:
+                self._nx = self._loader()
+                if self._nx is not None:
+                    s.set(nodes=self._nx.number_of_nodes(), edges=self._nx.number_of_edges())
 
             if self._nx is not None:
                 self.directed = self._nx.is_directed()
@@ -113,7 +131,7 @@ class Graph:
         return nx.is_weighted(self.to_networkx(copy=False))
 
     def copy(self, with_edge_attrs: bool = True) -> "Graph":
-        G = self.to_networkx(copy=True)
+        G = self.to_networkx(copy=False)
         nx_copy = G.__class__()
         nx_copy.add_nodes_from(G.nodes(data=True))
         nx_copy.add_edges_from(
@@ -131,7 +149,7 @@ class Graph:
         return self.to_networkx(copy=False).nodes()
 
     def edges(self, data: bool = False) -> Iterable[Tuple[Any, Any] | Tuple[Any, Any, Mapping[str, Any]]]:
-        return self.to_networkx(copy=False).edges(data)
+        return self.to_networkx(copy=False).edges(data=data)
 
     def degree(self, v: Any) -> float:
         return self.to_networkx(copy=False).degree[v]
@@ -148,6 +166,149 @@ class Graph:
 
         return float(min(d.get(weight_attr, default) for d in data.values()))
 
+    def to_csr(self) -> CSRGraph:
+        """
+        array (CSR) form of the graph, built once and cached; rebuilt when the node/edge counts of
+        the networkx graph changed since. in-place edits keeping the counts (a weight, one edge
+        swapped for another) are not detected: call invalidate() after them
+        """
+        G = self._fresh()
+        if self._csr is None:
+            with span("to_csr", graph=self.name):
+                self._csr = CSRGraph.from_networkx(G)
+        return self._csr
+
+    # DERIVED STRUCTURES
+
+    def _fresh(self) -> nx.Graph | nx.DiGraph:
+        """drops every cached structure once the node/edge counts of the networkx graph changed"""
+        G = self.to_networkx(copy=False)
+        stamp = (G.number_of_nodes(), G.number_of_edges())
+        if stamp != self._stamp:
+            self.invalidate()
+            self._stamp = stamp
+        return G
+
+    def invalidate(self) -> None:
+        """forgets the CSR and all derived structures, e.g. after in-place edits that keep the counts"""
+        self._csr = None
+        self._derived.clear()
+        self._stamp = None
+
+    # NODE LABELS
+
+    @property
+    def node_table(self) -> Optional[NodeTable]:
+        """
+        [INTERNING] label table of graphs ingested with dense int ids (text edgelists): stored once
+        in the networkx graph attributes, so copies, views and transform outputs share it
+        """
+        return self.to_networkx(copy=False).graph.get("node_table")
+
+    def node_labels(self, nodes: Iterable[Any]) -> list:
+        """external labels of nodes (or CSR node entries); identity without a label table"""
+        table = self.node_table
+        return table.label(list(nodes)) if table is not None else list(nodes)
+
+    def share_node_table(self, other: "Graph") -> None:
+        """adopts the label table of the graph this one was derived from, unless it has its own"""
+        table = other.node_table
+        G = self.to_networkx(copy=False)
+        if table is not None and "node_table" not in G.graph and not isinstance(self, GraphView):
+            G.graph["node_table"] = table
+
+    # RESIDENCY
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._nx is not None
+
+    def estimated_bytes(self) -> int:
+        """rough resident size: networkx storage (per node / per edge constants) plus cached arrays"""
+        total = 0
+        if self._nx is not None:
+            total += nx_bytes(self._nx, bool(self.weighted))
+        derived = [v for v in self._derived.values() if v is not self._nx]  # undirected() of an undirected graph
+        return total + estimate_bytes(self._csr) + estimate_bytes(derived)
+
+    def unload(self, loader: Optional[Callable[[], nx.Graph]]) -> None:
+        """
+        [LAZY LOAD] turns the graph back into a virtual proxy (as from_loader): the networkx graph
+        and every cached structure are dropped, the next access reloads through `loader`
+        """
+        self._nx = None
+        self._loader = loader
+        self.invalidate()
+
+    def derived(self, key: str, build: Callable[[], Any]) -> Any:
+        """
+        [MEMOIZATION] structure `key` derived from this graph, built by `build()` on first use and
+        then shared by every caller (all metrics of one compute_metrics call, sparsifiers, ...).
+        dropped on the same count stamp as to_csr(), so count-preserving edits need invalidate()
+        """
+        self._fresh()
+        if key not in self._derived:
+            with span("derive", graph=self.name, structure=key):
+                self._derived[key] = build()
+        return self._derived[key]
+
+    def undirected(self) -> nx.Graph:
+        """undirected networkx projection; the graph itself when already undirected"""
+        G = self.to_networkx(copy=False)
+        if not G.is_directed():
+            return G
+        return self.derived("undirected", G.to_undirected)
+
+    def undirected_csr(self) -> CSRGraph:
+        return self.derived("undirected_csr", lambda: self.to_csr().to_undirected())
+
+    def component_labels(self) -> np.ndarray:
+        """weakly connected component label per CSR row (see traversal.connected_components)"""
+        return self.derived("components", lambda: connected_components(self.to_csr()))
+
+    def largest_component(self) -> np.ndarray:
+        """CSR rows of the largest weakly connected component"""
+        def build() -> np.ndarray:
+            labels = self.component_labels()
+            if len(labels) == 0:
+                return np.zeros(0, dtype=np.int64)
+            return np.flatnonzero(labels == np.bincount(labels).argmax())
+        return self.derived("largest_component", build)
+
+    def lcc_nodes(self) -> frozenset:
+        """node labels of the largest weakly connected component"""
+        return self.derived("lcc_nodes", lambda: frozenset(self.to_csr().nodes[i] for i in self.largest_component()))
+
+    def degrees(self) -> np.ndarray:
+        """total degree per CSR row, same values as networkx G.degree()"""
+        return self.derived("degrees", lambda: self.to_csr().degree())
+
+    def degree_map(self) -> Dict[Any, int]:
+        """node label -> out-degree (the degree when undirected)"""
+        return self.derived("degree_map", lambda: dict(zip(self.to_csr().nodes, self.to_csr().out_degree().tolist())))
+
+    def sorted_adjacency(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(indptr, indices) of the CSR with every row's neighbors in ascending order"""
+        def build() -> Tuple[np.ndarray, np.ndarray]:
+            csr = self.to_csr()
+            rows = np.repeat(np.arange(csr.n), csr.out_degree())
+            return csr.indptr, csr.indices[np.lexsort((csr.indices, rows))]
+        return self.derived("sorted_adjacency", build)
+
+    def view(
+        self,
+        edge_mask: Optional[np.ndarray] = None,
+        node_mask: Optional[np.ndarray] = None,
+        *,
+        name: Optional[str] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+    ) -> "GraphView":
+        """
+        [VIEW] zero-copy subgraph of this graph; masks are aligned with the iteration order
+        of edges() and nodes(), None keeps everything
+        """
+        return GraphView(self, edge_mask=edge_mask, node_mask=node_mask, name=name, metadata=metadata)
+
 
     # FACTORIES
 
@@ -163,6 +324,19 @@ class Graph:
             metadata=metadata or {}
         )
 
+    @staticmethod
+    def from_csr(csr: CSRGraph, *, name: Optional[str] = None, metadata: Optional[Mapping[str, Any]] = None) -> "Graph":
+        """networkx graph of an edge array (e.g. a fused pipeline's output); parallel edges merge, the last one wins"""
+        G = nx.DiGraph() if csr.directed else nx.Graph()
+        G.add_nodes_from(csr.nodes)
+        nodes = csr.nodes
+        edges = ((nodes[u], nodes[v]) for u, v in zip(csr.src.tolist(), csr.dst.tolist()))
+        if csr.weights is None:
+            G.add_edges_from(edges)
+        else:
+            G.add_weighted_edges_from((u, v, w) for (u, v), w in zip(edges, csr.weights.tolist()))
+        return Graph.from_networkx(G, name=name, metadata=metadata)
+
     @staticmethod
     def from_loader(name: str, loader_f: Callable[[], nx.Graph], metadata: dict = None) -> "Graph":
         """factory for [LAZY LOAD] (virtual proxy)"""
@@ -176,3 +350,191 @@ class Graph:
         )
 
 
+class GraphView(Graph):
+    """
+    [VIEW] read-only subgraph that stores a reference to its parent plus a kept-edge bitmask
+    (and optionally a kept-node bitmask) instead of its own networkx object.
+    -> to_networkx(copy=False) returns a frozen networkx view filtered through the masks
+    -> to_networkx(copy=True) / materialize() build an independent graph on demand
+    """
+    __slots__ = ("_parent", "_edge_mask", "_node_mask")
+
+    def __init__(
+        self,
+        parent: Graph,
+        edge_mask: Optional[np.ndarray] = None,
+        node_mask: Optional[np.ndarray] = None,
+        name: Optional[str] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+    ):
+        super().__init__(
+            None,
+            id=new_graph_id(),
+            name=name or f"{parent.name}_view",
+            source=parent.source,
+            metadata=dict(metadata or {}),
+        )
+        self._parent = parent
+        self._edge_mask = None if edge_mask is None else np.asarray(edge_mask, dtype=bool)
+        self._node_mask = None if node_mask is None else np.asarray(node_mask, dtype=bool)
+        self.directed = parent.directed
+        self.weighted = parent.weighted
+
+    @property
+    def parent(self) -> Graph:
+        return self._parent
+
+    @property
+    def edge_mask(self) -> Optional[np.ndarray]:
+        return self._edge_mask
+
+    @property
+    def node_mask(self) -> Optional[np.ndarray]:
+        return self._node_mask
+
+    def _kept_nodes(self, P: nx.Graph) -> Iterable[Any]:
+        if self._node_mask is None:
+            return P.nodes()
+        return compress(P.nodes(), self._node_mask)
+
+    def _kept_edges(self, P: nx.Graph, data: bool = False) -> Iterable[Tuple]:
+        edges = P.edges(data=data)
+        if self._edge_mask is not None:
+            edges = compress(edges, self._edge_mask)
+        if self._node_mask is not None:
+            kept = set(self._kept_nodes(P))
+            edges = (e for e in edges if e[0] in kept and e[1] in kept)
+        return edges
+
+    def to_networkx(self, copy: bool = True) -> nx.Graph | nx.DiGraph:
+        """
+        -> copy=True materializes the kept nodes/edges into a new networkx graph, O(V + E')
+        -> copy=False returns a frozen nx.subgraph_view over the parent (cached), only a
+           lookup set of kept edges is allocated
+        """
+        P = self._parent.to_networkx(copy=False)
+        self.directed = P.is_directed()
+
+        if self._edge_mask is not None and len(self._edge_mask) != P.number_of_edges():
+            raise ValueError(f"edge mask of '{self.name}' does not match the edges of '{self._parent.name}'")
+        if self._node_mask is not None and len(self._node_mask) != P.number_of_nodes():
+            raise ValueError(f"node mask of '{self.name}' does not match the nodes of '{self._parent.name}'")
+
+        if copy:
+            H = P.__class__()
+            H.add_nodes_from((v, P.nodes[v]) for v in self._kept_nodes(P))
+            H.add_edges_from(self._kept_edges(P, data=True))
+            return H
+
+        if self._nx is None:
+            filter_node = nx.filters.no_filter
+            filter_edge = nx.filters.no_filter
+
+            if self._node_mask is not None:
+                filter_node = nx.filters.show_nodes(set(self._kept_nodes(P)))
+
+            if self._edge_mask is not None and P.is_multigraph():
+                # keys tell parallel edges apart; subgraph_view passes them as a third argument
+                kept = set(compress(P.edges(keys=True), self._edge_mask))
+                if P.is_directed():
+                    filter_edge = lambda u, v, key: (u, v, key) in kept
+                else:
+                    filter_edge = lambda u, v, key: (u, v, key) in kept or (v, u, key) in kept
+            elif self._edge_mask is not None:
+                kept = set(compress(P.edges(), self._edge_mask))
+                if P.is_directed():
+                    filter_edge = lambda u, v: (u, v) in kept
+                else:
+                    filter_edge = lambda u, v: (u, v) in kept or (v, u) in kept
+
+            self._nx = nx.subgraph_view(P, filter_node=filter_node, filter_edge=filter_edge)
+
+        return self._nx
+
+    @property
+    def node_count(self) -> int:
+        if self._node_mask is None:
+            return self._parent.node_count
+        return int(np.count_nonzero(self._node_mask))
+
+    @property
+    def edge_count(self) -> int:
+        if self._node_mask is None:
+            if self._edge_mask is None:
+                return self._parent.edge_count
+            return int(np.count_nonzero(self._edge_mask))
+        return self.to_networkx(copy=False).number_of_edges()
+
+    def is_directed(self) -> bool:
+        return self._parent.is_directed()
+
+    def is_weighted(self) -> bool:
+        if self.weighted is None:
+            self.weighted = nx.is_weighted(self.to_networkx(copy=False))
+        return self.weighted
+
+    def to_csr(self) -> CSRGraph:
+        """the parent's CSR filtered through the masks, without going through networkx"""
+        if self._edge_mask is None and self._node_mask is None:
+            return self._parent.to_csr()
+        if self._csr is None:
+            self._csr = self._parent.to_csr().subgraph(self._edge_mask, self._node_mask)
+        return self._csr
+
+    def _fresh(self) -> nx.Graph | nx.DiGraph:
+        # the masks pin the parent's edges, a view itself never changes
+        return self.to_networkx(copy=False)
+
+    def estimated_bytes(self) -> int:
+        """masks, cached arrays and the kept-edge lookup set of the networkx view; the parent is not counted"""
+        total = estimate_bytes([self._edge_mask, self._node_mask, self._csr, list(self._derived.values())])
+        if self._nx is not None and self._edge_mask is not None:
+            total += int(np.count_nonzero(self._edge_mask)) * NX_EDGE_BYTES // 2
+        return total
+
+    def unload(self, loader: Optional[Callable[[], nx.Graph]] = None) -> None:
+        """drops the cached networkx view and arrays; a view always rebuilds them from its parent"""
+        self._nx = None
+        self.invalidate()
+
+    def derived(self, key: str, build: Callable[[], Any]) -> Any:
+        """unmasked views share the structures of their parent"""
+        if self._edge_mask is None and self._node_mask is None:
+            return self._parent.derived(key, build)
+        return super().derived(key, build)
+
+    def materialize(self) -> Graph:
+        """detaches the view from its parent by building its own networkx graph"""
+        return Graph(
+            self.to_networkx(copy=True),
+            id=self.id,
+            name=self.name,
+            source=self.source,
+            metadata=self.metadata,
+        )
+
+
+def nx_bytes(G: nx.Graph | nx.DiGraph, weighted: bool) -> int:
+    per_edge = NX_EDGE_BYTES + (NX_WEIGHT_BYTES if weighted else 0)
+    return G.number_of_nodes() * NX_NODE_BYTES + G.number_of_edges() * per_edge
+
+
+def estimate_bytes(obj: Any) -> int:
+    """approximate memory held by a cached structure (arrays, CSR, dataclasses and containers of them)"""
+    if obj is None:
+        return 0
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, CSRGraph):
+        arrays = [obj.src, obj.dst, obj.weights, obj.indptr, obj.indices, obj.edge_ids]
+        reverse = obj._reverse if obj._reverse is not obj else None
+        return estimate_bytes(arrays) + len(obj.nodes) * 8 + estimate_bytes(reverse)
+    if isinstance(obj, (list, tuple)):
+        return sum(estimate_bytes(x) for x in obj)
+    if isinstance(obj, dict):
+        return 100 * len(obj)
+    if isinstance(obj, nx.Graph):
+        return nx_bytes(obj, weighted=False)
+    if is_dataclass(obj):
+        return sum(estimate_bytes(getattr(obj, f.name)) for f in fields(obj))
+    return 0
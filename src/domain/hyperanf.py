@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from src.domain.csr import CSRGraph
+
+ROW_BLOCK = 1 << 20  # registers turned into floats at once when estimating
+MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """vectorized splitmix64 finalizer: well mixed 64-bit hashes of the node rows"""
+    with np.errstate(over="ignore"):
+        z = x + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """exact bit length of uint64 values (binary search on shifts, no float rounding)"""
+    length = np.zeros(len(x), dtype=np.int64)
+    x = x.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = x >= (np.uint64(1) << np.uint64(shift))
+        length[big] += shift
+        x[big] >>= np.uint64(shift)
+    return length + (x > 0)
+
+
+def init_registers(n: int, log2m: int, seed: int) -> np.ndarray:
+    """
+    HyperLogLog counter of the one-node ball {u} per row: 2^log2m uint8 registers, the first
+    log2m hash bits pick the register, the position of the first 1-bit in the rest is stored
+    """
+    m = 1 << log2m
+    # seed mixed in before the second round: a plain xor would only permute the hashes of 0..n-1
+    h = _splitmix64(_splitmix64(np.arange(n, dtype=np.uint64)) ^ _splitmix64(np.array([seed], dtype=np.uint64)))
+    bucket = (h >> np.uint64(64 - log2m)).astype(np.int64)
+    rest = (h << np.uint64(log2m)) & MASK64
+    rho = 64 - log2m + 1 - np.maximum(_bit_length(rest) - log2m, 0)
+    registers = np.zeros((n, m), dtype=np.uint8)
+    registers[np.arange(n), bucket] = rho.astype(np.uint8)
+    return registers
+
+
+def _cardinality(harmonic: np.ndarray, zeros: np.ndarray, m: int) -> np.ndarray:
+    """HyperLogLog estimate from sum(2^-register) and the empty register count, linear counting for the small range"""
+    alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+    raw = alpha * m * m / harmonic
+    small = (raw <= 2.5 * m) & (zeros > 0)
+    raw[small] = m * np.log(m / zeros[small])
+    return raw
+
+
+def estimate(registers: np.ndarray, groups: int = 1) -> np.ndarray:
+    """
+    summed cardinality of all counters; with groups > 1 also of every delete-a-group counter
+    (registers split into `groups` slices, one left out, rescaled to the full register count):
+    [full, without slice 0, ..., without slice groups - 1]
+    """
+    n, m = registers.shape
+    kept = m - m // groups
+    sums = np.zeros(groups + 1 if groups > 1 else 1)
+    step = max(1, ROW_BLOCK // m)  # rows per block: float temporaries stay O(ROW_BLOCK)
+    for start in range(0, n, step):
+        block = registers[start:start + step]
+        inverse = np.exp2(-block.astype(np.float64)).reshape(len(block), groups, m // groups)
+        empty = (block == 0).reshape(len(block), groups, m // groups)
+        part_harmonic, part_zeros = inverse.sum(axis=2), empty.sum(axis=2)
+        harmonic, zeros = part_harmonic.sum(axis=1), part_zeros.sum(axis=1)
+        sums[0] += _cardinality(harmonic, zeros, m).sum()
+        for g in range(groups if groups > 1 else 0):
+            loo = _cardinality(harmonic - part_harmonic[:, g], zeros - part_zeros[:, g], kept)
+            sums[g + 1] += loo.sum() * m / kept
+    return sums
+
+
+def relative_std(log2m: int) -> float:
+    """HyperLogLog relative standard deviation of one counter"""
+    return 1.04 / np.sqrt(1 << log2m)
+
+
+@dataclass(frozen=True)
+class NeighbourhoodFunction:
+    """
+    N(t) = estimated number of pairs (u, v) with d(u, v) <= t hops, t = 0..len - 1, plus the same
+    function from every delete-a-group register subset (rows of `jackknife`) for error bars
+    """
+    values: np.ndarray
+    jackknife: np.ndarray
+    log2m: int
+
+    @property
+    def relative_std(self) -> float:
+        return relative_std(self.log2m)
+
+    def std(self, statistic: Optional[Callable[[np.ndarray], float]] = None) -> float | np.ndarray:
+        """
+        delete-a-group jackknife standard error of statistic(N), or of N(t) itself when no
+        statistic is given: sqrt((G - 1) / G * sum (theta_g - mean theta)^2)
+        """
+        groups = len(self.jackknife)
+        if groups < 2:
+            return 0.0 if statistic else np.zeros(len(self.values))
+        thetas = self.jackknife if statistic is None else np.array([statistic(row) for row in self.jackknife])
+        return np.sqrt((groups - 1) / groups * ((thetas - thetas.mean(axis=0)) ** 2).sum(axis=0))
+
+    @staticmethod
+    def effective_diameter(values: np.ndarray, alpha: float = 0.9) -> float:
+        """interpolated smallest t at which N(t) reaches alpha * N(inf)"""
+        if len(values) < 2:
+            return 0.0
+        target = alpha * values[-1]
+        t = int(np.searchsorted(values, target))
+        if t == 0:
+            return 0.0
+        t = min(t, len(values) - 1)
+        below, above = values[t - 1], values[t]
+        return float(t - 1 + (target - below) / (above - below)) if above > below else float(t)
+
+    @staticmethod
+    def average_distance(values: np.ndarray) -> float:
+        """mean hops over reachable pairs u != v, from the distance distribution N(t) - N(t - 1)"""
+        if len(values) < 2:
+            return 0.0
+        pairs = np.diff(values)
+        total = pairs.sum()
+        return float((np.arange(1, len(values)) * pairs).sum() / total) if total > 0 else 0.0
+
+
+def jagged_diagonals(csr: CSRGraph):
+    """
+    jagged diagonal layout of the out-adjacency: rows renumbered by decreasing degree, so the
+    rows holding a k-th neighbor are always a prefix [0, counts[k]); cols[offsets[k]:offsets[k + 1]]
+    are those k-th neighbors (renumbered too). returns (order, counts, offsets, cols), order[i]
+    being the CSR row now numbered i
+    """
+    degree = np.diff(csr.indptr)
+    order = np.argsort(-degree, kind="stable")
+    renumber = np.empty(csr.n, dtype=np.int64)
+    renumber[order] = np.arange(csr.n)
+    sorted_degree = degree[order]
+    layers = int(sorted_degree[0]) if csr.n else 0
+    counts = np.searchsorted(-sorted_degree, -np.arange(1, layers + 1), side="right")
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    starts = csr.indptr[order]
+    cols = np.empty(offsets[-1], dtype=np.int32 if csr.n < 2 ** 31 else np.int64)
+    for k in range(layers):
+        cols[offsets[k]:offsets[k + 1]] = renumber[csr.indices[starts[:counts[k]] + k]]
+    return order, counts, offsets, cols
+
+
+def hyperanf(csr: CSRGraph, log2m: int = 7, seed: int = 420, groups: int = 8,
+             max_hops: int = 10_000) -> NeighbourhoodFunction:
+    """
+    [HYPERANF] (boldi, rosa & vigna) ball counters B(u, t + 1) = B(u, t) | union of B(v, t) over
+    the out-edges u -> v, every union a register-wise max. one pass over the edges per hop, in
+    jagged diagonals: the k-th neighbor of every row that has one is merged by one vectorized
+    maximum over a contiguous prefix of the counters. edges into counters that did not change in
+    the previous hop are skipped (B(u, t) already holds B(v, t - 1)); stops once nothing changes.
+    O(m * diameter) time, 2 * 2^log2m bytes per node. error bars come from a delete-a-group
+    jackknife over `groups` register slices of the same run
+    """
+    n = csr.n
+    groups = max(1, min(groups, (1 << log2m) // 4))
+    order, counts, offsets, cols = jagged_diagonals(csr)
+    registers = init_registers(n, log2m, seed)[order]
+    values = [estimate(registers, groups)]
+    changed = np.ones(n, dtype=bool)
+    for _ in range(max_hops):
+        nxt = registers.copy()
+        for k, count in enumerate(counts.tolist()):
+            neighbors = cols[offsets[k]:offsets[k + 1]]
+            live = changed[neighbors]
+            if live.all():
+                np.maximum(nxt[:count], registers[neighbors], out=nxt[:count])
+            elif live.any():
+                rows = np.flatnonzero(live)
+                nxt[rows] = np.maximum(nxt[rows], registers[neighbors[rows]])
+        changed = (nxt != registers).any(axis=1)
+        if not changed.any():
+            break
+        registers = nxt
+        values.append(estimate(registers, groups))
+    # counters only grow; keeps every estimate monotone like the true function
+    values = np.maximum.accumulate(np.array(values), axis=0)
+    return NeighbourhoodFunction(values[:, 0], values[:, 1:].T if groups > 1 else np.zeros((0, len(values))), log2m)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+import numpy as np
+
+ID_DTYPE = np.int32
+LABELS_SUFFIX = ".labels.npy"  # label table written next to id-only graph files (binary, compressed)
+
+
+class Labels(Protocol):
+    """anything that resolves dense ids back to labels"""
+    def label(self, ids: Sequence[int] | np.ndarray) -> List[Any]: ...
+
+
+class NodeTable:
+    """
+    [INTERNING] bijection between node labels of any type and dense int32 ids 0..n-1: labels[i] is
+    the label of id i. lookups are vectorized (searchsorted over the sorted labels), so metrics
+    keep working on dense arrays and labels are only resolved when results are written out
+    """
+    __slots__ = ("labels", "_order", "_sorted")
+
+    def __init__(self, labels: np.ndarray, order: Optional[np.ndarray] = None):
+        self.labels = labels
+        self._order = order  # argsort of labels; None when labels are already sorted
+        self._sorted = labels if order is None else labels[order]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @staticmethod
+    def from_columns(*columns: np.ndarray) -> "tuple[NodeTable, List[np.ndarray]]":
+        """sorted unique labels of all columns, and every column turned into ids"""
+        everything = np.concatenate([np.asarray(c) for c in columns]) if columns else np.zeros(0)
+        labels, inverse = np.unique(everything, return_inverse=True)
+        ids = inverse.astype(ID_DTYPE)
+        bounds = np.cumsum([0] + [len(c) for c in columns])
+        return NodeTable(labels), [ids[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+    def ids(self, labels: Sequence[Any] | np.ndarray) -> np.ndarray:
+        """ids of known labels; KeyError naming the first unknown one"""
+        labels = np.asarray(labels, dtype=self.labels.dtype) if len(self.labels) else np.asarray(labels)
+        pos = np.searchsorted(self._sorted, labels)
+        pos[pos == len(self._sorted)] = 0
+        found = self._sorted[pos] == labels if len(self._sorted) else np.zeros(len(labels), dtype=bool)
+        if not np.all(found):
+            raise KeyError(f"unknown node label: {labels[~found][0]!r}")
+        return (pos if self._order is None else self._order[pos]).astype(ID_DTYPE)
+
+    def label(self, ids: Sequence[int] | np.ndarray) -> List[Any]:
+        """python labels of ids (numpy scalars unwrapped), for output"""
+        return self.labels[np.asarray(ids, dtype=np.int64)].tolist()
+
+
+class StreamingInterner:
+    """
+    [INTERNING] hash-table interning for chunked input: ids are handed out in first-seen order,
+    each chunk is reduced to its unique labels (np.unique) first, so the python dict only sees
+    every distinct label of a chunk once
+    """
+    def __init__(self):
+        self._index: Dict[Any, int] = {}
+        self._labels: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def intern(self, labels: np.ndarray) -> np.ndarray:
+        if not len(labels):
+            return np.zeros(0, dtype=ID_DTYPE)
+        unique, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+        index = self._index
+        mapped = np.empty(len(unique), dtype=ID_DTYPE)
+        # new labels get their ids in order of first appearance within the chunk
+        for u in np.argsort(first, kind="stable").tolist():
+            label = unique[u].item()
+            i = index.get(label)
+            if i is None:
+                i = index[label] = len(self._labels)
+                self._labels.append(label)
+            mapped[u] = i
+        return mapped[inverse.ravel()]
+
+    def label(self, ids: Sequence[int] | np.ndarray) -> List[Any]:
+        """labels as they were read (tokens stay text); valid while interning goes on"""
+        labels = self._labels
+        return [labels[i] for i in np.asarray(ids, dtype=np.int64).tolist()]
+
+    def table(self) -> NodeTable:
+        """text tokens become integer labels once the whole input is known to be integers"""
+        labels = np.array(self._labels)
+        if labels.dtype.kind == "U":
+            parsed = parse_labels(labels)
+            if parsed.dtype.kind != "U" and len(np.unique(parsed)) == len(parsed):  # "7" and "07" stay text
+                labels = parsed
+        return NodeTable(labels, np.argsort(labels, kind="stable"))
+
+
+def label_sidecar(path: str | os.PathLike) -> str:
+    return os.fspath(path) + LABELS_SUFFIX
+
+
+def save_node_table(table: Optional[Labels], path: str | os.PathLike) -> Optional[str]:
+    """
+    writes the label table of an id-only graph file next to it (a streaming interner is frozen
+    first); without a table a stale sidecar of an earlier file at `path` is removed
+    """
+    sidecar = label_sidecar(path)
+    if table is None:
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+        return None
+    if isinstance(table, StreamingInterner):
+        table = table.table()
+    with open(sidecar, "wb") as f:
+        np.save(f, table.labels, allow_pickle=False)
+    return sidecar
+
+
+def load_node_table(path: str | os.PathLike) -> Optional[NodeTable]:
+    """label table stored next to a graph file, None when it has none"""
+    sidecar = label_sidecar(path)
+    if not os.path.exists(sidecar):
+        return None
+    labels = np.load(sidecar, allow_pickle=False)
+    return NodeTable(labels, np.argsort(labels, kind="stable"))
+
+
+def parse_labels(tokens: Sequence[str]) -> np.ndarray:
+    """integer labels when every token is one (int64, or uint64 for 64-bit hashes), strings otherwise"""
+    raw = np.asarray(tokens, dtype=str)
+    for dtype in (np.int64, np.uint64):
+        try:
+            return raw.astype(dtype)
+        except (ValueError, OverflowError):
+            continue
+    return raw
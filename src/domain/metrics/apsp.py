@@ -1,17 +1,60 @@
 from __future__ import annotations
 
+from typing import Optional
+
+import networkx as nx
+import numpy as np
+
 from src.domain.graph_model import Graph, RunParams
 from src.domain.metrics.base import Metric, MetricInfo, MetricResult
+from src.domain.metrics.plan import SummaryReducer, Traversal, TraversalReducer, reduce_alone
 from src.domain.metrics.registry import register_metric
+from src.domain.traversal import BFSSummary
 
 @register_metric("apsp")
 class APSPMetric(Metric):
     INFO = MetricInfo(
         name="all pairs shortest paths",
-        description="todo"
+        version="0.2.0",
+        description="mean and max shortest path distance over all reachable ordered pairs"
     )
 
-    # TODO
     def compute(self, graph: Graph, params: RunParams) -> MetricResult:
-        pass
+        if not graph.is_weighted():
+            return reduce_alone(self.reducer(graph, params))
+        return self._result(*self._weighted(graph), weighted=True)
+
+    def reducer(self, graph: Graph, params: RunParams) -> Optional[TraversalReducer]:
+        if graph.is_weighted():
+            return None
+        csr = graph.to_csr()
+        return SummaryReducer(Traversal(csr, np.arange(csr.n)), self._hops)
+
+    def _hops(self, summary: BFSSummary) -> MetricResult:
+        if len(summary.sources) == 0:
+            return self._result(0, 0.0, 0.0, weighted=False)
+        return self._result(int((summary.reached - 1).sum()), float(summary.distance_sum.sum()),
+                            float(summary.eccentricity.max()), weighted=False)
+
+    def _result(self, pairs: int, total: float, longest: float, weighted: bool) -> MetricResult:
+        return MetricResult(
+            metric=self.INFO.name,
+            summary={
+                "reachable_pairs": int(pairs),
+                "mean": float(total / pairs) if pairs else 0.0,
+                "max": float(longest),
+                "weighted": weighted,
+            }
+        )
 
+    @staticmethod
+    def _weighted(graph: Graph):
+        # networkx fallback: dijkstra from every source, aggregated row by row
+        pairs, total, longest = 0, 0.0, 0.0
+        for _, lengths in nx.all_pairs_dijkstra_path_length(graph.to_networkx(copy=False), weight="weight"):
+            if len(lengths) > 1:
+                values = np.fromiter(lengths.values(), dtype=np.float64, count=len(lengths))
+                pairs += len(values) - 1
+                total += values.sum()
+                longest = max(longest, values.max())
+        return pairs, total, longest
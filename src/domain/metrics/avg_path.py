@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from typing import Optional, Sequence
+
 import networkx as nx
 
 from src.domain.graph_model import Graph, RunParams
 from src.domain.metrics.base import Metric, MetricInfo, MetricResult
+from src.domain.metrics.plan import SummaryReducer, Traversal, TraversalReducer, reduce_alone
 from src.domain.metrics.registry import register_metric
+from src.domain.traversal import BFSSummary
 
 @register_metric("avg_path_length")
 class AvgPathLength(Metric):
@@ -14,19 +18,17 @@ class AvgPathLength(Metric):
     )
 
     def compute(self, graph: Graph, params: RunParams) -> MetricResult:
-        G = graph.to_networkx(copy=False)
         weight_arg = "weight" if graph.is_weighted() else None
+        if weight_arg is None:
+            return reduce_alone(self.reducer(graph, params))
 
-        UG = G.to_undirected() if G.is_directed() else G
+        UG = graph.undirected()
 
         if UG.number_of_nodes() <= 1:
             val = 0.0
         else:
-            if nx.is_connected(UG):
-                subgraph = UG
-            else:
-                largest_cc = max(nx.connected_components(UG), key=len)
-                subgraph = UG.subgraph(largest_cc)
+            largest_cc = graph.lcc_nodes()
+            subgraph = UG if len(largest_cc) == UG.number_of_nodes() else UG.subgraph(largest_cc)
 
             try:
                 val = nx.average_shortest_path_length(subgraph, weight=weight_arg)
@@ -37,3 +39,20 @@ class AvgPathLength(Metric):
             metric=self.INFO.name,
             summary={"avg": float(val), "weighted": bool(weight_arg)}
         )
+
+    def primitives(self, graph: Graph, params: RunParams) -> Sequence[str]:
+        return ("components",)
+
+    def reducer(self, graph: Graph, params: RunParams) -> Optional[TraversalReducer]:
+        """unweighted case: one bit-parallel BFS sweep from every node of the largest component"""
+        if graph.is_weighted():
+            return None
+        return SummaryReducer(Traversal(graph.undirected_csr(), graph.largest_component()), self._finish)
+
+    def _finish(self, summary: BFSSummary) -> MetricResult:
+        k = len(summary.sources)
+        val = summary.distance_sum.sum() / (k * (k - 1)) if k > 1 else 0.0
+        return MetricResult(
+            metric=self.INFO.name,
+            summary={"avg": float(val), "weighted": False}
+        )
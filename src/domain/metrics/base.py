@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Mapping
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Sequence
 
-from src.domain.graph_model import Graph, RunParams, ArtifactHandle
+from src.domain.graph_model import Graph, GraphView, RunParams, ArtifactHandle
+
+if TYPE_CHECKING:
+    from src.domain.metrics.plan import TraversalReducer
 
 
 @dataclass(frozen=True)
@@ -25,4 +28,25 @@ class Metric(ABC):
     INFO: MetricInfo
 
     def compute(self, graph: Graph, params: RunParams) -> MetricResult:
-        pass
\ No newline at end of file
+        pass
+
+    def reducer(self, graph: Graph, params: RunParams) -> Optional[TraversalReducer]:
+        """
+        metrics computable from a multi-source BFS return a reducer over their traversal
+        (metrics.plan), so compute_metrics can share one pass between them; None otherwise
+        """
+        return None
+
+    def reference(self, graph: Graph, params: RunParams) -> Optional[Graph]:
+        """
+        the original graph to compare against: params["reference"], else the parent of a sparsifier
+        view; None when there is nothing to compare with or the reference is the graph itself
+        """
+        reference: Optional[Graph] = params.get("reference")
+        if reference is None and isinstance(graph, GraphView):
+            reference = graph.parent
+        return None if reference is graph else reference
+
+    def primitives(self, graph: Graph, params: RunParams) -> Sequence[str]:
+        """shared structures consumed (keys of metrics.plan.PRIMITIVES), built once per plan"""
+        return ()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import numpy as np
+
+from src.domain.centrality import (
+    BetweennessEstimate, estimate_betweenness, rows_in, top_k_rank_correlation,
+)
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.base import Metric, MetricInfo, MetricResult
+from src.domain.metrics.registry import register_metric
+
+
+def _estimate(graph: Graph, params: RunParams) -> BetweennessEstimate:
+    """
+    one estimate per (epsilon, delta, seed, samples): the sample count follows from the vertex
+    diameter bound of this graph, so estimates under other accuracy settings are not interchangeable
+    """
+    epsilon, delta = params.get("epsilon", 0.05), params.get("delta", 0.1)
+    seed, samples = params.get("seed", 420), params.get("samples")
+    return graph.derived(
+        f"betweenness:{epsilon}:{delta}:{seed}:{samples}",
+        lambda: estimate_betweenness(graph.to_csr(), epsilon=epsilon, delta=delta, seed=seed,
+                                     workers=params.get("workers", 1), samples=samples),
+    )
+
+
+@register_metric("betweenness")
+class ApproximateBetweenness(Metric):
+    INFO = MetricInfo(
+        name="approximate betweenness",
+        version="0.1.0",
+        description="(eps, delta) path-sampling betweenness (riondato-kornaropoulos) and top-k rank correlation with the original graph"
+    )
+
+    def compute(self, graph: Graph, params: RunParams) -> MetricResult:
+        reference = self.reference(graph, params)
+
+        csr = graph.to_csr()
+        estimate = _estimate(graph, params)
+        values = estimate.values
+        k = params.get("top_k", 20)
+
+        summary: Dict[str, Any] = {
+            "samples": estimate.samples,
+            "epsilon": estimate.epsilon,
+            "delta": estimate.delta,
+            "vertex_diameter_bound": estimate.vertex_diameter,
+            "max": float(values.max(initial=0.0)),
+            "mean": float(values.mean()) if len(values) else 0.0,
+        }
+        top = np.argsort(-values, kind="stable")[:k]
+        artifacts = {"top_nodes": graph.node_labels(csr.nodes[i] for i in top.tolist()), "top_values": values[top].tolist()}
+
+        if reference is not None:
+            original = _estimate(reference, params)
+            ref_csr = reference.to_csr()
+            # nodes the reduction dropped count as carrying no traffic
+            tau, overlap = top_k_rank_correlation(rows_in(csr, values, ref_csr), original.values, k)
+            summary.update({
+                "original_samples": original.samples,
+                "original_max": float(original.values.max(initial=0.0)),
+                "top_k": min(k, ref_csr.n),
+                "top_k_kendall_tau": tau,
+                "top_k_overlap": overlap,
+            })
+
+        return MetricResult(metric=self.INFO.name, summary=summary, artifacts=artifacts)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.domain.contraction import ContractionHierarchy
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.base import Metric, MetricInfo, MetricResult
+from src.domain.metrics.registry import register_metric
+
+
+def _hierarchy(graph: Graph, witness_settle_limit: int) -> ContractionHierarchy:
+    """overlays produced by the contraction_hierarchy transform are reused as they are"""
+    ch = ContractionHierarchy.from_networkx(graph.to_networkx(copy=False))
+    if ch is None:
+        return ContractionHierarchy.build(graph, witness_settle_limit=witness_settle_limit)
+    ch.preprocess_time = graph.metadata.get("preprocess_time", 0.0)
+    return ch
+
+
+def _bench(ch: ContractionHierarchy, pairs: List[tuple]) -> Dict[str, Any]:
+    index = ch.csr.index
+    rows = [(index[u], index[v]) for u, v in pairs]
+    distances = np.empty(len(rows))
+    settled = 0
+    start = time.perf_counter()
+    for i, (s, t) in enumerate(rows):
+        distances[i], k = ch.query(s, t)
+        settled += k
+    elapsed = time.perf_counter() - start
+    return {
+        "preprocess_time": ch.preprocess_time,
+        "shortcuts": ch.shortcuts,
+        "query_us": elapsed / max(len(rows), 1) * 1e6,
+        "settled": settled / max(len(rows), 1),
+        "distances": distances,
+    }
+
+
+@register_metric("ch_query")
+class CHQueryBenchmark(Metric):
+    INFO = MetricInfo(
+        name="contraction hierarchy queries",
+        version="0.1.0",
+        description="CH preprocessing time, shortcuts and point-to-point query us/op, against the original graph"
+    )
+
+    def compute(self, graph: Graph, params: RunParams) -> MetricResult:
+        reference = self.reference(graph, params)
+
+        limit = params.get("witness_settle_limit", 64)
+        ch = _hierarchy(graph, limit)
+        ref = _hierarchy(reference, limit) if reference is not None else None
+
+        # query pairs among nodes present in both graphs
+        nodes = ch.csr.nodes if ref is None else [v for v in ch.csr.nodes if v in ref.csr.index]
+        if len(nodes) < 2:
+            return MetricResult(metric=self.INFO.name, summary={"shortcuts": ch.shortcuts})
+        rng = np.random.default_rng(params.get("seed", 420))
+        picks = rng.integers(0, len(nodes), (params.get("queries", 500), 2))
+        pairs = [(nodes[a], nodes[b]) for a, b in picks.tolist()]
+
+        reduced = _bench(ch, pairs)
+        summary: Dict[str, Any] = {k: v for k, v in reduced.items() if k != "distances"}
+
+        if ref is not None:
+            original = _bench(ref, pairs)
+            d, d0 = reduced["distances"], original["distances"]
+            both = np.isfinite(d) & np.isfinite(d0) & (d0 > 0)
+            summary.update({
+                "original_preprocess_time": original["preprocess_time"],
+                "original_shortcuts": original["shortcuts"],
+                "original_query_us": original["query_us"],
+                "query_speedup": original["query_us"] / reduced["query_us"] if reduced["query_us"] else 0.0,
+                "stretch": float(np.mean(d[both] / d0[both])) if both.any() else 1.0,
+                "lost_pairs": int((np.isfinite(d0) & ~np.isfinite(d)).sum()),
+            })
+
+        return MetricResult(metric=self.INFO.name, summary=summary)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.base import Metric, MetricInfo, MetricResult
+from src.domain.metrics.registry import register_metric
+from src.domain.triangles import Clustering, count_triangles, forward_graph, sample_wedges
+
+
+def _clustering(graph: Graph, params: RunParams) -> Clustering:
+    """memoized on the graph; the oriented forward adjacency is shared by both modes"""
+    fwd = graph.derived("forward_graph", lambda: forward_graph(graph.to_csr()))
+    if params.get("approximate", False):
+        epsilon, delta, seed = params.get("epsilon", 0.01), params.get("delta", 0.1), params.get("seed", 420)
+        return graph.derived(
+            f"clustering:sampled:{epsilon}:{delta}:{seed}",
+            lambda: sample_wedges(graph.to_csr(), epsilon=epsilon, delta=delta, seed=seed, fwd=fwd),
+        )
+    return graph.derived(
+        "clustering:exact",
+        lambda: count_triangles(graph.to_csr(), method=params.get("method", "auto"),
+                                workers=params.get("workers", 1), fwd=fwd),
+    )
+
+
+@register_metric("clustering")
+class ClusteringCoefficient(Metric):
+    INFO = MetricInfo(
+        name="clustering",
+        version="0.1.0",
+        description="triangle counts, transitivity and average local clustering (exact forward counting or wedge sampling) against the original graph"
+    )
+
+    def compute(self, graph: Graph, params: RunParams) -> MetricResult:
+        reference = self.reference(graph, params)
+
+        result = _clustering(graph, params)
+        summary: Dict[str, Any] = {
+            "triangles": result.triangles,
+            "wedges": result.wedges,
+            "transitivity": result.transitivity,
+            "average_clustering": result.average,
+            "samples": result.samples,
+        }
+        artifacts: Dict[str, Any] = {}
+        if result.local is not None:
+            artifacts = {"nodes": graph.node_labels(graph.to_csr().nodes), "local_clustering": result.local.tolist()}
+
+        if reference is not None:
+            original = _clustering(reference, params)
+            summary.update({
+                "original_transitivity": original.transitivity,
+                "original_average_clustering": original.average,
+                "triangles_kept": result.triangles / original.triangles if original.triangles else 1.0,
+            })
+
+        return MetricResult(metric=self.INFO.name, summary=summary, artifacts=artifacts)
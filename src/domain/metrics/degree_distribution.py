@@ -1,38 +1,130 @@
 from __future__ import annotations
-import collections
-import networkx as nx
+
+from typing import Dict, Sequence
+
+import numpy as np
 
 from src.domain.graph_model import Graph, RunParams
 from src.domain.metrics.base import Metric, MetricInfo, MetricResult
 from src.domain.metrics.registry import register_metric
 
 
+def degree_counts(graph: Graph) -> np.ndarray:
+    """counts[k] = number of vertices of degree k, straight from the CSR row pointers"""
+    return np.bincount(graph.degrees())
+
+
+def log_binned(counts: np.ndarray, bins_per_decade: int = 10) -> Dict[str, np.ndarray]:
+    """
+    pdf over logarithmic degree bins [edges[i], edges[i + 1]) normalized by bin width,
+    and the ccdf P(D >= edges[i]); degree 0 is left out of the bins
+    """
+    n = counts.sum()
+    max_degree = len(counts) - 1
+    if n == 0 or max_degree < 1:
+        return {"bin_edges": np.array([1]), "pdf": np.zeros(0), "ccdf": np.zeros(1)}
+
+    decades = np.log10(max_degree + 1)
+    edges = np.unique(np.floor(np.logspace(0, decades, max(2, int(np.ceil(decades * bins_per_decade)) + 1))))
+    edges = edges.astype(np.int64)
+    if edges[-1] <= max_degree:
+        edges = np.append(edges, max_degree + 1)
+
+    at_least = np.concatenate([np.cumsum(counts[::-1])[::-1], [0]])  # at_least[k] = #{D >= k}
+    in_bin = at_least[edges[:-1]] - at_least[edges[1:]]
+    return {
+        "bin_edges": edges,
+        "pdf": in_bin / (n * np.diff(edges)),
+        "ccdf": at_least[edges] / n,
+    }
+
+
+def power_law_tail(counts: np.ndarray, min_tail: int = 10, candidates: int = 64) -> Dict[str, float]:
+    """
+    discrete power-law fit of the degree tail (clauset, shalizi & newman): for every candidate
+    x_min the approximate MLE alpha = 1 + n / sum(ln(x / (x_min - 1/2))) is computed from suffix
+    sums, and the x_min whose fit has the smallest KS distance to the empirical tail wins.
+    O(U * candidates) for U distinct degrees, independent of the edge count
+    """
+    k = np.flatnonzero(counts)
+    k = k[k >= 1]
+    if len(k) < 2:
+        return {"alpha": float("nan"), "x_min": float("nan"), "ks": float("nan"), "n_tail": 0}
+    c = counts[k].astype(np.float64)
+
+    tail_n = np.cumsum(c[::-1])[::-1]
+    tail_log = np.cumsum((c * np.log(k))[::-1])[::-1]
+    alphas = 1.0 + tail_n / (tail_log - tail_n * np.log(k - 0.5))
+
+    eligible = np.flatnonzero((tail_n >= min_tail) & np.isfinite(alphas) & (alphas > 1.0))
+    if len(eligible) == 0:
+        return {"alpha": float("nan"), "x_min": float("nan"), "ks": float("nan"), "n_tail": 0}
+    if len(eligible) > candidates:
+        eligible = eligible[np.unique(np.geomspace(1, len(eligible), candidates).astype(np.int64) - 1)]
+
+    best = (np.inf, 0)
+    for j in eligible:
+        empirical = tail_n[j:] / tail_n[j]
+        model = ((k[j:] - 0.5) / (k[j] - 0.5)) ** (1.0 - alphas[j])
+        ks = float(np.abs(empirical - model).max())
+        if ks < best[0]:
+            best = (ks, j)
+
+    ks, j = best
+    return {"alpha": float(alphas[j]), "x_min": float(k[j]), "ks": ks, "n_tail": int(tail_n[j])}
+
+
+def ks_distance(counts_a: np.ndarray, counts_b: np.ndarray) -> float:
+    """two-sample kolmogorov-smirnov distance between two degree histograms"""
+    if counts_a.sum() == 0 or counts_b.sum() == 0:
+        return 0.0
+    size = max(len(counts_a), len(counts_b))
+    cdf_a = np.cumsum(np.pad(counts_a, (0, size - len(counts_a)))) / counts_a.sum()
+    cdf_b = np.cumsum(np.pad(counts_b, (0, size - len(counts_b)))) / counts_b.sum()
+    return float(np.abs(cdf_a - cdf_b).max())
+
+
 @register_metric("degree_distribution")
-class APSPMetric(Metric):
+class DegreeDistribution(Metric):
     INFO = MetricInfo(
         name="degree distribution",
-        description="probability distribution of vertex degrees"
+        version="0.2.0",
+        description="log-binned degree pdf/ccdf, power-law tail fit and KS distance to the original graph"
     )
 
-    # TODO
+    def primitives(self, graph: Graph, params: RunParams) -> Sequence[str]:
+        return ("degrees",)
+
     def compute(self, graph: Graph, params: RunParams) -> MetricResult:
-        G = graph.to_networkx(copy=False)
-        n = G.number_of_nodes()
+        counts = degree_counts(graph)
+        n = int(counts.sum())
 
         if n == 0:
             return MetricResult(metric=self.INFO.name, summary={"entropy": 0.0})
 
-        degrees = [d for _, d in G.degree()]
-        counts = collections.Counter(degrees)
-        distribution = {k: count / n for k, count in counts.items()}
-        # top_k = dict(counts.most_common(5))
+        reference = self.reference(graph, params)
+
+        degrees = np.flatnonzero(counts)
+        p = counts[degrees] / n
+        fit = power_law_tail(counts, min_tail=params.get("min_tail", 10))
+        binned = log_binned(counts, bins_per_decade=params.get("bins_per_decade", 10))
+
+        summary = {
+            "max_degree": int(degrees[-1]),
+            "min_degree": int(degrees[0]),
+            "mean_degree": float(degrees @ counts[degrees] / n),
+            "unique_degrees": len(degrees),
+            "entropy": float(-(p * np.log2(p)).sum()),
+            "tail_alpha": fit["alpha"],
+            "tail_x_min": fit["x_min"],
+            "tail_ks": fit["ks"],
+            "tail_size": fit["n_tail"],
+        }
+        if reference is not None:
+            summary["ks_vs_original"] = ks_distance(counts, degree_counts(reference))
 
         return MetricResult(
             metric=self.INFO.name,
-            summary={
-                "max_degree": max(degrees) if degrees else 0,
-                "min_degree": min(degrees) if degrees else 0,
-                "unique_degrees": len(distribution)
-            },
-            artifacts={"distribution": distribution}
+            summary=summary,
+            artifacts={key: values.tolist() for key, values in binned.items()}
         )
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import networkx as nx
+from typing import Optional, Sequence
 
 from src.domain.graph_model import Graph, RunParams
 from src.domain.metrics.base import Metric, MetricInfo, MetricResult
+from src.domain.metrics.plan import SummaryReducer, Traversal, TraversalReducer, reduce_alone
 from src.domain.metrics.registry import register_metric
+from src.domain.traversal import BFSSummary
 
 # TODO: decide whether diameter should be inf or the diameter of the largest connected component
 @register_metric("diameter")
@@ -16,21 +18,18 @@ class Diameter(Metric):
     )
 
     def compute(self, graph: Graph, params: RunParams) -> MetricResult:
-        G = graph.to_networkx(copy=False)
-        UG = G.to_undirected() if G.is_directed() else G
+        return reduce_alone(self.reducer(graph, params))
 
-        component_size = 0
-        if UG.number_of_nodes() == 0:
-            val = 0.0
-        elif nx.is_connected(UG):
-            val = float(nx.diameter(UG))
-            component_size = UG.number_of_nodes()
-        else:
-            largest_cc = max(nx.connected_components(UG), key=len)
-            subgraph = UG.subgraph(largest_cc)
-            val = float(nx.diameter(subgraph))
-            component_size = len(largest_cc)
+    def primitives(self, graph: Graph, params: RunParams) -> Sequence[str]:
+        return ("components",)
 
+    def reducer(self, graph: Graph, params: RunParams) -> Optional[TraversalReducer]:
+        # hop diameter: weights are ignored, directions too (as for nx.diameter on G.to_undirected())
+        traversal = Traversal(graph.undirected_csr(), graph.largest_component())
+        return SummaryReducer(traversal, self._finish)
+
+    def _finish(self, summary: BFSSummary) -> MetricResult:
+        val = float(summary.eccentricity.max()) if len(summary.sources) else 0.0
         return MetricResult(
             metric=self.INFO.name,
             summary={
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Any, Dict
+
+import numpy as np
+
+from src.domain.graph_model import Graph, RunParams
+from src.domain.hyperanf import NeighbourhoodFunction, hyperanf
+from src.domain.metrics.base import Metric, MetricInfo, MetricResult
+from src.domain.metrics.registry import register_metric
+
+
+def _neighbourhood(graph: Graph, params: RunParams) -> NeighbourhoodFunction:
+    """
+    HyperANF counters for (log2m, seed, groups); log2m sets the register count and with it the
+    relative standard deviation of every count, so it is part of the key
+    """
+    log2m, seed, groups = params.get("log2m", 7), params.get("seed", 420), params.get("groups", 8)
+    return graph.derived(
+        f"hyperanf:{log2m}:{seed}:{groups}",
+        lambda: hyperanf(graph.to_csr(), log2m=log2m, seed=seed, groups=groups),
+    )
+
+
+@register_metric("distance_distribution")
+class DistanceDistribution(Metric):
+    INFO = MetricInfo(
+        name="distance distribution",
+        version="0.1.0",
+        description="HyperANF neighbourhood function (hop distances), effective diameter and average distance with jackknife error bars"
+    )
+
+    def compute(self, graph: Graph, params: RunParams) -> MetricResult:
+        reference = self.reference(graph, params)
+
+        nf = _neighbourhood(graph, params)
+        effective = partial(NeighbourhoodFunction.effective_diameter, alpha=params.get("alpha", 0.9))
+        average = NeighbourhoodFunction.average_distance
+        summary: Dict[str, Any] = {
+            "hops": len(nf.values) - 1,
+            "reachable_pairs": float(nf.values[-1] - nf.values[0]),
+            "effective_diameter": effective(nf.values),
+            "effective_diameter_std": float(nf.std(effective)),
+            "average_distance": average(nf.values),
+            "average_distance_std": float(nf.std(average)),
+            "counter_relative_std": nf.relative_std,
+        }
+        artifacts = {
+            "neighbourhood_function": nf.values.tolist(),
+            "neighbourhood_function_std": np.asarray(nf.std()).tolist(),
+            "distance_distribution": np.diff(nf.values).tolist(),
+        }
+
+        if reference is not None:
+            original = _neighbourhood(reference, params)
+            summary.update({
+                "original_effective_diameter": effective(original.values),
+                "original_average_distance": average(original.values),
+            })
+
+        return MetricResult(metric=self.INFO.name, summary=summary, artifacts=artifacts)
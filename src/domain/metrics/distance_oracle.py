@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.base import Metric, MetricInfo, MetricResult
+from src.domain.metrics.registry import register_metric
+from src.domain.oracle import LandmarkIndex
+
+
+@register_metric("distance_oracle")
+class DistanceOracle(Metric):
+    INFO = MetricInfo(
+        name="distance oracle",
+        version="0.1.0",
+        description="landmark (ALT) index size, build time, bound quality and A* query latency percentiles"
+    )
+
+    def compute(self, graph: Graph, params: RunParams) -> MetricResult:
+        csr = graph.to_csr()
+        if csr.n < 2:
+            return MetricResult(metric=self.INFO.name, summary={"landmarks": 0})
+
+        index = LandmarkIndex.build(csr, landmarks=params.get("landmarks", 16), seed=params.get("seed", 420))
+
+        rng = np.random.default_rng(params.get("seed", 420))
+        queries = params.get("queries", 200)
+        src, dst = rng.integers(0, csr.n, queries), rng.integers(0, csr.n, queries)
+
+        start = time.perf_counter()
+        lower, upper = index.bounds(src, dst)
+        bounds_time = time.perf_counter() - start
+
+        latencies, exact = np.empty(queries), np.empty(queries)
+        settled = 0
+        for i, (s, t) in enumerate(zip(src.tolist(), dst.tolist())):
+            start = time.perf_counter()
+            exact[i], k = index.astar(s, t)
+            latencies[i] = time.perf_counter() - start
+            settled += k
+
+        reachable = np.isfinite(exact) & (exact > 0)
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1e6
+
+        return MetricResult(
+            metric=self.INFO.name,
+            summary={
+                "landmarks": len(index.landmarks),
+                "index_bytes": index.nbytes,
+                "build_time": index.build_time,
+                "bounds_us_per_query": bounds_time / queries * 1e6,
+                "astar_us_p50": float(p50),
+                "astar_us_p90": float(p90),
+                "astar_us_p99": float(p99),
+                "avg_settled": settled / queries,
+                "upper_rel_error": float(np.mean(upper[reachable] / exact[reachable] - 1)) if reachable.any() else 0.0,
+                "lower_rel_error": float(np.mean(1 - lower[reachable] / exact[reachable])) if reachable.any() else 0.0,
+            }
+        )
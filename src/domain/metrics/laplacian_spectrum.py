@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.base import Metric, MetricInfo, MetricResult
+from src.domain.metrics.registry import register_metric
+from src.domain.spectral import Spectrum, relative_error, spectrum
+
+
+def _spectrum(graph: Graph, params: RunParams) -> Spectrum:
+    """keyed by every setting that changes the eigenvalues (k, normalization, solver and its tolerance)"""
+    k, normalized = params.get("k", 6), params.get("normalized", True)
+    method, tol = params.get("method", "lanczos"), params.get("tol", 1e-8)
+    return graph.derived(
+        f"spectrum:{k}:{normalized}:{method}:{tol}",
+        lambda: spectrum(graph.to_csr(), k=k, normalized=normalized, method=method, tol=tol,
+                         seed=params.get("seed", 420)),
+    )
+
+
+@register_metric("laplacian_spectrum")
+class LaplacianSpectrum(Metric):
+    INFO = MetricInfo(
+        name="laplacian spectrum",
+        version="0.1.0",
+        description="k extreme eigenvalues of the sparse (normalized) laplacian, spectral gap and relative eigenvalue error against the original graph"
+    )
+
+    def compute(self, graph: Graph, params: RunParams) -> MetricResult:
+        reference = self.reference(graph, params)
+
+        result = _spectrum(graph, params)
+        summary: Dict[str, Any] = {
+            "k": len(result.smallest),
+            "normalized": result.normalized,
+            "algebraic_connectivity": result.algebraic_connectivity,
+            "spectral_gap": result.spectral_gap,
+            "lambda_max": float(result.largest[-1]) if len(result.largest) else 0.0,
+            "zero_eigenvalues": result.zero_eigenvalues,
+        }
+        artifacts = {"smallest": result.smallest.tolist(), "largest": result.largest.tolist()}
+
+        if reference is not None:
+            original = _spectrum(reference, params)
+            summary.update({
+                "original_algebraic_connectivity": original.algebraic_connectivity,
+                "original_spectral_gap": original.spectral_gap,
+                "smallest_rel_error": relative_error(result.smallest, original.smallest),
+                "largest_rel_error": relative_error(result.largest, original.largest),
+            })
+
+        return MetricResult(metric=self.INFO.name, summary=summary, artifacts=artifacts)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.domain.csr import CSRGraph
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.base import Metric, MetricResult
+from src.domain.traversal import BFSSummary, MultiSourceBFS, bit_counts
+
+# shared primitives a metric may declare besides traversals; all are memoized on the graph, so the
+# plan only builds them upfront (and reports who shares them)
+PRIMITIVES: Dict[str, Callable[[Graph], Any]] = {
+    "components": Graph.component_labels,
+    "degrees": Graph.degrees,
+}
+
+
+@dataclass(frozen=True)
+class Traversal:
+    """[PRIMITIVE] unweighted single-source shortest paths from every source of a set, over one CSR"""
+    csr: CSRGraph
+    sources: np.ndarray  # CSR rows, ascending
+
+
+class LevelBlock:
+    """one BFS level of one batch of the shared traversal: rows first reached, and by which sources"""
+    __slots__ = ("level", "rows", "packed", "width", "_counts")
+
+    def __init__(self, level: int, rows: np.ndarray, packed: np.ndarray, width: int):
+        self.level = level
+        self.rows = rows
+        self.packed = packed
+        self.width = width
+        self._counts: Optional[np.ndarray] = None
+
+    @property
+    def counts(self) -> np.ndarray:
+        """nodes reached at this level per batch column, computed once for all reducers"""
+        if self._counts is None:
+            self._counts = bit_counts(self.packed, self.width)
+        return self._counts
+
+
+class TraversalReducer(ABC):
+    """
+    [STRATEGY] folds the streamed levels of a (possibly shared) traversal into one metric's result.
+    consume() gets the batch columns that belong to this reducer's sources and their positions
+    in `traversal.sources`
+    """
+    def __init__(self, traversal: Traversal):
+        self.traversal = traversal
+
+    @abstractmethod
+    def consume(self, block: LevelBlock, columns: np.ndarray, positions: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def result(self) -> MetricResult:
+        pass
+
+
+class SummaryReducer(TraversalReducer):
+    """eccentricity, distance sum and reach per source (as MultiSourceBFS.summarize), then `finish`"""
+    def __init__(self, traversal: Traversal, finish: Callable[[BFSSummary], MetricResult]):
+        super().__init__(traversal)
+        k = len(traversal.sources)
+        self.eccentricity = np.zeros(k, dtype=np.int64)
+        self.distance_sum = np.zeros(k, dtype=np.int64)
+        self.reached = np.zeros(k, dtype=np.int64)
+        self.finish = finish
+
+    def consume(self, block: LevelBlock, columns: np.ndarray, positions: np.ndarray) -> None:
+        counts = block.counts[columns]
+        self.distance_sum[positions] += block.level * counts
+        self.reached[positions] += counts
+        self.eccentricity[positions[counts > 0]] = block.level
+
+    def result(self) -> MetricResult:
+        return self.finish(BFSSummary(self.traversal.sources, self.eccentricity, self.distance_sum, self.reached))
+
+
+@dataclass
+class PlanGroup:
+    """reducers fed by one traversal pass over the union of their sources"""
+    csr: CSRGraph
+    metrics: List[str]
+    reducers: List[TraversalReducer]
+    sources: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    traversal_time: float = 0.0
+
+    @property
+    def label(self) -> str:
+        kind = "directed" if self.csr.directed else "undirected"
+        return f"bfs[{kind}, {len(self.sources)} sources]: " + ", ".join(self.metrics)
+
+
+class ExecutionPlan:
+    """
+    [PLAN] groups the metrics of one compute_metrics call by the primitives they consume: reducers
+    over the same CSR share a single multi-source BFS over the union of their source sets (each
+    still sees only its own sources), declared primitives are built once; everything else runs
+    through Metric.compute as before
+    """
+    def __init__(self, graph: Graph, metrics: Dict[str, Metric], params: RunParams):
+        self.graph = graph
+        self.params = params
+        self.groups: List[PlanGroup] = []
+        self.standalone: List[str] = []
+        self.primitives: Dict[str, List[str]] = {}
+        self._group_of: Dict[str, PlanGroup] = {}
+
+        by_csr: Dict[int, PlanGroup] = {}
+        for name, metric in metrics.items():
+            for primitive in metric.primitives(graph, params):
+                self.primitives.setdefault(primitive, []).append(name)
+            reducer = metric.reducer(graph, params)
+            if reducer is None:
+                self.standalone.append(name)
+                continue
+            csr = reducer.traversal.csr
+            group = by_csr.get(id(csr))
+            if group is None:
+                group = by_csr[id(csr)] = PlanGroup(csr, [], [])
+                self.groups.append(group)
+            group.metrics.append(name)
+            group.reducers.append(reducer)
+            self._group_of[name] = group
+        for group in self.groups:
+            group.sources = np.unique(np.concatenate([r.traversal.sources for r in group.reducers]))
+
+    # EXECUTION
+
+    def prepare(self) -> None:
+        for primitive in self.primitives:
+            PRIMITIVES[primitive](self.graph)
+
+    def run_traversals(self) -> Dict[str, MetricResult]:
+        """one pass per group; returns the reduced result of every grouped metric"""
+        results: Dict[str, MetricResult] = {}
+        for group in self.groups:
+            start = time.perf_counter()
+            run_shared(group.csr, group.sources, group.reducers)
+            group.traversal_time = time.perf_counter() - start
+            for name, reducer in zip(group.metrics, group.reducers):
+                results[name] = reducer.result()
+        return results
+
+    # REPORTING
+
+    def group_of(self, name: str) -> Optional[PlanGroup]:
+        return self._group_of.get(name)
+
+    def stats(self, name: str) -> Dict[str, Any]:
+        """plan entries merged into the summary of metric `name`"""
+        stats: Dict[str, Any] = {}
+        group = self._group_of.get(name)
+        if group is not None:
+            stats.update({
+                "plan_group": group.label,
+                "plan_shared_by": len(group.metrics),
+                "plan_traversal_time": group.traversal_time,
+                "plan_saved_passes": len(group.metrics) - 1,
+            })
+        shared = [p for p, users in self.primitives.items() if name in users and len(users) > 1]
+        if shared:
+            stats["plan_shared_primitives"] = ", ".join(shared)
+        return stats
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "traversals": [group.label for group in self.groups],
+            "traversal_passes": len(self.groups),
+            "passes_saved": sum(len(group.metrics) - 1 for group in self.groups),
+            "primitives": {p: list(users) for p, users in self.primitives.items()},
+            "standalone": list(self.standalone),
+        }
+
+
+def run_shared(csr: CSRGraph, sources: np.ndarray, reducers: Sequence[TraversalReducer]) -> None:
+    """
+    streams the levels of a multi-source BFS from `sources` (ascending, the union of the reducers'
+    sources) into every reducer, each restricted to the batch columns of its own sources
+    """
+    bfs = MultiSourceBFS(csr)
+    # position of every reducer source within the union
+    union_pos = [np.searchsorted(sources, r.traversal.sources) for r in reducers]
+    for start in range(0, len(sources), bfs.batch_size):
+        batch = sources[start:start + bfs.batch_size]
+        end = start + len(batch)
+        routes = []
+        for reducer, pos in zip(reducers, union_pos):
+            positions = np.flatnonzero((pos >= start) & (pos < end))
+            if len(positions):
+                routes.append((reducer, pos[positions] - start, positions))
+        for level, rows, packed in bfs.iter_levels(batch):
+            block = LevelBlock(level, rows, packed, len(batch))
+            for reducer, columns, positions in routes:
+                reducer.consume(block, columns, positions)
+
+
+def reduce_alone(reducer: TraversalReducer) -> MetricResult:
+    """Metric.compute for reducer metrics: a plan of one"""
+    run_shared(reducer.traversal.csr, reducer.traversal.sources, [reducer])
+    return reducer.result()
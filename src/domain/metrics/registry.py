@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from typing import Callable, Dict, Type
+from typing import TYPE_CHECKING, Optional, Callable, Dict, Type
 
-from .base import Metric
-from src.domain.common.plugin_discovery import discover_modules
+from src.domain.common.plugin_discovery import PluginEntry, PluginManifest, discover_modules
+
+if TYPE_CHECKING:  # plugin base classes pull in networkx, listing plugins should not
+    from .base import Metric
 
 _METRICS: Dict[str, Type[Metric]] = {}
 _DISCOVERED = False
+_MANIFEST = PluginManifest("src.domain.metrics", decorators=("register_metric", "register"))
 
 
 class MetricRegistry:
@@ -39,19 +42,26 @@ class MetricRegistry:
 
     @staticmethod
     def get(name: str) -> Metric:
-        MetricRegistry.ensure_discovered()
+        """imports only the module that registers `name` (looked up in the plugin manifest)"""
         key = name.strip()
+        if key not in _METRICS and not _MANIFEST.import_plugin(key):
+            MetricRegistry.ensure_discovered()  # plugins the manifest cannot see statically
         try:
             cls = _METRICS[key]
         except KeyError as e:
-            available = ", ".join(sorted(_METRICS.keys()))
+            available = ", ".join(MetricRegistry.list())
             raise KeyError(f"unknown metric '{key}'. available: [{available}]") from e
         return cls()
 
     @staticmethod
     def list() -> list[str]:
-        MetricRegistry.ensure_discovered()
-        return sorted(_METRICS.keys())
+        """registered names, read from the manifest without importing any plugin"""
+        return sorted(set(_MANIFEST.entries) | set(_METRICS))
+
+    @staticmethod
+    def info(name: str) -> Optional[PluginEntry]:
+        """manifest entry (module, version, declared capabilities) of a plugin"""
+        return _MANIFEST.get(name.strip())
 
 
 register_metric = MetricRegistry.register
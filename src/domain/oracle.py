@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import heapq
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.domain.csr import CSRGraph
+from src.domain.graph_model import Graph
+from src.domain.traversal import shortest_distances
+
+INF = float("inf")
+
+
+@dataclass(frozen=True)
+class OracleAnswer:
+    """answers of one query batch, aligned with the queried pairs"""
+    lower: np.ndarray                     # landmark lower bounds
+    upper: np.ndarray                     # landmark upper bounds, the estimate
+    exact: Optional[np.ndarray] = None    # A* distances (inf when unreachable)
+    settled: Optional[np.ndarray] = None  # nodes settled by each A* search
+
+    @property
+    def estimate(self) -> np.ndarray:
+        return self.upper
+
+
+class LandmarkIndex:
+    """
+    [INDEX] landmark (ALT) distance oracle over a graph's CSR: distance tables from (and, when
+    directed, to) k landmarks picked by farthest-point selection. the triangle inequality turns
+    them into O(k) lower/upper bounds per pair and into the A* heuristic of exact queries
+    """
+    def __init__(self, csr: CSRGraph, landmarks: np.ndarray, forward: np.ndarray,
+                 backward: Optional[np.ndarray] = None, build_time: float = 0.0):
+        self.csr = csr
+        self.landmarks = np.asarray(landmarks, dtype=np.int64)
+        self.forward = forward                                     # forward[i, v] = d(landmark_i, v)
+        self.backward = forward if backward is None else backward  # backward[i, v] = d(v, landmark_i)
+        self.build_time = build_time
+        self._forward_rows: Optional[np.ndarray] = None
+        self._backward_rows: Optional[np.ndarray] = None
+        self._adjacency: Optional[Tuple[list, list, list]] = None
+
+    @property
+    def nbytes(self) -> int:
+        tables = self.forward.nbytes + (self.backward.nbytes if self.backward is not self.forward else 0)
+        return int(tables + self.landmarks.nbytes)
+
+    # BUILDING
+
+    @staticmethod
+    def build(graph: Graph | CSRGraph, landmarks: int = 16, seed: int = 420) -> "LandmarkIndex":
+        """k single-source searches per direction (bitset BFS, or dijkstra when weighted)"""
+        start = time.perf_counter()
+        csr = graph.to_csr() if isinstance(graph, Graph) else graph
+        rng = np.random.default_rng(seed)
+
+        candidates = csr.degree() > 0
+        chosen: List[int] = []
+        forward: List[np.ndarray] = []
+        backward: List[np.ndarray] = []
+        cover = np.full(csr.n, INF)
+
+        while len(chosen) < min(landmarks, int(candidates.sum())):
+            if chosen:
+                # farthest from the current landmarks; unreached nodes (other components) come first
+                score = np.where(candidates, cover, -1.0)
+                nxt = int(np.argmax(score))
+            else:
+                nxt = int(rng.choice(np.flatnonzero(candidates)))
+            chosen.append(nxt)
+            candidates[nxt] = False
+
+            forward.append(shortest_distances(csr, nxt))
+            if csr.directed:
+                backward.append(shortest_distances(csr.reverse(), nxt))
+            cover = np.minimum(cover, forward[-1])
+
+        shape = (0, csr.n)
+        return LandmarkIndex(
+            csr,
+            np.array(chosen, dtype=np.int64),
+            np.vstack(forward) if forward else np.zeros(shape),
+            (np.vstack(backward) if backward else np.zeros(shape)) if csr.directed else None,
+            build_time=time.perf_counter() - start,
+        )
+
+    # QUERIES
+
+    def rows(self, pairs: Iterable[Tuple[Any, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """node label pairs -> (source rows, target rows)"""
+        index = self.csr.index
+        rows = np.array([(index[u], index[v]) for u, v in pairs], dtype=np.int64).reshape(-1, 2)
+        return rows[:, 0], rows[:, 1]
+
+    def bounds(self, src: np.ndarray, dst: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """vectorized lower/upper bounds of d(src[i], dst[i]), O(k) per pair"""
+        F, B = self.forward, self.backward
+        with np.errstate(invalid="ignore"):
+            # d(s, t) >= d(L, t) - d(L, s) and >= d(s, L) - d(t, L); inf minus a finite value
+            # is a proof of unreachability, terms with an infinite subtrahend say nothing
+            ahead = np.where(np.isfinite(F[:, src]), F[:, dst] - F[:, src], 0.0)
+            behind = np.where(np.isfinite(B[:, dst]), B[:, src] - B[:, dst], 0.0)
+            lower = np.maximum(0.0, np.maximum(ahead, behind).max(axis=0, initial=0.0))
+            upper = (B[:, src] + F[:, dst]).min(axis=0, initial=INF)
+        same = src == dst
+        lower[same] = 0.0
+        upper[same] = 0.0
+        return lower, upper
+
+    def query(self, pairs: Iterable[Tuple[Any, Any]], exact: bool = True) -> OracleAnswer:
+        """batched queries by node label; exact=True also runs A* with the landmark heuristic"""
+        src, dst = self.rows(pairs)
+        lower, upper = self.bounds(src, dst)
+        if not exact:
+            return OracleAnswer(lower, upper)
+
+        results = [self.astar(s, t) for s, t in zip(src.tolist(), dst.tolist())]
+        return OracleAnswer(
+            lower, upper,
+            exact=np.array([d for d, _ in results], dtype=np.float64),
+            settled=np.array([k for _, k in results], dtype=np.int64),
+        )
+
+    def astar(self, s: int, t: int) -> Tuple[float, int]:
+        """exact distance between rows s and t and the number of settled nodes"""
+        if s == t:
+            return 0.0, 0
+        indptr, indices, weights = self._lists()
+        if self._forward_rows is None:
+            self._forward_rows = np.ascontiguousarray(self.forward.T)
+            self._backward_rows = np.ascontiguousarray(self.backward.T)
+
+        F, B = self._forward_rows, self._backward_rows
+        to_t, from_t = F[t].tolist(), B[t].tolist()
+
+        def heuristic(v: int) -> float:
+            best = 0.0
+            for lt, lv in zip(to_t, F[v].tolist()):
+                if lv != INF and lt - lv > best:
+                    best = lt - lv
+            for vl, tl in zip(B[v].tolist(), from_t):
+                if tl != INF and vl - tl > best:
+                    best = vl - tl
+            return best
+
+        h = heuristic(s)
+        if h == INF:
+            return INF, 0
+        dist = {s: 0.0}
+        closed = set()
+        heap = [(h, s)]
+        while heap:
+            _, u = heapq.heappop(heap)
+            if u in closed:
+                continue
+            if u == t:
+                return dist[u], len(closed)
+            closed.add(u)
+            du = dist[u]
+            for i in range(indptr[u], indptr[u + 1]):
+                v, nd = indices[i], du + weights[i]
+                if nd < dist.get(v, INF):
+                    h = heuristic(v)
+                    if h == INF:
+                        continue  # the tables prove t is unreachable from v
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd + h, v))
+        return INF, len(closed)
+
+    def _lists(self) -> Tuple[list, list, list]:
+        if self._adjacency is None:
+            csr = self.csr
+            self._adjacency = (csr.indptr.tolist(), csr.indices.tolist(), csr.adjacency_weights().tolist())
+        return self._adjacency
+
+    # PERSISTENCE
+
+    def save(self, path: str | os.PathLike) -> str:
+        """npz with the landmark rows, the tables and the (n, m, directed) of the indexed graph"""
+        path = os.fspath(path)
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        arrays = {"landmarks": self.landmarks, "forward": self.forward,
+                  "shape": np.array([self.csr.n, self.csr.m, int(self.csr.directed)]),
+                  "build_time": np.array(self.build_time)}
+        if self.backward is not self.forward:
+            arrays["backward"] = self.backward
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+        return path
+
+    @staticmethod
+    def load(path: str | os.PathLike, graph: Graph | CSRGraph) -> "LandmarkIndex":
+        csr = graph.to_csr() if isinstance(graph, Graph) else graph
+        with np.load(os.fspath(path)) as data:
+            n, m, directed = data["shape"].tolist()
+            if (n, m, bool(directed)) != (csr.n, csr.m, csr.directed):
+                raise ValueError(f"landmark index {path} was built for a different graph")
+            return LandmarkIndex(
+                csr, data["landmarks"], data["forward"],
+                data["backward"] if "backward" in data else None,
+                build_time=float(data["build_time"]),
+            )
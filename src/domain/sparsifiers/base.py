@@ -1,7 +1,9 @@
-from __future__ import annotations
-
 from __future__ import annotations
 from abc import ABC
+from typing import Optional
+
+from src.domain.graph_model import RunParams
+from src.domain.sparsifiers.streaming import EdgeFilter
 from src.domain.transforms.base import GraphTransform
 
 
@@ -10,4 +12,10 @@ class Sparsifier(GraphTransform, ABC):
     [SEPARATED INTERFACE] marker class (specifically a sparsifier)
     inherits 'execute' from GraphTransform
     """
-    pass
\ No newline at end of file
+    def stream_filter(self, params: RunParams) -> Optional[EdgeFilter]:
+        """
+        out-of-core mode over an edge stream (see ExperimentService.stream_sparsify); None for
+        sparsifiers whose decisions are not edge-local
+        """
+        return None
+
@@ -1,7 +1,10 @@
 from abc import ABC
 
+import numpy as np
+
 from .base import Sparsifier
 from .registry import register_sparsifier
+from ..csr import CSRGraph
 from ..graph_model import Graph, RunParams
 
 
@@ -11,9 +14,10 @@ class IdentitySparsifier(Sparsifier, ABC):
     placeholder to satisfy the domain's sparsifier interface and allow testing
     """
     def run(self, graph: Graph, params: RunParams) -> Graph:
-        return Graph.from_networkx(
-            graph.to_networkx(copy=True),
+        return graph.view(
             name=f"{graph.name}_identity",
             metadata=graph.metadata
         )
 
+    def run_arrays(self, csr: CSRGraph, params: RunParams) -> np.ndarray:
+        return np.ones(csr.m, dtype=bool)
@@ -1,64 +1,42 @@
 from __future__ import annotations
-import networkx as nx
 import numpy as np
-import math
 
 from src.domain.graph_model import Graph, RunParams
 from src.domain.sparsifiers.base import Sparsifier
 from src.domain.sparsifiers.registry import register_sparsifier
+from src.domain.transforms.node_local import LocalAdjacency, rank_in_rows
 
 
 @register_sparsifier("k_neighbor")
 class KNeighborSparsifier(Sparsifier):
+    node_local = True
+
     def run(self, graph: Graph, params: RunParams) -> Graph:
         rho = params.get("rho", 0.5) # TODO: outsource pruning parameter
-        seed = params.get("seed", 420)
-        rng = np.random.default_rng(seed)
-
-        G = graph.to_networkx(copy=False)
-        H = nx.DiGraph() if G.is_directed() else nx.Graph()
-        H.add_nodes_from(G.nodes(data=True))
-
-        for v in G.nodes():
-            neighbors = list(G.neighbors(v))
-            d_v = len(neighbors)
-
-            # k_v = max(1, floor(d_v ^ rho))
-            k_v = max(1, int(math.floor(d_v ** rho)))
-
-            if d_v <= k_v:
-                for u in neighbors:
-                    data = G.get_edge_data(v, u)
-                    H.add_edge(v, u, **data)
-            else:
-                weights = []
-                for u in neighbors:
-                    w = G.get_edge_data(v, u).get("weight", 1.0)
-                    weights.append(w)
-
-                weights = np.array(weights, dtype=float)
-                total_w = weights.sum()
-
-                if total_w > 0:
-                    probs = weights / total_w
-                else:
-                    probs = None
-
-                # randomly sampling distinct edges
-                selected_indices = rng.choice(
-                    len(neighbors),
-                    size=k_v,
-                    replace=False,
-                    p=probs
-                )
-
-                for idx in selected_indices:
-                    u = neighbors[idx]
-                    data = G.get_edge_data(v, u)
-                    H.add_edge(v, u, **data)
 
-        return Graph.from_networkx(
-            H,
+        return graph.view(
+            self.local_mask(graph, params),
             name=f"{graph.name}_k_neighbor_{rho}",
             metadata={"rho": rho, "algorithm": "k_neighbor"}
-        )
\ No newline at end of file
+        )
+
+    def select_local(self, adjacency: LocalAdjacency, lo: int, hi: int, rng: np.random.Generator,
+                     params: RunParams) -> np.ndarray:
+        """
+        every node v keeps k_v = max(1, floor(d_v ^ rho)) of its edges, drawn without replacement
+        with probability proportional to the weight (efraimidis-spirakis: the k_v largest keys
+        log(r) / w); nodes whose weights sum to 0 draw uniformly
+        """
+        rho = params.get("rho", 0.5)
+        rows, start = adjacency.rows(lo, hi)
+        degree = np.diff(adjacency.indptr[lo:hi + 1])
+        k = np.maximum(1, np.floor(degree ** rho)).astype(np.int64)
+
+        weights = np.ones(len(rows)) if adjacency.weights is None else adjacency.weights[start:start + len(rows)]
+        total = np.bincount(rows - lo, weights=weights, minlength=hi - lo)
+        weights = np.where(total[rows - lo] > 0, weights, 1.0)
+        with np.errstate(divide="ignore"):
+            keys = np.log(rng.random(len(rows))) / weights
+
+        rank = rank_in_rows(rows, np.lexsort((-keys, rows)))
+        return adjacency.edge_ids[start:start + len(rows)][rank < k[rows - lo]]
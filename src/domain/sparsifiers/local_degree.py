@@ -1,46 +1,147 @@
 from __future__ import annotations
-import networkx as nx
-import math
+from typing import Any, Dict, Optional
+
+import numpy as np
 
 from src.domain.graph_model import Graph, RunParams
 from src.domain.sparsifiers.base import Sparsifier
 from src.domain.sparsifiers.registry import register_sparsifier
+from src.domain.sparsifiers.streaming import ChunkSource, EdgeFilter, count_degrees
+from src.domain.transforms.node_local import LocalAdjacency, rank_in_rows
 
 
 @register_sparsifier("local_degree")
 class LocalDegreeSparsifier(Sparsifier):
+    node_local = True
+
     def run(self, graph: Graph, params: RunParams) -> Graph:
         rho = params.get("rho", 0.5)
 
-        G = graph.to_networkx(copy=False)
-        H = nx.DiGraph() if G.is_directed() else nx.Graph()
-        H.add_nodes_from(G.nodes(data=True))
+        return graph.view(
+            self.local_mask(graph, params),
+            name=f"{graph.name}_local_degree_{rho}",
+            metadata={"rho": rho, "algorithm": "local_degree"}
+        )
+
+    def select_local(self, adjacency: LocalAdjacency, lo: int, hi: int, rng: np.random.Generator,
+                     params: RunParams) -> np.ndarray:
+        """
+        every node v keeps its k_v = floor(d_v ^ rho) neighbors of highest degree (out-degree when
+        directed), ties going to the lower node id
+        """
+        rho = params.get("rho", 0.5)
+        rows, start = adjacency.rows(lo, hi)
+        degree = np.diff(adjacency.indptr[lo:hi + 1])
+        k = np.floor(degree ** rho).astype(np.int64)
+
+        neighbors = adjacency.indices[start:start + len(rows)]
+        rank = rank_in_rows(rows, np.lexsort((neighbors, -adjacency.degree[neighbors], rows)))
+        return adjacency.edge_ids[start:start + len(rows)][rank < k[rows - lo]]
 
-        if G.is_directed():
-            D = dict(G.out_degree())
-        else:
-            D = dict(G.degree())
+    def stream_filter(self, params: RunParams) -> EdgeFilter:
+        return LocalDegreeEdgeFilter(params.get("rho", 0.5))
 
-        for v in G.nodes():
-            neighbors = list(G.neighbors(v))
-            d_v = len(neighbors)
-            k_v = int(math.floor(d_v ** rho))
 
-            if k_v > 0: # sorting neighbors by their degree descending
-                neighbors_sorted = sorted(
-                    neighbors,
-                    key=lambda u: D.get(u, 0),
-                    reverse=True
-                )
+class LocalDegreeEdgeFilter(EdgeFilter):
+    """
+    local_degree over an edge stream: every node keeps its floor(d^rho) neighbors of highest
+    degree, ranked by log2 degree bucket so the ranking fits in O(n log(max degree)) state
+    -> pass 1 counts degrees
+    -> pass 2 histograms the neighbor buckets of the nodes that must drop some edges (an int32
+       row of log2(max degree) counters each, dropped afterwards) to find the bucket where their
+       top-k cut falls
+    -> pass 3 keeps the edges above the cut bucket plus the first ones met inside it
+    directed graphs select along out-edges by out-degree, as run() does. an approximation of run():
+    a node keeps as many neighbors of each degree bucket as run() would, but inside its cut bucket
+    it takes the first ones in stream order instead of the highest degree, lower id ones
+    """
+    passes = 3
+    exact = False
 
-                selected = neighbors_sorted[:k_v]
+    def __init__(self, rho: float):
+        self.rho = rho
+        self.directed = False
+        self.bucket = self.cut = np.zeros(0, dtype=np.int8)
+        self.remaining = self.used = np.zeros(0, dtype=np.int32)
+        self.histogram_bytes = 0
 
-                for u in selected:
-                    data = G.get_edge_data(v, u)
-                    H.add_edge(v, u, **data)
+    def _pairs(self, src: np.ndarray, dst: np.ndarray):
+        """(selecting node, candidate neighbor) pairs; undirected edges can be picked from both ends"""
+        if self.directed:
+            return src, dst
+        return np.concatenate([src, dst]), np.concatenate([dst, src])
 
-        return Graph.from_networkx(
-            H,
-            name=f"{graph.name}_local_degree_{rho}",
-            metadata={"rho": rho, "algorithm": "local_degree"}
-        )
\ No newline at end of file
+    def _sides(self, src: np.ndarray, dst: np.ndarray):
+        """the pairs of _pairs() without concatenating them"""
+        return [(src, dst)] if self.directed else [(src, dst), (dst, src)]
+
+    def prepare(self, chunks: ChunkSource, n: Optional[int], directed: bool) -> None:
+        self.directed = directed
+        degree, _ = count_degrees(chunks, n, directed)
+        size = len(degree)
+
+        self.bucket = np.zeros(size, dtype=np.int8)
+        positive = degree > 0
+        self.bucket[positive] = np.floor(np.log2(degree[positive])).astype(np.int8) + 1
+        buckets = int(self.bucket.max(initial=0)) + 1
+
+        k = np.floor(degree.astype(np.float64) ** self.rho).astype(np.int64)
+        k[degree == 0] = 0
+        # nodes keeping nothing cut above every bucket, nodes keeping everything below
+        self.cut = np.where(k > 0, -1, buckets).astype(np.int8)
+        self.remaining = np.zeros(size, dtype=np.int32)
+        self.used = np.zeros(size, dtype=np.int32)
+
+        # only nodes dropping part of their edges need a histogram row
+        cutting = np.flatnonzero((k > 0) & (k < degree))
+        row = np.full(size, -1, dtype=np.int32)
+        row[cutting] = np.arange(len(cutting))
+        hist = np.zeros((len(cutting), buckets), dtype=np.int32)
+        self.histogram_bytes = hist.nbytes + row.nbytes
+        flat = hist.reshape(-1)
+        for src, dst, _ in chunks():
+            for v, u in self._sides(src, dst):
+                r = row[v]
+                counted = r >= 0
+                # per-chunk sort instead of a size x buckets bincount: temporaries stay O(chunk)
+                keys, counts = np.unique(r[counted].astype(np.int64) * buckets + self.bucket[u[counted]],
+                                         return_counts=True)
+                flat[keys] += counts.astype(np.int32)
+
+        # counts from the highest bucket down, in place; the cut is the first bucket reaching k
+        cum = hist[:, ::-1]
+        for j in range(1, buckets):
+            cum[:, j] += cum[:, j - 1]
+        k = k[cutting]
+        first = (cum < k[:, None]).sum(axis=1)
+        above = np.where(first > 0, cum[np.arange(len(cutting)), np.maximum(first - 1, 0)], 0)
+        self.cut[cutting] = buckets - 1 - first
+        self.remaining[cutting] = k - above
+
+    def keep(self, src: np.ndarray, dst: np.ndarray, weights: Optional[np.ndarray]) -> np.ndarray:
+        v, u = self._pairs(src, dst)
+        b, cut = self.bucket[u], self.cut[v]
+        take = b > cut
+
+        inside = np.flatnonzero(b == cut)
+        if len(inside):
+            # rank of each pair among its node's cut-bucket pairs of this chunk, in stream order
+            order = inside[np.argsort(v[inside], kind="stable")]
+            groups = v[order]
+            starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+            sizes = np.diff(np.r_[starts, len(order)])
+            rank = np.arange(len(order)) - np.repeat(starts, sizes)
+            take[order] = self.used[groups] + rank < self.remaining[groups]
+            self.used[groups[starts]] += sizes
+
+        if self.directed:
+            return take
+        return take[:len(src)] | take[len(src):]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"ranking": "log2_degree_bucket"}
+
+    def state_bytes(self) -> int:
+        """per-node arrays plus the bucket histogram of pass 2 (the peak)"""
+        return int(self.bucket.nbytes + self.cut.nbytes + self.remaining.nbytes + self.used.nbytes
+                   + self.histogram_bytes)
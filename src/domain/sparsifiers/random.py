@@ -1,35 +1,54 @@
 from __future__ import annotations
 
 import random
-import networkx as nx
+from typing import Optional
 
+import numpy as np
+
+from src.domain.csr import CSRGraph
 from src.domain.graph_model import Graph, RunParams
 from src.domain.sparsifiers.base import Sparsifier
 from src.domain.sparsifiers.registry import register_sparsifier
+from src.domain.sparsifiers.streaming import ChunkSource, EdgeFilter
 
 
 @register_sparsifier("random")
 class RandomSparsifier(Sparsifier):
     def run(self, graph: Graph, params: RunParams) -> Graph:
         p = params.get("p", 0.5)
-        seed = params.get("seed", 420)
 
-        rng = random.Random(seed)
-        G = graph.to_networkx()
+        # one draw per edge in edges() order, so the mask is the kept-edge bitmask of the view
+        kept = self._draws(graph.edge_count, params)
 
-        H = nx.DiGraph() if graph.is_directed() else nx.Graph()
-        H.add_nodes_from(G.nodes())
+        return graph.view(
+            kept,
+            name=f"{graph.name}_random_{p}",
+            metadata={"p": p}
+        )
 
-        kept_edges = [
-            (u, v, d)
-            for u, v, d in G.edges(data=True)
-            if rng.random() <= p
-        ]
+    def run_arrays(self, csr: CSRGraph, params: RunParams) -> np.ndarray:
+        return self._draws(csr.m, params)
 
-        H.add_edges_from(kept_edges)
+    @staticmethod
+    def _draws(m: int, params: RunParams) -> np.ndarray:
+        rng = random.Random(params.get("seed", 420))
+        p = params.get("p", 0.5)
+        return np.fromiter((rng.random() <= p for _ in range(m)), dtype=bool, count=m)
 
-        return Graph.from_networkx(
-            H,
-            name=f"{graph.name}_random_{p}",
-            metadata={"p": p}
-        )
\ No newline at end of file
+    def stream_filter(self, params: RunParams) -> EdgeFilter:
+        return RandomEdgeFilter(params.get("p", 0.5), params.get("seed", 420))
+
+
+class RandomEdgeFilter(EdgeFilter):
+    """one pass, no state: every edge is kept with probability p (numpy draws, so the kept set
+    differs from run() for the same seed)"""
+    def __init__(self, p: float, seed: int):
+        self.p = p
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+
+    def prepare(self, chunks: ChunkSource, n: Optional[int], directed: bool) -> None:
+        self._rng = np.random.default_rng(self.seed)
+
+    def keep(self, src: np.ndarray, dst: np.ndarray, weights: Optional[np.ndarray]) -> np.ndarray:
+        return self._rng.random(len(src)) <= self.p
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from typing import Dict, Type, Callable, Iterable
+from typing import TYPE_CHECKING, Optional, Dict, Type, Callable, Iterable
 
-from .base import Sparsifier
-from src.domain.common.plugin_discovery import discover_modules
+from src.domain.common.plugin_discovery import PluginEntry, PluginManifest, discover_modules
+
+if TYPE_CHECKING:  # plugin base classes pull in networkx, listing plugins should not
+    from .base import Sparsifier
 
 _SPARSIFIERS: Dict[str, Type[Sparsifier]] = {}
 _DISCOVERED = False
+_MANIFEST = PluginManifest("src.domain.sparsifiers", decorators=("register_sparsifier", "register"))
 
 
 class SparsifierRegistry:
@@ -44,19 +47,26 @@ class SparsifierRegistry:
 
     @staticmethod
     def get(name: str) -> Sparsifier:
-        SparsifierRegistry.ensure_discovered()
+        """imports only the module that registers `name` (looked up in the plugin manifest)"""
         key = name.strip()
+        if key not in _SPARSIFIERS and not _MANIFEST.import_plugin(key):
+            SparsifierRegistry.ensure_discovered()  # plugins the manifest cannot see statically
         try:
             cls = _SPARSIFIERS[key]
         except KeyError as e:
-            available = ", ".join(sorted(_SPARSIFIERS.keys()))
+            available = ", ".join(SparsifierRegistry.list())
             raise KeyError(f"unknown sparsifier '{key}'. available: [{available}]") from e
         return cls()
 
     @staticmethod
     def list() -> list[str]:
-        SparsifierRegistry.ensure_discovered()
-        return sorted(_SPARSIFIERS.keys())
+        """registered names, read from the manifest without importing any plugin"""
+        return sorted(set(_MANIFEST.entries) | set(_SPARSIFIERS))
+
+    @staticmethod
+    def info(name: str) -> Optional[PluginEntry]:
+        """manifest entry (module, version, declared capabilities) of a plugin"""
+        return _MANIFEST.get(name.strip())
 
     @staticmethod
     def items() -> Iterable[tuple[str, Type[Sparsifier]]]:
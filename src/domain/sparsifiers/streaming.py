@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+EdgeChunk = Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]
+ChunkSource = Callable[[], Iterator[EdgeChunk]]  # every call starts a new pass over the edges
+
+
+class EdgeFilter(ABC):
+    """
+    [STRATEGY] out-of-core mode of an edge-local sparsifier: keep() decides chunk by chunk,
+    in stream order, which edges survive. prepare() may first take extra passes over the
+    stream (e.g. degree counting); state kept between chunks must stay o(m)
+    """
+    passes: int = 1  # reads of the stream, the filtering pass included
+    exact: bool = True  # False when the streamed selection only approximates the sparsifier's run()
+
+    def prepare(self, chunks: ChunkSource, n: Optional[int], directed: bool) -> None:
+        """n is None when the source does not know it upfront (text edgelists)"""
+        pass
+
+    @abstractmethod
+    def keep(self, src: np.ndarray, dst: np.ndarray, weights: Optional[np.ndarray]) -> np.ndarray:
+        """kept-edge bitmask of one chunk"""
+        pass
+
+    def state_bytes(self) -> int:
+        """memory held between chunks"""
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """filter specific counters reported next to the output (graph metadata, spans)"""
+        return {}
+
+
+def grow(counts: np.ndarray, size: int) -> np.ndarray:
+    """zero-pads a per-node array to at least `size` entries (node ids seen so far + 1)"""
+    if len(counts) >= size:
+        return counts
+    return np.concatenate([counts, np.zeros(size - len(counts), dtype=counts.dtype)])
+
+
+def count_degrees(chunks: ChunkSource, n: Optional[int], directed: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """(out_degree, in_degree) in one pass, the same array twice when undirected"""
+    out_deg = np.zeros(n or 0, dtype=np.int64)
+    in_deg = np.zeros(n or 0, dtype=np.int64) if directed else out_deg
+    for src, dst, _ in chunks():
+        if not len(src):
+            continue
+        size = int(max(src.max(), dst.max())) + 1
+        out_deg = grow(out_deg, size)
+        out_deg[:size] += np.bincount(src, minlength=size)
+        if directed:
+            in_deg = grow(in_deg, size)
+            in_deg[:size] += np.bincount(dst, minlength=size)
+        else:
+            out_deg[:size] += np.bincount(dst, minlength=size)
+            in_deg = out_deg
+    size = max(len(out_deg), len(in_deg))
+    out_deg = grow(out_deg, size)
+    return out_deg, (grow(in_deg, size) if directed else out_deg)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Tuple
+
+import numpy as np
+
+from src.domain.csr import CSRGraph
+from src.domain.traversal import connected_components
+
+ZERO = 1e-8  # eigenvalues below this count as zero (one per connected component)
+
+
+def _sparse() -> Tuple[Any, Any]:
+    """scipy.sparse and scipy.sparse.linalg, imported on first use (optional dependency)"""
+    try:
+        import scipy.sparse as sp
+        import scipy.sparse.linalg as spla
+    except ImportError as e:
+        raise ImportError("laplacian spectra need scipy: pip install scipy") from e
+    return sp, spla
+
+
+@dataclass(frozen=True)
+class Spectrum:
+    """k smallest and k largest laplacian eigenvalues, both ascending"""
+    smallest: np.ndarray
+    largest: np.ndarray
+    normalized: bool
+    n: int
+
+    @property
+    def algebraic_connectivity(self) -> float:
+        """second smallest eigenvalue (fiedler value); 0 when disconnected"""
+        return float(self.smallest[1]) if len(self.smallest) > 1 else 0.0
+
+    @property
+    def spectral_gap(self) -> float:
+        """
+        normalized: random-walk gap min(lambda_2, 2 - lambda_max);
+        combinatorial: lambda_2 / lambda_max (condition-free ratio)
+        """
+        top = float(self.largest[-1]) if len(self.largest) else 0.0
+        if self.normalized:
+            return min(self.algebraic_connectivity, 2.0 - top)
+        return self.algebraic_connectivity / top if top > 0 else 0.0
+
+    @property
+    def zero_eigenvalues(self) -> int:
+        """connected components, as far as the k smallest eigenvalues can tell"""
+        return int((np.abs(self.smallest) < ZERO).sum())
+
+
+def adjacency_matrix(csr: CSRGraph):
+    """symmetric sparse adjacency of the undirected projection, self-loops dropped, parallel edges summed"""
+    sp, _ = _sparse()
+    keep = csr.src != csr.dst
+    src, dst = csr.src[keep], csr.dst[keep]
+    weights = np.ones(len(src)) if csr.weights is None else csr.weights[keep]
+    rows, cols = np.concatenate([src, dst]), np.concatenate([dst, src])
+    return sp.csr_matrix((np.concatenate([weights, weights]), (rows, cols)), shape=(csr.n, csr.n))
+
+
+def normalized_adjacency(csr: CSRGraph):
+    """(D^-1/2 A D^-1/2, mask of non-isolated rows)"""
+    sp, _ = _sparse()
+    A = adjacency_matrix(csr)
+    degree = np.asarray(A.sum(axis=1)).ravel()
+    inv_sqrt = np.zeros_like(degree)
+    np.divide(1.0, np.sqrt(degree), out=inv_sqrt, where=degree > 0)
+    scale = sp.diags(inv_sqrt)
+    return (scale @ A @ scale).tocsr(), degree > 0
+
+
+def laplacian(csr: CSRGraph, normalized: bool = True):
+    """
+    sparse L = D - A, or I - D^-1/2 A D^-1/2 when normalized (zero rows for isolated nodes, as in
+    networkx); built straight from the edge arrays, never densified
+    """
+    sp, _ = _sparse()
+    if not normalized:
+        A = adjacency_matrix(csr)
+        return (sp.diags(np.asarray(A.sum(axis=1)).ravel()) - A).tocsr()
+    M, connected = normalized_adjacency(csr)
+    return (sp.diags(connected.astype(np.float64)) - M).tocsr()
+
+
+def _null_space(csr: CSRGraph, labels: np.ndarray, normalized: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    orthonormal kernel basis of the laplacian, one column per connected component, stored as
+    (labels, values): column c is `values` on the rows labelled c (indicators, scaled by
+    sqrt(degree) when normalized) and zero elsewhere
+    """
+    values = np.ones(csr.n)
+    if normalized:
+        degree = np.asarray(adjacency_matrix(csr).sum(axis=1)).ravel()
+        values = np.sqrt(degree)
+        values[degree == 0] = 1.0  # isolated rows are a component of their own
+    norms = np.sqrt(np.bincount(labels, weights=values ** 2))
+    return labels, values / norms[labels]
+
+
+def spectrum(csr: CSRGraph, k: int = 6, normalized: bool = True, method: str = "lanczos",
+             tol: float = 1e-8, seed: int = 420, max_iter: int = 500) -> Spectrum:
+    """
+    k smallest and largest eigenvalues, matrix-free or with sparse factorizations only.
+    largest: block LOBPCG. smallest: ARPACK (implicitly restarted lanczos, eigsh); the kernel is
+    known (one eigenvalue 0 per connected component, with explicit eigenvectors), so it is
+    deflated and only the nonzero part of the spectrum is iterated on:
+    -> method="lanczos": matrix-vector products only. for the normalized laplacian the smallest
+       eigenvalues are 1 - the largest of D^-1/2 A D^-1/2, which converge much faster than
+       which="SA" on L
+    -> method="shift_invert": eigsh around sigma slightly below 0 with one sparse LU factorization
+       of L - sigma I, its inverse projected onto the complement of the kernel; fastest when the
+       fill-in stays small (meshes, road networks)
+    with the kernel out of the way both find the repeated small eigenvalues of lattices, but a
+    multiplicity beyond what the krylov space resolves may still be reported short
+    """
+    sp, spla = _sparse()
+    n = csr.n
+    k = min(k, n - 1)
+    if k < 1:
+        return Spectrum(np.zeros(n), np.zeros(n), normalized, n)
+
+    _, compact = np.unique(connected_components(csr), return_inverse=True)  # labels 0..C-1
+    labels, basis = _null_space(csr, compact, normalized)
+    components = int(labels.max()) + 1
+
+    def project(x):
+        """x with its kernel component removed, (I - Z Z^T) x"""
+        return x - basis * np.bincount(labels, weights=basis * x, minlength=components)[labels]
+
+    def deflated(matrix, shift: float):
+        """matrix + shift * Z Z^T, moving the kernel eigenvalues from 0 to `shift`"""
+        def matvec(x):
+            x = np.asarray(x).ravel()
+            return matrix @ x + shift * basis * np.bincount(labels, weights=basis * x, minlength=components)[labels]
+        return spla.LinearOperator((n, n), matvec=matvec, dtype=np.float64)
+
+    L = laplacian(csr, normalized)
+    v0 = np.random.default_rng(seed).uniform(-1.0, 1.0, n)  # fixed start vector: reproducible runs
+    ncv = min(n, max(4 * k, 20))
+    # top end by block LOBPCG: repeated top eigenvalues are common after sparsification (every
+    # bipartite component adds a 2 to the normalized spectrum), single-vector lanczos finds them once
+    block = np.random.default_rng(seed).uniform(-1.0, 1.0, (n, k))
+    if n < 5 * k:
+        # lobpcg itself switches to a dense eigensolver (with a warning) when n < 5 * block size;
+        # such a matrix has at most a few dozen rows, so solve it densely here
+        largest = np.linalg.eigvalsh(L.toarray())[-k:]
+    else:
+        # eigenvalue errors are quadratic in the residual, which is what lobpcg's tol bounds
+        largest, _ = spla.lobpcg(L, block, largest=True, tol=np.sqrt(tol), maxiter=max_iter)
+        largest = np.sort(largest)
+
+    rest = min(k, n - components)  # nonzero eigenvalues still needed
+    if rest <= 0:
+        smallest = np.zeros(k)
+    elif method == "shift_invert":
+        sigma = -1e-3
+        lu = spla.splu((L - sigma * sp.identity(n, format="csr")).tocsc())
+        # (L - sigma I)^-1 restricted to the complement of the kernel: the kernel maps to 0 instead
+        # of the dominant 1 / -sigma, so the iteration spends nothing on the known zeros
+        OPinv = spla.LinearOperator((n, n), matvec=lambda x: project(lu.solve(project(np.asarray(x).ravel()))),
+                                    dtype=np.float64)
+        nonzero = spla.eigsh(L, k=min(rest, n - 1), sigma=sigma, which="LM", OPinv=OPinv, tol=tol,
+                             v0=project(v0), ncv=ncv, return_eigenvectors=False)
+        smallest = np.sort(np.concatenate([np.zeros(components), nonzero]))[:k]
+    elif method == "lanczos":
+        if normalized:
+            M, _ = normalized_adjacency(csr)
+            # kernel of L = eigenvalue 1 of M: pushed down to -1, below the rest of M's spectrum
+            mu = spla.eigsh(deflated(M, -2.0), k=min(rest, n - 1), which="LA", tol=tol, v0=v0,
+                            ncv=ncv, return_eigenvectors=False)
+            nonzero = 1.0 - mu
+        else:
+            top = float(largest[-1]) + 1.0
+            nonzero = spla.eigsh(deflated(L, top), k=min(rest, n - 1), which="SA", tol=tol, v0=v0,
+                                 ncv=ncv, return_eigenvectors=False)
+        smallest = np.sort(np.concatenate([np.zeros(components), nonzero]))[:k]
+    else:
+        raise ValueError(f"unknown eigensolver method '{method}', expected 'lanczos' or 'shift_invert'")
+
+    return Spectrum(np.clip(smallest, 0.0, None), largest, normalized, n)
+
+
+def relative_error(values: np.ndarray, reference: np.ndarray) -> float:
+    """mean |x - x_ref| / |x_ref| over aligned eigenvalues, skipping (near) zero references"""
+    m = min(len(values), len(reference))
+    x, ref = values[:m], reference[:m]
+    nonzero = np.abs(ref) > ZERO
+    if not nonzero.any():
+        return float(np.abs(x - ref).mean()) if m else 0.0
+    return float(np.mean(np.abs(x[nonzero] - ref[nonzero]) / np.abs(ref[nonzero])))
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-import time
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+import numpy as np
+
+from src.domain.csr import CSRGraph
 from src.domain.graph_model import Graph, RunParams, OperationDescriptor
+from src.domain.common.tracing import span
+from src.domain.transforms.node_local import LocalAdjacency, local_adjacency, run_node_local
 
 
 class TransformInfo:
@@ -36,11 +40,14 @@ class GraphTransform(ABC):
             logging.warning(f"[{self.__class__.__name__}] no nodes found")
 
         print(f"\n[{self.__class__.__name__}] starting transformation on '{graph.name}'")
-        start_time = time.time()
 
-        result_graph = self.run(graph, params)
-        duration = time.time() - start_time
+        with span("transform", algorithm=self.__class__.__name__, graph=graph.name) as s:
+            s.set_graph_size(graph, prefix="input_")
+            result_graph = self.run(graph, params)
+            s.set_graph_size(result_graph)
+        duration = s.wall_time
 
+        result_graph.share_node_table(graph)
         result_graph.metadata['algorithm'] = self.__class__.__name__
         result_graph.metadata['execution_time'] = duration
         result_graph.metadata['parent_graph'] = graph.name
@@ -53,4 +60,37 @@ class GraphTransform(ABC):
         """
         [UNIFIED COMMAND INTERFACE] the specific logic that subclasses should implement
         """
-        pass
\ No newline at end of file
+        pass
+
+    # NODE-LOCAL EXECUTION
+
+    # true for transforms deciding every node independently from its own adjacency (plus per-node
+    # arrays of the whole graph): they implement select_local() and get local_mask() for free
+    node_local: bool = False
+
+    def select_local(self, adjacency: LocalAdjacency, lo: int, hi: int, rng: np.random.Generator,
+                     params: RunParams) -> np.ndarray:
+        """ids of the edges nodes [lo, hi) keep; all randomness must come from `rng`"""
+        raise NotImplementedError(f"{self.__class__.__name__} is not node-local")
+
+    def local_mask(self, graph: Graph, params: RunParams) -> np.ndarray:
+        """
+        kept-edge mask over graph.edges(), node range partitioned over params["workers"] processes
+        with reproducible per-partition RNG streams (see node_local.run_node_local)
+        """
+        if not self.node_local:
+            raise NotImplementedError(f"{self.__class__.__name__} is not node-local")
+        adjacency = graph.derived("local_adjacency", lambda: local_adjacency(graph.to_csr()))
+        return run_node_local(self, adjacency, params)
+
+    # FUSED EXECUTION
+
+    def run_arrays(self, csr: CSRGraph, params: RunParams) -> Optional[np.ndarray | CSRGraph]:
+        """
+        [PIPELINE STAGE] the transform on the array form of a graph, as a pipeline stage: a
+        kept-edge mask over csr.src/dst when it only drops edges, a new CSRGraph when it changes
+        the nodes, None when it only runs on Graph objects (the pipeline then builds one)
+        """
+        if self.node_local:
+            return run_node_local(self, local_adjacency(csr), params)
+        return None
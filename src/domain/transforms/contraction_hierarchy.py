@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from src.domain.contraction import ContractionHierarchy
+from src.domain.transforms.base import GraphTransform
+from src.domain.transforms.registry import register_transform
+from src.domain.graph_model import Graph, RunParams
+
+
+@register_transform("contraction_hierarchy")
+class ContractionHierarchyTransform(GraphTransform):
+    """
+    preprocesses the graph into a contraction hierarchy; the output is the overlay graph
+    (original edges + shortcuts with a 'via' attribute, node attribute 'rank') from which
+    ch_query rebuilds the hierarchy without contracting again
+    """
+    def run(self, graph: Graph, params: RunParams) -> Graph:
+        ch = ContractionHierarchy.build(graph, witness_settle_limit=params.get("witness_settle_limit", 64))
+
+        return Graph.from_networkx(
+            ch.to_networkx(),
+            name=f"{graph.name}_ch",
+            metadata={
+                "operation": "contraction_hierarchy",
+                "shortcuts": ch.shortcuts,
+                "preprocess_time": ch.preprocess_time,
+            }
+        )
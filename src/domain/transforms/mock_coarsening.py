@@ -1,56 +1,59 @@
 from __future__ import annotations
-import networkx as nx
-import random
+import numpy as np
 
+from src.domain.csr import CSRGraph
 from src.domain.transforms.base import GraphTransform
 from src.domain.transforms.registry import register_transform
 from src.domain.graph_model import Graph, RunParams
+from src.domain.traversal import connected_components
 
 
 @register_transform("mock_coarsening")
 class MockCoarsening(GraphTransform):
     def run(self, graph: Graph, params: RunParams) -> Graph:
-        G = graph.to_networkx(copy=True)
+        csr = graph.to_csr()
+        coarse = self.run_arrays(csr, params)
 
-        reduction_ratio = params.get("reduction_ratio", 0.5)
-        seed = params.get("seed", 420)
-        rng = random.Random(seed)
-
-        initial_nodes = G.number_of_nodes()
-        target_nodes = int(initial_nodes * (1 - reduction_ratio))
-        target_nodes = max(1, target_nodes)
-        max_retries = initial_nodes * 2  # safety brake
-        retries = 0
-
-        while G.number_of_nodes() > target_nodes and retries < max_retries:
-            if G.number_of_edges() == 0:
-                print("[MockCoarsening] no edges left to contract, stopping early")
-                break
-
-            edges = list(G.edges())
-            if not edges:
-                break
-
-            u, v = rng.choice(edges)
-
-            if u == v:
-                retries += 1
-                continue
-
-            nx.contracted_nodes(G, u, v, self_loops=False, copy=False)
-
-            retries = 0
-
-        final_nodes = G.number_of_nodes()
-        # print(f"[MockCoarsening] finished with {final_nodes} nodes")
-
-        return Graph.from_networkx(
-            G,
+        return Graph.from_csr(
+            coarse,
             name=f"{graph.name}_coarsened",
             metadata={
                 "operation": "mock_coarsening",
-                "target_reduction": reduction_ratio,
-                "initial_nodes": initial_nodes,
-                "final_nodes": final_nodes
+                "target_reduction": params.get("reduction_ratio", 0.5),
+                "initial_nodes": csr.n,
+                "final_nodes": coarse.n
             }
-        )
\ No newline at end of file
+        )
+
+    def run_arrays(self, csr: CSRGraph, params: RunParams) -> CSRGraph:
+        """
+        contracts edges in a random order (karger style) until n * (1 - reduction_ratio) nodes
+        are left or no edge joins two of them. a super-node keeps the label of its smallest row,
+        self-loops are dropped and parallel edges merged into the lightest
+        """
+        reduction_ratio = params.get("reduction_ratio", 0.5)
+        rng = np.random.default_rng(params.get("seed", 420))
+        target_nodes = max(1, int(csr.n * (1 - reduction_ratio)))
+        order = rng.permutation(csr.m)
+        rows = np.arange(csr.n)
+
+        def contract(k: int) -> np.ndarray:
+            """super-node (smallest row) of every row once the first k edges of the order are contracted"""
+            prefix = order[:k]
+            return connected_components(CSRGraph(rows, csr.src[prefix], csr.dst[prefix], directed=False))
+
+        # the node count only falls as the prefix grows: shortest prefix reaching the target
+        lo, hi = 0, csr.m
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if np.count_nonzero(contract(mid) == rows) <= target_nodes:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        representatives, row = np.unique(contract(lo), return_inverse=True)
+        src, dst = row[csr.src], row[csr.dst]
+        kept = src != dst
+        coarse = CSRGraph([csr.nodes[r] for r in representatives], src[kept], dst[kept], csr.directed,
+                          None if csr.weights is None else csr.weights[kept])
+        return coarse.subgraph(coarse.simple_edge_mask())
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+
+from src.domain.common.pools import usable_workers
+from src.domain.common.tracing import span
+from src.domain.csr import CSRGraph
+from src.domain.graph_model import RunParams
+
+if TYPE_CHECKING:
+    from src.domain.transforms.base import GraphTransform
+
+BLOCK = 4096  # nodes per RNG stream; fixed, so the streams (and results) never depend on the worker count
+
+_WORKER: Optional[tuple] = None  # (transform, adjacency, params) of a worker process
+
+
+@dataclass(frozen=True)
+class LocalAdjacency:
+    """
+    what a node-local decision may read: every node's neighbor list (successors when directed;
+    an undirected self-loop once) sorted by neighbor, with the edge id (position in G.edges())
+    and weight of every entry, plus the out-degree of every node
+    """
+    n: int
+    m: int
+    indptr: np.ndarray
+    indices: np.ndarray
+    edge_ids: np.ndarray
+    weights: Optional[np.ndarray]
+    degree: np.ndarray
+
+    def rows(self, lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(owner row of every entry of rows [lo, hi), entry slice start) for vectorized selections"""
+        return np.repeat(np.arange(lo, hi), np.diff(self.indptr[lo:hi + 1])), int(self.indptr[lo])
+
+
+def local_adjacency(csr: CSRGraph) -> LocalAdjacency:
+    m = csr.m
+    if csr.directed:
+        rows, cols, eids = csr.src, csr.dst, np.arange(m, dtype=np.int64)
+    else:
+        loop = csr.src == csr.dst
+        rows = np.concatenate([csr.src, csr.dst[~loop]])
+        cols = np.concatenate([csr.dst, csr.src[~loop]])
+        eids = np.concatenate([np.arange(m, dtype=np.int64), np.flatnonzero(~loop)])
+    order = np.lexsort((cols, rows))  # neighbors sorted: selections do not depend on the edges() order
+    indptr = np.zeros(csr.n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=csr.n), out=indptr[1:])
+    eids = eids[order]
+    return LocalAdjacency(
+        n=csr.n, m=m, indptr=indptr, indices=cols[order], edge_ids=eids,
+        weights=None if csr.weights is None else csr.weights[eids],
+        degree=csr.out_degree(),
+    )
+
+
+def rank_in_rows(rows: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """position of every entry within its row once sorted by `order` (rows[order] non-decreasing)"""
+    rank = np.empty(len(order), dtype=np.int64)
+    if not len(order):
+        return rank
+    grouped = rows[order]
+    starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+    rank[order] = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    return rank
+
+
+def node_blocks(n: int, block: int = BLOCK) -> List[Tuple[int, int]]:
+    return [(lo, min(lo + block, n)) for lo in range(0, n, block)]
+
+
+def _init_worker(transform: "GraphTransform", adjacency: LocalAdjacency, params: RunParams) -> None:
+    global _WORKER
+    _WORKER = (transform, adjacency, params)
+
+
+def _worker_block(lo: int, hi: int, stream: np.random.SeedSequence) -> np.ndarray:
+    transform, adjacency, params = _WORKER
+    return transform.select_local(adjacency, lo, hi, np.random.default_rng(stream), params)
+
+
+def run_node_local(transform: "GraphTransform", adjacency: LocalAdjacency, params: RunParams) -> np.ndarray:
+    """
+    [PARTITIONED] kept-edge mask over the edges of `adjacency` of a node-local transform: the
+    node range is cut into fixed blocks, each with its own SeedSequence(seed).spawn() stream,
+    decided by transform.select_local() in `workers` processes and OR-ed together. the same seed
+    gives the same mask for any worker count
+    """
+    blocks = node_blocks(adjacency.n, BLOCK)
+    streams = np.random.SeedSequence(params.get("seed", 420)).spawn(len(blocks))
+    workers = min(usable_workers(params.get("workers", 1)), len(blocks))
+
+    with span("node_local", algorithm=transform.__class__.__name__, partitions=len(blocks), workers=max(workers, 1)):
+        if workers <= 1:
+            kept = [transform.select_local(adjacency, lo, hi, np.random.default_rng(stream), params)
+                    for (lo, hi), stream in zip(blocks, streams)]
+        else:
+            los, his = zip(*blocks)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(transform, adjacency, params)) as pool:
+                # contiguous runs of blocks per task: each process walks a partition of the node range
+                kept = list(pool.map(_worker_block, los, his, streams, chunksize=-(-len(blocks) // (4 * workers))))
+
+    mask = np.zeros(adjacency.m, dtype=bool)
+    for edge_ids in kept:
+        mask[edge_ids] = True
+    return mask
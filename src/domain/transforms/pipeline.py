@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.domain.common.tracing import span
+from src.domain.csr import CSRGraph
+from src.domain.graph_model import Graph, RunParams
+from src.domain.transforms.base import GraphTransform
+
+SEPARATOR = "|"
+
+
+def is_pipeline(name: str) -> bool:
+    return SEPARATOR in name
+
+
+def stage_names(spec: str) -> List[str]:
+    """"simplify_parallel_edges|mock_coarsening|k_neighbor" -> its stage names"""
+    names = [name.strip() for name in spec.split(SEPARATOR)]
+    if not all(names):
+        raise ValueError(f"empty stage in pipeline '{spec}'")
+    return names
+
+
+class Pipeline(GraphTransform):
+    """
+    [PIPES AND FILTERS] composite transform running its stages back to back on edge arrays: a
+    stage hands the next one a kept-edge mask or a new CSRGraph (see run_arrays), so no
+    intermediate Graph is built or stored. the result is a view of the input while every stage
+    only drops edges, a new (simple) graph when a stage rebuilt it or the input is a multigraph;
+    metadata["stages"] has the time and size of each stage.
+    -> stage params: the shared keys plus "<stage>.<key>" overrides, e.g. {"seed": 1, "k_neighbor.rho": 0.3}
+    -> params["lineage"] also keeps the intermediate graphs in .lineage (views where possible)
+    """
+    def __init__(self, stages: List[Tuple[str, GraphTransform]]):
+        if not stages:
+            raise ValueError("a pipeline needs at least one stage")
+        self.stages = stages
+        self.lineage: List[Graph] = []
+
+    @property
+    def name(self) -> str:
+        return SEPARATOR.join(name for name, _ in self.stages)
+
+    @staticmethod
+    def stage_params(name: str, params: RunParams) -> RunParams:
+        prefix = f"{name}."
+        values = {k: v for k, v in params.values.items() if "." not in k}
+        values.update({k[len(prefix):]: v for k, v in params.values.items() if k.startswith(prefix)})
+        return RunParams(values)
+
+    def run(self, graph: Graph, params: RunParams) -> Graph:
+        csr = graph.to_csr()
+        # positions in graph.edges() of the current edges; None once a stage rebuilt the graph
+        origin: Optional[np.ndarray] = np.arange(csr.m)
+        stages: List[Dict[str, Any]] = []
+        self.lineage = []
+
+        for i, (name, stage) in enumerate(self.stages):
+            stage_params = self.stage_params(name, params)
+            with span(f"stage:{name}", category="transform", graph=graph.name, input_nodes=csr.n, input_edges=csr.m) as s:
+                out = stage.run_arrays(csr, stage_params)
+                if out is None:  # Graph-only stage: the one place an intermediate graph is built
+                    out = stage.run(Graph.from_csr(csr, name=f"{graph.name}_stage_{i}"), stage_params).to_csr()
+                if isinstance(out, CSRGraph):
+                    csr, origin = out, None
+                else:
+                    csr = csr.subgraph(out)
+                    origin = None if origin is None else origin[out]
+                s.set(nodes=csr.n, edges=csr.m)
+
+            stages.append({"stage": name, "time": s.wall_time, "nodes": csr.n, "edges": csr.m})
+            if params.get("lineage", False) and i < len(self.stages) - 1:
+                self.lineage.append(self._graph(graph, csr, origin, name=f"{graph.name}_stage_{i}_{name}",
+                                                metadata={"pipeline": self.name, "stage": name}))
+
+        return self._graph(graph, csr, origin, name=f"{graph.name}_{'_'.join(n for n, _ in self.stages)}",
+                           metadata={"pipeline": self.name, "stages": stages})
+
+    @staticmethod
+    def _graph(graph: Graph, csr: CSRGraph, origin: Optional[np.ndarray], name: str,
+               metadata: Dict[str, Any]) -> Graph:
+        # views of a multigraph would still be multigraphs, also after simplify_parallel_edges
+        if origin is not None and not graph.to_networkx(copy=False).is_multigraph():
+            mask = np.zeros(graph.edge_count, dtype=bool)
+            mask[origin] = True
+            return graph.view(mask, name=name, metadata=metadata)
+        result = Graph.from_csr(csr, name=name, metadata=metadata)
+        result.share_node_table(graph)
+        return result
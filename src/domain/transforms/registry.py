@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from typing import Callable, Dict, Type, Iterable
+from typing import TYPE_CHECKING, Optional, Callable, Dict, Type, Iterable
 
-from .base import GraphTransform
-from src.domain.common.plugin_discovery import discover_modules
+from src.domain.common.plugin_discovery import PluginEntry, PluginManifest, discover_modules
+
+if TYPE_CHECKING:  # plugin base classes pull in networkx, listing plugins should not
+    from .base import GraphTransform
 
 _TRANSFORMS: Dict[str, Type[GraphTransform]] = {}
 _DISCOVERED = False
+_MANIFEST = PluginManifest("src.domain.transforms", decorators=("register_transform", "register"))
 
 
 class TransformRegistry:
@@ -43,19 +46,26 @@ class TransformRegistry:
 
     @staticmethod
     def get(name: str) -> GraphTransform:
-        TransformRegistry.ensure_discovered()
+        """imports only the module that registers `name` (looked up in the plugin manifest)"""
         key = name.strip()
+        if key not in _TRANSFORMS and not _MANIFEST.import_plugin(key):
+            TransformRegistry.ensure_discovered()  # plugins the manifest cannot see statically
         try:
             cls = _TRANSFORMS[key]
         except KeyError as e:
-            available = ", ".join(sorted(_TRANSFORMS.keys()))
+            available = ", ".join(TransformRegistry.list())
             raise KeyError(f"unknown transform '{key}'. available: [{available}]") from e
         return cls()
 
     @staticmethod
     def list() -> list[str]:
-        TransformRegistry.ensure_discovered()
-        return sorted(_TRANSFORMS.keys())
+        """registered names, read from the manifest without importing any plugin"""
+        return sorted(set(_MANIFEST.entries) | set(_TRANSFORMS))
+
+    @staticmethod
+    def info(name: str) -> Optional[PluginEntry]:
+        """manifest entry (module, version, declared capabilities) of a plugin"""
+        return _MANIFEST.get(name.strip())
 
     @staticmethod
     def items() -> Iterable[tuple[str, Type[GraphTransform]]]:
@@ -1,7 +1,7 @@
 from __future__ import annotations
-import networkx as nx
-import random
+import numpy as np
 
+from src.domain.csr import CSRGraph
 from src.domain.transforms.base import GraphTransform
 from src.domain.transforms.registry import register_transform
 from src.domain.graph_model import Graph, RunParams
@@ -9,6 +9,19 @@ from src.domain.graph_model import Graph, RunParams
 
 @register_transform("simplify_parallel_edges")
 class SimplifyParallelEdges(GraphTransform):
+    """
+    one edge per node pair, the lightest, which is the only one a shortest path can use;
+    multigraphs become simple graphs, simple graphs are returned as an (unmasked or masked) view
+    """
     def run(self, graph: Graph, params: RunParams) -> Graph:
-        # TODO
-        raise NotImplementedError("implement simplify_parallel_edges first")
\ No newline at end of file
+        csr = graph.to_csr()
+        mask = self.run_arrays(csr, params)
+        name = f"{graph.name}_simple"
+        metadata = {"operation": "simplify_parallel_edges", "removed_edges": int(csr.m - np.count_nonzero(mask))}
+
+        if not graph.to_networkx(copy=False).is_multigraph():
+            return graph.view(mask, name=name, metadata=metadata)
+        return Graph.from_csr(csr.subgraph(mask), name=name, metadata=metadata)
+
+    def run_arrays(self, csr: CSRGraph, params: RunParams) -> np.ndarray:
+        return csr.simple_edge_mask()
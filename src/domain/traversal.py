@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Iterator, Sequence, Tuple
+
+import numpy as np
+
+from src.domain.csr import CSRGraph
+
+WORD = 64
+PULL_CHUNK = 1 << 22  # adjacency entries gathered at once in pull steps
+
+
+@dataclass(frozen=True)
+class BFSSummary:
+    """per-source aggregates of a batch of unweighted traversals, aligned with `sources`"""
+    sources: np.ndarray
+    eccentricity: np.ndarray  # largest finite distance
+    distance_sum: np.ndarray  # sum of finite distances
+    reached: np.ndarray       # reachable nodes, the source included
+
+
+class MultiSourceBFS:
+    """
+    bit-parallel multi-source BFS (MS-BFS, then et al.) over CSR arrays: every node carries a
+    bitset with one bit per source (`words` x 64 sources per batch), so one sweep over the
+    adjacency advances all traversals of the batch by one level.
+    -> pull steps OR the frontier bitsets of all in-neighbors with np.bitwise_or.reduceat
+    -> push steps scatter only from active nodes, taken while the frontier is small
+    -> once most nodes are reached by every source, pulls skip the saturated ones
+    sources are CSR rows (see CSRGraph.index); directed graphs are traversed along out-edges
+    """
+    def __init__(self, csr: CSRGraph, words: int = 1, push_ratio: float = 0.05):
+        self.csr = csr
+        self.words = max(1, int(words))
+        self.push_ratio = push_ratio
+        self._in = csr.reverse()
+        self._out_degree = csr.out_degree()
+        self._has_in = np.diff(self._in.indptr) > 0
+        self._plan = self._pull_plan()
+
+    @property
+    def batch_size(self) -> int:
+        return self.words * WORD
+
+    # LEVEL SWEEPS
+
+    def _pull_plan(self) -> list:
+        """row chunks of about PULL_CHUNK adjacency entries: (edge range, rows with in-edges, offsets)"""
+        indptr = self._in.indptr
+        n = self.csr.n
+        plan, r0 = [], 0
+        while r0 < n:
+            r1 = int(np.searchsorted(indptr, indptr[r0] + PULL_CHUNK, side="right")) - 1
+            r1 = min(max(r1, r0 + 1), n)
+            lo, hi = int(indptr[r0]), int(indptr[r1])
+            if hi > lo:
+                rows = np.flatnonzero(self._has_in[r0:r1]) + r0
+                if len(rows) == r1 - r0:
+                    rows = slice(r0, r1)  # no isolated rows: plain slice assignment
+                plan.append((lo, hi, rows, indptr[r0:r1][self._has_in[r0:r1]] - lo))
+            r0 = r1
+        return plan
+
+    def _pull(self, frontier: np.ndarray) -> np.ndarray:
+        indices = self._in.indices
+        reached = np.zeros_like(frontier)
+        # single-word batches index 1d arrays, noticeably cheaper than (n, 1) fancy indexing
+        f, r = (frontier[:, 0], reached[:, 0]) if self.words == 1 else (frontier, reached)
+        for lo, hi, rows, offsets in self._plan:
+            r[rows] = np.bitwise_or.reduceat(f[indices[lo:hi]], offsets, axis=0)
+        return reached
+
+    def _pull_rows(self, frontier: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """pull restricted to `rows` (the ones still missing some source)"""
+        indptr, indices = self._in.indptr, self._in.indices
+        rows = rows[self._has_in[rows]]
+        degree = indptr[rows + 1] - indptr[rows]
+        starts = np.cumsum(degree) - degree
+        offsets = np.repeat(indptr[rows] - starts, degree) + np.arange(degree.sum())
+        reached = np.zeros_like(frontier)
+        if len(rows):
+            reached[rows] = np.bitwise_or.reduceat(frontier[indices[offsets]], starts, axis=0)
+        return reached
+
+    def _push(self, frontier: np.ndarray, active: np.ndarray) -> np.ndarray:
+        indptr, indices = self.csr.indptr, self.csr.indices
+        degree = self._out_degree[active]
+        offsets = np.repeat(indptr[active] - np.cumsum(degree) + degree, degree) + np.arange(degree.sum())
+        reached = np.zeros_like(frontier)
+        np.bitwise_or.at(reached, indices[offsets], np.repeat(frontier[active], degree, axis=0))
+        return reached
+
+    def iter_levels(self, sources: Sequence[int]) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+        """
+        runs one batch (at most batch_size sources) and yields (level, rows, packed) for every level;
+        bit j of packed[i] (see unpack_bits) is set when rows[i] is first reached by sources[j]
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        if len(sources) > self.batch_size:
+            raise ValueError(f"batch of {len(sources)} sources exceeds {self.batch_size}")
+        n, b = self.csr.n, len(sources)
+
+        frontier = np.zeros((n, self.words), dtype=np.uint64)
+        j = np.arange(b)
+        one = np.left_shift(np.uint64(1), (j % WORD).astype(np.uint64))
+        np.bitwise_or.at(frontier, (sources, j // WORD), one)
+        seen = frontier.copy()
+        full = np.zeros(self.words, dtype=np.uint64)
+        np.bitwise_or.at(full, j // WORD, one)
+        m = len(self.csr.indices)
+
+        level = 0
+        while True:
+            rows = np.flatnonzero(frontier[:, 0] if self.words == 1 else frontier.any(axis=1))
+            if len(rows) == 0:
+                return
+            yield level, rows, frontier[rows]
+
+            if self._out_degree[rows].sum() < self.push_ratio * m:
+                reached = self._push(frontier, rows)
+            else:
+                # bottom-up: only rows not yet reached by every source need to look at their in-edges
+                missing = np.flatnonzero((seen != full).any(axis=1) if self.words > 1 else seen[:, 0] != full[0])
+                if len(missing) < 0.5 * n:
+                    reached = self._pull_rows(frontier, missing)
+                else:
+                    reached = self._pull(frontier)
+            frontier = reached & ~seen
+            seen |= frontier
+            level += 1
+
+    def _batches(self, sources: Sequence[int]) -> Iterator[np.ndarray]:
+        sources = np.asarray(sources, dtype=np.int64)
+        for i in range(0, len(sources), self.batch_size):
+            yield sources[i:i + self.batch_size]
+
+    # BATCHED API
+
+    def distances_from(self, sources: Sequence[int]) -> np.ndarray:
+        """(len(sources), n) int32 hop distances, -1 where unreachable"""
+        sources = np.asarray(sources, dtype=np.int64)
+        dist = np.full((len(sources), self.csr.n), -1, dtype=np.int32)
+        for start, batch in zip(range(0, len(sources), self.batch_size), self._batches(sources)):
+            block = dist[start:start + len(batch)]
+            for level, rows, packed in self.iter_levels(batch):
+                pos, src = np.nonzero(unpack_bits(packed, len(batch)))
+                block[src, rows[pos]] = level
+        return dist
+
+    def summarize(self, sources: Sequence[int]) -> BFSSummary:
+        """eccentricity, distance sum and reach per source, without keeping any distance rows"""
+        sources = np.asarray(sources, dtype=np.int64)
+        ecc = np.zeros(len(sources), dtype=np.int64)
+        total = np.zeros(len(sources), dtype=np.int64)
+        reached = np.zeros(len(sources), dtype=np.int64)
+        for start, batch in zip(range(0, len(sources), self.batch_size), self._batches(sources)):
+            end = start + len(batch)
+            for level, _, packed in self.iter_levels(batch):
+                counts = bit_counts(packed, len(batch))
+                total[start:end] += level * counts
+                reached[start:end] += counts
+                ecc[start:end][counts > 0] = level
+        return BFSSummary(sources, ecc, total, reached)
+
+
+def unpack_bits(packed: np.ndarray, width: int) -> np.ndarray:
+    """(rows, words) uint64 bitsets -> (rows, width) 0/1 uint8 matrix, bit j of a row in column j"""
+    return np.unpackbits(packed.astype("<u8").view(np.uint8), axis=1, bitorder="little")[:, :width]
+
+
+def bit_counts(packed: np.ndarray, width: int) -> np.ndarray:
+    """
+    number of rows with bit j set, for j < width; the 0/1 bytes are summed eight at a time
+    as uint64 lanes in blocks of 255 rows, so no lane can overflow
+    """
+    bits = np.unpackbits(packed.astype("<u8").view(np.uint8), axis=1, bitorder="little")
+    rows, w = bits.shape
+    blocks = -(-rows // 255)
+    padded = np.zeros((blocks * 255, w), dtype=np.uint8)
+    padded[:rows] = bits
+    lanes = padded.view(np.uint64).reshape(blocks, 255, w // 8).sum(axis=1, dtype=np.uint64)
+    return lanes.view(np.uint8).reshape(blocks, w).sum(axis=0, dtype=np.int64)[:width]
+
+
+def shortest_distances(csr: CSRGraph, source: int) -> np.ndarray:
+    """
+    single-source distances along out-edges, inf where unreachable: hop counts through the
+    bitset BFS for unweighted graphs, binary-heap dijkstra over the CSR arrays otherwise
+    """
+    if csr.weights is None:
+        hops = MultiSourceBFS(csr).distances_from([source])[0]
+        return np.where(hops >= 0, hops, np.inf)
+
+    indptr, indices, weights = csr.indptr.tolist(), csr.indices.tolist(), csr.adjacency_weights().tolist()
+    dist = [float("inf")] * csr.n
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for i in range(indptr[u], indptr[u + 1]):
+            v, nd = indices[i], d + weights[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return np.array(dist)
+
+
+def connected_components(csr: CSRGraph) -> np.ndarray:
+    """
+    weakly connected component label per row (the smallest row of the component), by min-label
+    propagation over the edge list with pointer jumping
+    """
+    labels = np.arange(csr.n, dtype=np.int64)
+    src, dst = csr.src, csr.dst
+    while True:
+        lo = np.minimum(labels[src], labels[dst])
+        new = labels.copy()
+        np.minimum.at(new, labels[src], lo)  # hook roots onto the smaller label
+        np.minimum.at(new, labels[dst], lo)
+        while True:
+            jumped = new[new]
+            if np.array_equal(jumped, new):
+                break
+            new = jumped
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def largest_component(csr: CSRGraph) -> np.ndarray:
+    """rows of the largest weakly connected component"""
+    if csr.n == 0:
+        return np.zeros(0, dtype=np.int64)
+    labels = connected_components(csr)
+    return np.flatnonzero(labels == np.bincount(labels).argmax())
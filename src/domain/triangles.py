@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.domain.common.pools import usable_workers
+from src.domain.csr import CSRGraph
+
+WEDGE_BUDGET = 1 << 22  # forward wedges checked per node range (bounds the temporary arrays)
+DENSE = 0.05  # edge density m / (n(n-1)/2) from which sparse matrix products beat wedge checks
+
+_WORKER_GRAPH: Optional["ForwardGraph"] = None  # oriented graph a worker process counts on
+
+
+@dataclass(frozen=True)
+class ForwardGraph:
+    """
+    simple undirected projection (no self-loops, no parallel edges) with every edge oriented from
+    the lower to the higher (degree, row) rank: (indptr, indices) of the oriented adjacency, rows
+    sorted, so each node only keeps its higher-degree neighbors (at most sqrt(2m) of them)
+    """
+    n: int
+    degree: np.ndarray  # simple undirected degree
+    indptr: np.ndarray
+    indices: np.ndarray
+    keys: np.ndarray  # sorted u * n + v of the oriented edges, for membership tests
+
+    def has_edges(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """vectorized u -> v membership test on the oriented edges"""
+        keys = u * self.n + v
+        pos = np.searchsorted(self.keys, keys)
+        pos[pos == len(self.keys)] = 0
+        return self.keys[pos] == keys if len(self.keys) else np.zeros(len(keys), dtype=bool)
+
+
+@dataclass(frozen=True)
+class Clustering:
+    """triangle counts and clustering coefficients of the undirected projection"""
+    triangles: int
+    wedges: int  # paths of length 2, sum d(d-1)/2
+    transitivity: float
+    average: float
+    local: Optional[np.ndarray]  # per CSR row; None when estimated by sampling
+    samples: int = 0  # 0 = exact
+
+
+def forward_graph(csr: CSRGraph) -> ForwardGraph:
+    n = csr.n
+    src, dst = csr.src, csr.dst
+    keep = src != dst
+    lo, hi = np.minimum(src[keep], dst[keep]), np.maximum(src[keep], dst[keep])
+    pairs = np.unique(lo * n + hi)
+    lo, hi = pairs // n, pairs % n
+    degree = np.bincount(lo, minlength=n) + np.bincount(hi, minlength=n)
+
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), degree))] = np.arange(n)
+    flip = rank[lo] > rank[hi]
+    u, v = np.where(flip, hi, lo), np.where(flip, lo, hi)
+
+    keys = np.sort(u * n + v)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(u, minlength=n), out=indptr[1:])
+    return ForwardGraph(n, degree, indptr, keys % n if n else keys, keys)
+
+
+def node_ranges(fwd: ForwardGraph, budget: int = WEDGE_BUDGET) -> List[Tuple[int, int]]:
+    """consecutive row ranges holding about `budget` forward wedges each"""
+    d = np.diff(fwd.indptr)
+    cum = np.cumsum(d * (d - 1) // 2)
+    ranges, start = [], 0
+    while start < fwd.n:
+        done = cum[start - 1] if start else 0
+        stop = int(np.searchsorted(cum, done + budget, side="right"))
+        stop = min(fwd.n, max(stop, start + 1))
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _count_range(fwd: ForwardGraph, start: int, stop: int) -> np.ndarray:
+    """
+    [FORWARD] per-node triangle counts found in rows [start, stop): every triangle is seen once,
+    from its lowest ranked corner u, as a forward wedge v, w of u closed by the edge v -> w
+    """
+    counts = np.zeros(fwd.n, dtype=np.int64)
+    lo, hi = fwd.indptr[start], fwd.indptr[stop]
+    if hi - lo < 2:
+        return counts
+    rows = np.repeat(np.arange(start, stop), np.diff(fwd.indptr[start:stop + 1]))
+    ends = fwd.indptr[rows + 1]
+    first = np.arange(lo, hi)
+    partners = ends - first - 1  # later entries of the same row
+    total = int(partners.sum())
+    if total == 0:
+        return counts
+    a = np.repeat(first, partners)
+    group_start = np.repeat(np.cumsum(partners) - partners, partners)
+    b = a + 1 + (np.arange(total) - group_start)
+
+    u, v, w = rows[a - lo], fwd.indices[a], fwd.indices[b]
+    # either orientation of the closing edge, the forward lists hold v -> w or w -> v
+    closed = fwd.has_edges(v, w) | fwd.has_edges(w, v)
+    for corner in (u[closed], v[closed], w[closed]):
+        counts += np.bincount(corner, minlength=fwd.n)
+    return counts
+
+
+def _init_worker(fwd: ForwardGraph) -> None:
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = fwd
+
+
+def _worker_range(start: int, stop: int) -> np.ndarray:
+    return _count_range(_WORKER_GRAPH, start, stop)
+
+
+def _matrix_triangles(fwd: ForwardGraph) -> np.ndarray:
+    """per-node counts from sparse products, diag(A^3) / 2 = rowsum((A @ A) * A) / 2"""
+    try:
+        import scipy.sparse as sp
+    except ImportError as e:
+        raise ImportError("matrix triangle counting needs scipy: pip install scipy") from e
+    rows = np.repeat(np.arange(fwd.n), np.diff(fwd.indptr))
+    ones = np.ones(2 * len(rows), dtype=np.int64)
+    A = sp.csr_matrix((ones, (np.concatenate([rows, fwd.indices]), np.concatenate([fwd.indices, rows]))),
+                      shape=(fwd.n, fwd.n))
+    return np.asarray((A @ A).multiply(A).sum(axis=1)).ravel() // 2
+
+
+def _coefficients(degree: np.ndarray, per_node: np.ndarray) -> Clustering:
+    wedges_per_node = degree * (degree - 1) // 2
+    local = np.zeros(len(degree))
+    np.divide(per_node, wedges_per_node, out=local, where=wedges_per_node > 0)
+    wedges = int(wedges_per_node.sum())
+    triangles = int(per_node.sum()) // 3
+    return Clustering(
+        triangles=triangles,
+        wedges=wedges,
+        transitivity=3 * triangles / wedges if wedges else 0.0,
+        average=float(local.mean()) if len(local) else 0.0,
+        local=local,
+    )
+
+
+def count_triangles(csr: CSRGraph, method: str = "auto", workers: int = 1,
+                    fwd: Optional[ForwardGraph] = None) -> Clustering:
+    """
+    exact triangles, transitivity and local clustering (networkx semantics on the undirected
+    projection). method="forward": wedge checks over the degree-ordered oriented CSR, cut into
+    node ranges that run in `workers` processes; "matrix": sparse products (scipy), faster once
+    the graph is dense; "auto" picks by density
+    """
+    fwd = fwd or forward_graph(csr)
+    n, m = fwd.n, len(fwd.indices)
+    if method == "auto":
+        method = "matrix" if n > 1 and m / (n * (n - 1) / 2) >= DENSE else "forward"
+
+    if method == "matrix":
+        per_node = _matrix_triangles(fwd)
+    elif method == "forward":
+        ranges = node_ranges(fwd)
+        workers = usable_workers(workers)
+        if workers <= 1 or len(ranges) == 1:
+            per_node = sum((_count_range(fwd, a, b) for a, b in ranges), np.zeros(n, dtype=np.int64))
+        else:
+            workers = min(workers, len(ranges))
+            starts, stops = zip(*ranges)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(fwd,)) as pool:
+                per_node = sum(pool.map(_worker_range, starts, stops), np.zeros(n, dtype=np.int64))
+    else:
+        raise ValueError(f"unknown triangle counting method '{method}', expected 'forward', 'matrix' or 'auto'")
+    return _coefficients(fwd.degree, per_node)
+
+
+def sample_wedges(csr: CSRGraph, epsilon: float = 0.01, delta: float = 0.1, seed: int = 420,
+                  fwd: Optional[ForwardGraph] = None) -> Clustering:
+    """
+    [SAMPLING] wedge sampling (seshadhri, pinar & kolda): transitivity is the closed fraction of
+    wedges drawn uniformly (center with probability ~ d(d-1)/2, then two distinct neighbors);
+    average clustering draws uniform nodes instead, one wedge each, nodes of degree < 2 counting
+    as open. hoeffding: ln(2 / delta) / (2 eps^2) samples per estimate keep both within eps with
+    probability 1 - delta. no per-node values
+    """
+    fwd = fwd or forward_graph(csr)
+    samples = max(1, math.ceil(math.log(2 / delta) / (2 * epsilon ** 2)))
+    degree = fwd.degree
+    wedges_per_node = degree * (degree - 1) // 2
+    wedges = int(wedges_per_node.sum())
+    if wedges == 0:
+        return Clustering(0, 0, 0.0, 0.0, None, samples)
+
+    # full (both directions) sorted adjacency to draw neighbors from
+    rows = np.repeat(np.arange(fwd.n), np.diff(fwd.indptr))
+    src, dst = np.concatenate([rows, fwd.indices]), np.concatenate([fwd.indices, rows])
+    order = np.lexsort((dst, src))
+    neighbors = dst[order]
+    indptr = np.zeros(fwd.n + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+    rng = np.random.default_rng(seed)
+
+    def closed_fraction(centers: np.ndarray) -> np.ndarray:
+        d = degree[centers]
+        i = (rng.random(len(centers)) * d).astype(np.int64)
+        j = (rng.random(len(centers)) * (d - 1)).astype(np.int64)
+        j += j >= i  # two distinct neighbors
+        v, w = neighbors[indptr[centers] + i], neighbors[indptr[centers] + j]
+        return fwd.has_edges(v, w) | fwd.has_edges(w, v)
+
+    centers = rng.choice(fwd.n, size=samples, p=wedges_per_node / wedges)
+    transitivity = float(closed_fraction(centers).mean())
+
+    nodes = rng.integers(0, fwd.n, size=samples)
+    eligible = nodes[degree[nodes] >= 2]
+    average = float(closed_fraction(eligible).sum()) / samples
+
+    return Clustering(
+        triangles=round(transitivity * wedges / 3),
+        wedges=wedges,
+        transitivity=transitivity,
+        average=average,
+        local=None,
+        samples=samples,
+    )
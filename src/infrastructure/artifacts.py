@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Iterable
+
+from src.domain.common.tracing import Span, to_chrome_trace
+
+
+def write_chrome_trace(spans: Iterable[Span], path: str | os.PathLike) -> str:
+    """
+    writes spans (e.g. ExperimentDTO.spans) as a chrome trace json file;
+    open it in chrome://tracing or https://ui.perfetto.dev
+    """
+    path = os.fspath(path)
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(to_chrome_trace(list(spans)), f)
+
+    print(f"[artifacts] trace saved to {path}")
+    return path
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import struct
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+# binary edge file: a 64-byte little-endian header followed by m fixed-size edge records
+# (u: int64, v: int64[, w: float64]). records are appended while streaming and the
+# header counts are patched on close, so files can be written without knowing m upfront
+# and read back zero-copy with np.memmap
+
+MAGIC = b"GSPBIN01"
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<8sIIQQ")  # magic, flags, reserved, n, m
+
+FLAG_DIRECTED = 1
+FLAG_WEIGHTED = 2
+
+EDGE_DTYPE = np.dtype([("u", "<i8"), ("v", "<i8")])
+WEIGHTED_EDGE_DTYPE = np.dtype([("u", "<i8"), ("v", "<i8"), ("w", "<f8")])
+
+
+@dataclass(frozen=True)
+class BinaryHeader:
+    n: int
+    m: int
+    directed: bool
+    weighted: bool
+
+    @property
+    def dtype(self) -> np.dtype:
+        return WEIGHTED_EDGE_DTYPE if self.weighted else EDGE_DTYPE
+
+    def pack(self) -> bytes:
+        flags = (FLAG_DIRECTED if self.directed else 0) | (FLAG_WEIGHTED if self.weighted else 0)
+        return _HEADER.pack(MAGIC, flags, 0, self.n, self.m).ljust(HEADER_SIZE, b"\0")
+
+
+def read_header(path: str | os.PathLike) -> BinaryHeader:
+    with open(path, "rb") as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(f"not a binary graph file (truncated header): {path}")
+    magic, flags, _, n, m = _HEADER.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError(f"not a binary graph file (bad magic {magic!r}): {path}")
+    return BinaryHeader(n=n, m=m, directed=bool(flags & FLAG_DIRECTED), weighted=bool(flags & FLAG_WEIGHTED))
+
+
+class BinaryGraphWriter:
+    """
+    incremental writer: write() appends edge chunks, close() patches the header.
+    n defaults to max(node id) + 1 over everything written
+    """
+    def __init__(self, path: str | os.PathLike, *, directed: bool = False, weighted: bool = False,
+                 n: Optional[int] = None):
+        self.path = os.fspath(path)
+        self.directed = directed
+        self.weighted = weighted
+        self.n = n
+        self.m = 0
+        self._max_id = -1
+        self._dtype = WEIGHTED_EDGE_DTYPE if weighted else EDGE_DTYPE
+
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._f = open(self.path, "wb")
+        self._f.write(BinaryHeader(0, 0, directed, weighted).pack())
+
+    def write(self, src: np.ndarray, dst: np.ndarray, weights: Optional[np.ndarray] = None) -> None:
+        if len(src) != len(dst):
+            raise ValueError(f"src and dst lengths differ: {len(src)} != {len(dst)}")
+        if self.weighted and weights is None:
+            raise ValueError("weighted binary graph requires weights for every chunk")
+
+        records = np.empty(len(src), dtype=self._dtype)
+        records["u"] = src
+        records["v"] = dst
+        if self.weighted:
+            records["w"] = weights
+
+        if len(records):
+            self._max_id = max(self._max_id, int(records["u"].max()), int(records["v"].max()))
+        self._f.write(records.tobytes())
+        self.m += len(records)
+
+    def close(self) -> BinaryHeader:
+        if self._f.closed:
+            return read_header(self.path)
+        n = self.n if self.n is not None else self._max_id + 1
+        header = BinaryHeader(n=n, m=self.m, directed=self.directed, weighted=self.weighted)
+        self._f.seek(0)
+        self._f.write(header.pack())
+        self._f.close()
+        return header
+
+    def __enter__(self) -> "BinaryGraphWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def write_binary(path: str | os.PathLike, src: np.ndarray, dst: np.ndarray, weights: Optional[np.ndarray] = None,
+                 *, n: Optional[int] = None, directed: bool = False) -> BinaryHeader:
+    with BinaryGraphWriter(path, directed=directed, weighted=weights is not None, n=n) as w:
+        w.write(src, dst, weights)
+    return read_header(path)
+
+
+def open_binary(path: str | os.PathLike) -> Tuple[BinaryHeader, np.ndarray]:
+    """memory-maps the edge records (read-only); columns are record["u"], ["v"], ["w"]"""
+    header = read_header(path)
+    if header.m == 0:
+        return header, np.empty(0, dtype=header.dtype)
+    records = np.memmap(path, dtype=header.dtype, mode="r", offset=HEADER_SIZE, shape=(header.m,))
+    return header, records
+
+
+def iter_binary_chunks(path: str | os.PathLike, chunk_size: int = 1 << 20) \
+        -> Iterator[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]]:
+    """yields (src, dst, weights) arrays of at most chunk_size edges"""
+    header, records = open_binary(path)
+    for start in range(0, header.m, chunk_size):
+        block = np.array(records[start:start + chunk_size])
+        yield block["u"], block["v"], block["w"] if header.weighted else None
+
+
+def load_binary_networkx(path: str | os.PathLike) -> nx.Graph | nx.DiGraph:
+    header = read_header(path)
+    G = nx.DiGraph() if header.directed else nx.Graph()
+    G.add_nodes_from(range(header.n))
+    for src, dst, weights in iter_binary_chunks(path):
+        if weights is None:
+            G.add_edges_from(zip(src.tolist(), dst.tolist()))
+        else:
+            G.add_weighted_edges_from(zip(src.tolist(), dst.tolist(), weights.tolist()))
+    return G
@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+# compressed adjacency file (webgraph style, boldi & vigna) for archiving many variants of a graph:
+# sorted neighbor lists stored as gaps, every gap packed as a LEB128 varint. lists are grouped in
+# blocks of `stride` nodes; a block either stores its lists whole, or (reference compression) as
+# alternating copy/skip run lengths over the same lists of a parent archive plus the residual
+# neighbors the parent lacks, whichever is smaller. an offsets index gives random access per block.
+#
+#   header (128 bytes) | parent path | index int64[blocks + 1, 4] | modes uint8[blocks]
+#   | degree varints | gap varints | run varints | weights float64[m]
+#
+# index rows hold the byte offsets of every block in the three varint streams and its first edge.
+# undirected graphs keep each edge once, in the list of its smaller endpoint
+
+MAGIC = b"GSPCMP01"
+HEADER_SIZE = 128
+_HEADER = struct.Struct("<8sIIQQQQQQQI")  # magic, flags, stride, n, m, blocks, stream lengths x3, parent_m, parent_crc
+
+FLAG_DIRECTED = 1
+FLAG_WEIGHTED = 2
+FLAG_REFERENCE = 4
+
+MODE_GAPS = 0
+MODE_REFERENCE = 1
+
+DEFAULT_STRIDE = 64
+COMPRESSED_SUFFIXES = (".gcz",)
+
+
+# VARINTS
+
+def encode_varints(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """LEB128 bytes of non-negative ints (7 bits per byte, high bit = more follow), and bytes per value"""
+    values = np.asarray(values, dtype=np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 10):
+        lengths += values >= np.uint64(1 << (7 * k))
+    starts = np.cumsum(lengths) - lengths
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    idx = np.arange(len(values))
+    for k in range(int(lengths.max(initial=0))):
+        idx = idx[lengths[idx] > k]
+        low = (values[idx] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (lengths[idx] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[idx] + k] = (low | more).astype(np.uint8)
+    return out, lengths
+
+
+def decode_varints(buf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """values (uint64) of a run of LEB128 varints and the byte position each one starts at"""
+    ends = np.flatnonzero(buf < 0x80)
+    starts = np.empty(len(ends), dtype=np.int64)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+    values = (buf[starts] & 0x7F).astype(np.uint64)
+    idx = np.arange(len(ends))
+    for k in range(1, int(lengths.max(initial=0))):
+        idx = idx[lengths[idx] > k]
+        values[idx] |= (buf[starts[idx] + k] & 0x7F).astype(np.uint64) << np.uint64(7 * k)
+    return values, starts
+
+
+def _zigzag(x: np.ndarray) -> np.ndarray:
+    return ((x << 1) ^ (x >> 63)).astype(np.uint64)
+
+
+def _unzigzag(z: np.ndarray) -> np.ndarray:
+    z = z.astype(np.int64)
+    return (z >> 1) ^ -(z & 1)
+
+
+def _gaps(owner: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    gap code of lists sorted by (owner, target): the first target of a list relative to its owner
+    (zigzagged, it may be smaller), every later one as the distance to the previous one minus 1
+    """
+    first = np.ones(len(owner), dtype=bool)
+    first[1:] = owner[1:] != owner[:-1]
+    gaps = np.empty(len(owner), dtype=np.uint64)
+    gaps[first] = _zigzag(targets[first] - owner[first])
+    rest = ~first
+    gaps[rest] = (targets[rest] - np.roll(targets, 1)[rest] - 1).astype(np.uint64)
+    return gaps
+
+
+def _ungap(owner: np.ndarray, gaps: np.ndarray) -> np.ndarray:
+    """inverse of _gaps: a segmented prefix sum, one segment per list"""
+    if not len(owner):
+        return np.zeros(0, dtype=np.int64)
+    first = np.ones(len(owner), dtype=bool)
+    first[1:] = owner[1:] != owner[:-1]
+    steps = np.where(first, _unzigzag(gaps) + owner, gaps.astype(np.int64) + 1)
+    total = np.cumsum(steps)
+    base = (total - steps)[first]
+    return total - base[np.cumsum(first) - 1]
+
+
+# HEADER
+
+@dataclass(frozen=True)
+class CompressedHeader:
+    n: int
+    m: int
+    directed: bool
+    weighted: bool
+    stride: int
+    blocks: int
+    stream_bytes: Tuple[int, int, int]  # degree, gap and run varints
+    parent: Optional[str] = None  # parent archive, relative to this file's directory
+    parent_m: int = 0
+    parent_crc: int = 0
+
+    def pack(self) -> bytes:
+        flags = (FLAG_DIRECTED if self.directed else 0) | (FLAG_WEIGHTED if self.weighted else 0) \
+            | (FLAG_REFERENCE if self.parent else 0)
+        return _HEADER.pack(MAGIC, flags, self.stride, self.n, self.m, self.blocks, *self.stream_bytes,
+                            self.parent_m, self.parent_crc).ljust(HEADER_SIZE, b"\0")
+
+
+def _pad8(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+def read_compressed_header(path: str | os.PathLike) -> CompressedHeader:
+    with open(path, "rb") as f:
+        raw = f.read(HEADER_SIZE)
+        if len(raw) < HEADER_SIZE:
+            raise ValueError(f"not a compressed graph file (truncated header): {path}")
+        magic, flags, stride, n, m, blocks, deg, gap, run, parent_m, parent_crc = _HEADER.unpack_from(raw)
+        if magic != MAGIC:
+            raise ValueError(f"not a compressed graph file (bad magic {magic!r}): {path}")
+        parent = None
+        if flags & FLAG_REFERENCE:
+            (size,) = struct.unpack("<I", f.read(4))
+            parent = f.read(size).decode("utf-8")
+    return CompressedHeader(n=n, m=m, directed=bool(flags & FLAG_DIRECTED), weighted=bool(flags & FLAG_WEIGHTED),
+                            stride=stride, blocks=blocks, stream_bytes=(deg, gap, run), parent=parent,
+                            parent_m=parent_m, parent_crc=parent_crc)
+
+
+# READING
+
+class CompressedGraph:
+    """
+    [READER] memory-mapped compressed archive. decode_nodes() turns a node range into CSR arrays
+    with a handful of vectorized passes (varints, segmented prefix sums, run masks); reference
+    blocks pull the parent's lists through the parent's own reader
+    """
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+        self.header = h = read_compressed_header(path)
+        raw = np.memmap(self.path, dtype=np.uint8, mode="r")
+
+        pos = HEADER_SIZE + (_pad8(4 + len(h.parent.encode("utf-8"))) if h.parent else 0)
+        self.index = np.frombuffer(raw, dtype=np.int64, count=(h.blocks + 1) * 4, offset=pos).reshape(-1, 4)
+        pos += self.index.nbytes
+        self.modes = raw[pos:pos + h.blocks]
+        pos += _pad8(h.blocks)
+        self._streams = []
+        for size in h.stream_bytes:
+            self._streams.append(raw[pos:pos + size])
+            pos += size
+        pos = _pad8(pos)
+        self.weights = np.frombuffer(raw, dtype="<f8", count=h.m, offset=pos) if h.weighted else None
+        self._parent: Optional[CompressedGraph] = None
+
+    @property
+    def n(self) -> int:
+        return self.header.n
+
+    @property
+    def m(self) -> int:
+        return self.header.m
+
+    @property
+    def nbytes(self) -> int:
+        return os.path.getsize(self.path)
+
+    @property
+    def fingerprint(self) -> int:
+        """checksum of the index, recorded by the archives referencing this one"""
+        return zlib.crc32(self.index.tobytes() + struct.pack("<Q", self.m))
+
+    @property
+    def parent(self) -> Optional["CompressedGraph"]:
+        h = self.header
+        if h.parent is None:
+            return None
+        if self._parent is None:
+            parent = CompressedGraph(os.path.join(os.path.dirname(self.path), h.parent))
+            if parent.m != h.parent_m or parent.fingerprint != h.parent_crc:
+                raise ValueError(f"reference archive {parent.path} does not match the one {self.path} was written against")
+            self._parent = parent
+        return self._parent
+
+    def decode_nodes(self, lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """(indptr, targets, weights) of nodes [lo, hi), targets sorted per node"""
+        stride = self.header.stride
+        b0, b1 = lo // stride, -(-hi // stride) if hi > lo else lo // stride
+        start, stop = b0 * stride, min(b1 * stride, self.n)
+        indptr, targets, weights = self._decode_blocks(b0, b1)
+        a, b = lo - start, hi - start
+        edges = indptr[a:b + 1]
+        return edges - edges[0], targets[edges[0]:edges[-1]], None if weights is None else weights[edges[0]:edges[-1]]
+
+    def stored_neighbors(self, u: int) -> np.ndarray:
+        """
+        random access to the list stored for u, decoding the block holding u only: all successors
+        when directed, but only the neighbors >= u of an undirected archive (each edge is kept once,
+        under its smaller endpoint; the rest of u's adjacency needs a full decode)
+        """
+        _, targets, _ = self.decode_nodes(u, u + 1)
+        return targets
+
+    def _decode_blocks(self, b0: int, b1: int) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        stride, index = self.header.stride, self.index
+        lo, hi = b0 * stride, min(b1 * stride, self.n)
+        degrees, gaps, runs = (s[index[b0, i]:index[b1, i]] for i, s in enumerate(self._streams))
+
+        counts = decode_varints(degrees)[0].astype(np.int64)
+        owner = np.repeat(np.arange(lo, hi), counts)
+        targets = _ungap(owner, decode_varints(gaps)[0])
+
+        modes = self.modes[b0:b1]
+        if (modes == MODE_REFERENCE).any():
+            p_indptr, p_targets, _ = self.parent.decode_nodes(lo, hi)
+            p_owner = np.repeat(np.arange(lo, hi), np.diff(p_indptr))
+            in_ref = modes[(p_owner - lo) // stride] == MODE_REFERENCE
+            p_owner, p_targets = p_owner[in_ref], p_targets[in_ref]
+
+            lengths, positions = decode_varints(runs)
+            lengths = lengths.astype(np.int64)
+            # runs alternate copy / skip, restarting with a copy run in every block
+            block = np.searchsorted(index[b0:b1 + 1, 2] - index[b0, 2], positions, side="right") - 1
+            first_run = np.searchsorted(block, block, side="left")
+            copy = (np.arange(len(lengths)) - first_run) % 2 == 0
+            kept = np.repeat(copy, lengths)
+
+            owner = np.concatenate([owner, p_owner[kept]])
+            targets = np.concatenate([targets, p_targets[kept]])
+            # two sorted runs: a stable (tim)sort of the keys is a linear merge
+            order = np.argsort((owner - lo) * self.n + targets, kind="stable")
+            owner, targets = owner[order], targets[order]
+
+        indptr = np.zeros(hi - lo + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owner - lo, minlength=hi - lo), out=indptr[1:])
+        weights = None
+        if self.weights is not None:
+            weights = np.array(self.weights[index[b0, 3]:index[b1, 3]])
+        return indptr, targets, weights
+
+    def iter_chunks(self, chunk_size: int = 1 << 20) -> Iterator[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]]:
+        """(src, dst, weights) of whole blocks, about chunk_size edges at a time"""
+        stride, edge_offsets = self.header.stride, self.index[:, 3]
+        b0 = 0
+        while b0 < self.header.blocks:
+            b1 = int(np.searchsorted(edge_offsets, edge_offsets[b0] + chunk_size, side="right")) - 1
+            b1 = min(self.header.blocks, max(b1, b0 + 1))
+            indptr, targets, weights = self._decode_blocks(b0, b1)
+            lo = b0 * stride
+            yield np.repeat(np.arange(lo, lo + len(indptr) - 1), np.diff(indptr)), targets, weights
+            b0 = b1
+
+
+def iter_compressed_chunks(path: str | os.PathLike, chunk_size: int = 1 << 20) \
+        -> Iterator[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]]:
+    """yields (src, dst, weights) arrays of about chunk_size edges (whole blocks)"""
+    yield from CompressedGraph(path).iter_chunks(chunk_size)
+
+
+def load_compressed_networkx(path: str | os.PathLike) -> nx.Graph | nx.DiGraph:
+    header = read_compressed_header(path)
+    G = nx.DiGraph() if header.directed else nx.Graph()
+    G.add_nodes_from(range(header.n))
+    for src, dst, weights in iter_compressed_chunks(path):
+        if weights is None:
+            G.add_edges_from(zip(src.tolist(), dst.tolist()))
+        else:
+            G.add_weighted_edges_from(zip(src.tolist(), dst.tolist(), weights.tolist()))
+    return G
+
+
+# WRITING
+
+def _per_block(sizes: np.ndarray, block: np.ndarray, blocks: int) -> np.ndarray:
+    return np.bincount(block, weights=sizes, minlength=blocks).astype(np.int64)
+
+
+def _runs(kept: np.ndarray, block: np.ndarray, blocks: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    copy / skip run lengths of the parent edge mask `kept`, cut at block borders, every block
+    starting with a copy run (possibly empty); returns (lengths, block of every run)
+    """
+    if not len(kept):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    cut = np.ones(len(kept), dtype=bool)
+    cut[1:] = (kept[1:] != kept[:-1]) | (block[1:] != block[:-1])
+    starts = np.flatnonzero(cut)
+    lengths = np.diff(np.append(starts, len(kept)))
+    run_block, run_kept = block[starts], kept[starts]
+    opens_block = np.ones(len(starts), dtype=bool)
+    opens_block[1:] = run_block[1:] != run_block[:-1]
+    pad = np.flatnonzero(opens_block & ~run_kept)  # blocks opening with a skip get an empty copy run
+    return np.insert(lengths, pad, 0), np.insert(run_block, pad, run_block[pad])
+
+
+def write_compressed(path: str | os.PathLike, src: np.ndarray, dst: np.ndarray, weights: Optional[np.ndarray] = None,
+                     *, n: Optional[int] = None, directed: bool = False, reference: Optional[str | os.PathLike] = None,
+                     stride: int = DEFAULT_STRIDE) -> CompressedHeader:
+    """
+    sorts and compresses a whole edge list (duplicates dropped, the first weight kept). with a
+    `reference` archive over the same node ids, every block is stored as runs over the parent's
+    lists plus residual gaps when that is smaller, e.g. for sparsified variants of the parent
+    """
+    path = os.fspath(path)
+    src, dst = np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+    n = int(n if n is not None else max(int(src.max(initial=-1)), int(dst.max(initial=-1))) + 1)
+    if not directed:
+        src, dst = np.minimum(src, dst), np.maximum(src, dst)
+    order = np.lexsort((dst, src))
+    src, dst = src[order], dst[order]
+    unique = np.ones(len(src), dtype=bool)
+    unique[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+    src, dst = src[unique], dst[unique]
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)[order][unique]
+
+    blocks = -(-n // stride)
+    counts = np.bincount(src, minlength=n)
+    node_block = np.arange(n) // stride
+    gaps = _gaps(src, dst)
+
+    # plain blocks: degree and gap of every list
+    count_bytes, gap_bytes = encode_varints(counts)[1], encode_varints(gaps)[1]
+    plain_size = _per_block(count_bytes, node_block, blocks) + _per_block(gap_bytes, src // stride, blocks)
+    modes = np.full(blocks, MODE_GAPS, dtype=np.uint8)
+    parent_name, parent_m, parent_crc = None, 0, 0
+
+    if reference is not None:
+        parent = CompressedGraph(reference)
+        if parent.n != n or parent.header.directed != directed:
+            raise ValueError(f"reference archive {parent.path} has other nodes or directedness than the graph")
+        p_indptr, p_dst, _ = parent.decode_nodes(0, n)
+        p_src = np.repeat(np.arange(n), np.diff(p_indptr))
+
+        # which child edges the parent lists hold, and which parent edges the child keeps
+        keys, p_keys = src * n + dst, p_src * n + p_dst
+        pos = np.minimum(np.searchsorted(p_keys, keys), max(len(p_keys) - 1, 0))
+        found = p_keys[pos] == keys if len(p_keys) else np.zeros(len(keys), dtype=bool)
+        kept = np.zeros(len(p_keys), dtype=bool)
+        kept[pos[found]] = True
+
+        res_src, res_dst = src[~found], dst[~found]
+        res_counts = np.bincount(res_src, minlength=n)
+        res_gaps = _gaps(res_src, res_dst)
+        run_lengths, run_block = _runs(kept, p_src // stride, blocks)
+        ref_size = _per_block(encode_varints(res_counts)[1], node_block, blocks) \
+            + _per_block(encode_varints(res_gaps)[1], res_src // stride, blocks) \
+            + _per_block(encode_varints(run_lengths)[1], run_block, blocks)
+        modes[ref_size < plain_size] = MODE_REFERENCE
+
+        # streams of every block in the chosen mode
+        ref_node = modes[node_block] == MODE_REFERENCE
+        counts = np.where(ref_node, res_counts, counts)
+        plain_edge = modes[src // stride] == MODE_GAPS
+        ref_edge = modes[res_src // stride] == MODE_REFERENCE
+        owner = np.concatenate([src[plain_edge], res_src[ref_edge]])
+        gaps = np.concatenate([gaps[plain_edge], res_gaps[ref_edge]])[np.argsort(owner, kind="stable")]
+        gap_owner = np.sort(owner, kind="stable")
+        ref_run = modes[run_block] == MODE_REFERENCE
+        run_lengths, run_block = run_lengths[ref_run], run_block[ref_run]
+        parent_name = os.path.relpath(os.path.abspath(parent.path), os.path.dirname(os.path.abspath(path)))
+        parent_m, parent_crc = parent.m, parent.fingerprint
+    else:
+        gap_owner = src
+        run_lengths, run_block = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    streams = []
+    index = np.zeros((blocks + 1, 4), dtype=np.int64)
+    for column, (values, block) in enumerate(((counts, node_block), (gaps, gap_owner // stride), (run_lengths, run_block))):
+        encoded, lengths = encode_varints(values)
+        np.cumsum(_per_block(lengths, block, blocks), out=index[1:, column])
+        streams.append(encoded)
+    np.cumsum(_per_block(np.bincount(src, minlength=n), node_block, blocks), out=index[1:, 3])
+
+    header = CompressedHeader(n=n, m=len(src), directed=directed, weighted=weights is not None, stride=stride,
+                              blocks=blocks, stream_bytes=tuple(len(s) for s in streams), parent=parent_name,
+                              parent_m=parent_m, parent_crc=parent_crc)
+    parent_dir = os.path.dirname(path)
+    if parent_dir:
+        os.makedirs(parent_dir, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(header.pack())
+        if parent_name:
+            name = parent_name.encode("utf-8")
+            f.write(struct.pack("<I", len(name)) + name)
+            f.write(b"\0" * (_pad8(4 + len(name)) - 4 - len(name)))
+        f.write(index.tobytes())
+        f.write(modes.tobytes() + b"\0" * (_pad8(blocks) - blocks))
+        for stream in streams:
+            f.write(stream.tobytes())
+        f.write(b"\0" * (_pad8(f.tell()) - f.tell()))
+        if weights is not None:
+            f.write(weights.astype("<f8").tobytes())
+    return header
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+from itertools import islice
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.domain.interning import Labels, StreamingInterner
+
+# whitespace separated text edgelists ("u v" or "u v w" per line, '#' comments), read and
+# written in fixed-size chunks of lines so that neither side ever holds the whole edge list
+
+EDGELIST_SUFFIXES = (".edgelist", ".txt", ".edges")
+
+
+def iter_edgelist_chunks(path: str | os.PathLike, weighted: bool = False, chunk_size: int = 1 << 20,
+                         interner: Optional[StreamingInterner] = None) \
+        -> Iterator[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]]:
+    """
+    yields (src, dst, weights) arrays of at most chunk_size edges. with an interner, labels of any
+    form are mapped to dense ids in order of first appearance (reuse the interner for later passes,
+    so they agree); without one, labels must be integers and are used as ids.
+    columns past the ones needed are ignored (missing weights default to 1.0)
+    """
+    with open(path, "r") as f:
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                return
+            rows = [line.split("#", 1)[0].split() for line in lines]
+            rows = [r for r in rows if r]
+            if not rows:
+                continue
+            if interner is not None:
+                # u, v interleaved: ids follow the order in which the labels first show up
+                ids = interner.intern(np.array([t for r in rows for t in r[:2]])).astype(np.int64)
+                src, dst = ids[0::2], ids[1::2]
+            else:
+                src = np.fromiter((int(r[0]) for r in rows), dtype=np.int64, count=len(rows))
+                dst = np.fromiter((int(r[1]) for r in rows), dtype=np.int64, count=len(rows))
+            weights = None
+            if weighted:
+                weights = np.fromiter((float(r[2]) if len(r) > 2 else 1.0 for r in rows),
+                                      dtype=np.float64, count=len(rows))
+            yield src, dst, weights
+
+
+class EdgeListWriter:
+    """
+    incremental text counterpart of BinaryGraphWriter: write() appends edge chunks as lines,
+    close() reports the (n, m) seen so far (n = max(node id) + 1). ids are written as their
+    labels when `labels` (a NodeTable or the interner of the input) is given
+    """
+    def __init__(self, path: str | os.PathLike, *, weighted: bool = False, labels: Optional[Labels] = None):
+        self.path = os.fspath(path)
+        self.weighted = weighted
+        self.labels = labels
+        self.m = 0
+        self._max_id = -1
+
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._f = open(self.path, "w")
+
+    def write(self, src: np.ndarray, dst: np.ndarray, weights: Optional[np.ndarray] = None) -> None:
+        if len(src) != len(dst):
+            raise ValueError(f"src and dst lengths differ: {len(src)} != {len(dst)}")
+        if not len(src):
+            return
+        us, vs = (src.tolist(), dst.tolist()) if self.labels is None else (self.labels.label(src), self.labels.label(dst))
+        if self.weighted:
+            if weights is None:
+                raise ValueError("weighted edgelist requires weights for every chunk")
+            lines = (f"{u} {v} {w!r}\n" for u, v, w in zip(us, vs, weights.tolist()))
+        else:
+            lines = (f"{u} {v}\n" for u, v in zip(us, vs))
+        self._f.writelines(lines)
+        self._max_id = max(self._max_id, int(src.max()), int(dst.max()))
+        self.m += len(src)
+
+    def close(self) -> Tuple[int, int]:
+        if not self._f.closed:
+            self._f.close()
+        return self._max_id + 1, self.m
+
+    def __enter__(self) -> "EdgeListWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
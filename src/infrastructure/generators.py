@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+import numpy as np
+
+# vectorized, seeded synthetic graph generators emitting edge arrays in chunks (never a networkx
+# object). every generator returns an EdgeStream whose chunks are (src, dst, weights) numpy arrays
+
+DEFAULT_CHUNK = 1 << 20
+
+EdgeChunk = Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]
+
+
+@dataclass
+class EdgeStream:
+    """n nodes labelled 0..n-1 and an iterator over edge chunks"""
+    n: int
+    directed: bool
+    weighted: bool
+    chunks: Iterator[EdgeChunk]
+
+    def concat(self) -> EdgeChunk:
+        """collects every chunk into a single (src, dst, weights) triple"""
+        parts = list(self.chunks)
+        src = np.concatenate([p[0] for p in parts]) if parts else np.empty(0, dtype=np.int64)
+        dst = np.concatenate([p[1] for p in parts]) if parts else np.empty(0, dtype=np.int64)
+        weights = None
+        if self.weighted:
+            weights = np.concatenate([p[2] for p in parts]) if parts else np.empty(0, dtype=np.float64)
+        return src, dst, weights
+
+
+def _random_weights(rng: np.random.Generator, size: int, weighted: bool) -> Optional[np.ndarray]:
+    return rng.uniform(1.0, 10.0, size=size) if weighted else None
+
+
+def _canonical(src: np.ndarray, dst: np.ndarray, directed: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """drops self-loops and orients undirected edges as (min, max)"""
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    if directed:
+        return src, dst
+    return np.minimum(src, dst), np.maximum(src, dst)
+
+
+def _pair_from_index(k: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """inverts k = w(w-1)/2 + v for the pairs v < w"""
+    w = np.floor((1.0 + np.sqrt(1.0 + 8.0 * k.astype(np.float64))) / 2.0).astype(np.int64)
+    # float rounding can be off by one for very large k
+    w -= (w * (w - 1) // 2) > k
+    w += ((w + 1) * w // 2) <= k
+    v = k - w * (w - 1) // 2
+    return v, w
+
+
+# MODELS
+
+def gnp(
+    n: int, p: float, *, seed: Optional[int] = None, directed: bool = False,
+    weighted: bool = False, chunk_size: int = DEFAULT_CHUNK,
+) -> EdgeStream:
+    """
+    Erdős–Rényi G(n, p) by geometric skipping (Batagelj & Brandes): the gaps between
+    consecutive present pairs are geometric(p), so the cost is O(n + m) instead of O(n^2)
+    """
+    if not 0.0 <= p <= 1.0:
+        raise ValueError(f"p must be within [0, 1], got {p}")
+    rng = np.random.default_rng(seed)
+    total = n * (n - 1) if directed else n * (n - 1) // 2
+
+    def chunks() -> Iterator[EdgeChunk]:
+        if p == 0.0 or total == 0:
+            return
+        last = -1
+        while last < total - 1:
+            positions = last + np.cumsum(rng.geometric(p, size=chunk_size), dtype=np.int64)
+            last = int(positions[-1])
+            positions = positions[positions < total]
+            if positions.size == 0:
+                continue
+            if directed:
+                src, dst = np.divmod(positions, n - 1)
+                dst += dst >= src
+            else:
+                src, dst = _pair_from_index(positions)
+            yield src, dst, _random_weights(rng, src.size, weighted)
+
+    return EdgeStream(n, directed, weighted, chunks())
+
+
+def chung_lu(
+    n: int, avg_degree: float = 8.0, exponent: float = 2.5, *, seed: Optional[int] = None,
+    directed: bool = False, weighted: bool = False, chunk_size: int = DEFAULT_CHUNK,
+) -> EdgeStream:
+    """
+    Chung–Lu graph with power-law expected degrees w_i ~ (i + 1)^(-1 / (exponent - 1));
+    endpoints are sampled proportionally to w (fast Chung–Lu), so parallel edges can repeat
+    """
+    if exponent <= 2.0:
+        raise ValueError(f"power-law exponent must be > 2, got {exponent}")
+    rng = np.random.default_rng(seed)
+    w = np.arange(1, n + 1, dtype=np.float64) ** (-1.0 / (exponent - 1.0))
+    cdf = np.cumsum(w)
+    cdf /= cdf[-1]
+    m = int(round(n * avg_degree / 2))
+
+    def chunks() -> Iterator[EdgeChunk]:
+        for start in range(0, m, chunk_size):
+            size = min(chunk_size, m - start)
+            src = np.searchsorted(cdf, rng.random(size), side="right").astype(np.int64)
+            dst = np.searchsorted(cdf, rng.random(size), side="right").astype(np.int64)
+            src, dst = _canonical(np.minimum(src, n - 1), np.minimum(dst, n - 1), directed)
+            yield src, dst, _random_weights(rng, src.size, weighted)
+
+    return EdgeStream(n, directed, weighted, chunks())
+
+
+def rmat(
+    scale: int, edge_factor: int = 16, a: float = 0.57, b: float = 0.19, c: float = 0.19, *,
+    seed: Optional[int] = None, directed: bool = False, weighted: bool = False,
+    permute: bool = True, chunk_size: int = DEFAULT_CHUNK,
+) -> EdgeStream:
+    """
+    R-MAT / Kronecker graph (graph500 parameters by default) with 2^scale nodes and
+    edge_factor * 2^scale sampled edges; labels are randomly permuted to hide the recursion
+    """
+    d = 1.0 - a - b - c
+    if min(a, b, c, d) < 0:
+        raise ValueError(f"quadrant probabilities must be non-negative, got a={a}, b={b}, c={c}, d={d}")
+    rng = np.random.default_rng(seed)
+    n = 1 << scale
+    m = edge_factor * n
+    perm = rng.permutation(n) if permute else None
+
+    def chunks() -> Iterator[EdgeChunk]:
+        for start in range(0, m, chunk_size):
+            size = min(chunk_size, m - start)
+            src = np.zeros(size, dtype=np.int64)
+            dst = np.zeros(size, dtype=np.int64)
+            for _ in range(scale):
+                r = rng.random(size)
+                src = (src << 1) | (r >= a + b)
+                dst = (dst << 1) | (((r >= a) & (r < a + b)) | (r >= a + b + c))
+            if perm is not None:
+                src, dst = perm[src], perm[dst]
+            src, dst = _canonical(src, dst, directed)
+            yield src, dst, _random_weights(rng, src.size, weighted)
+
+    return EdgeStream(n, directed, weighted, chunks())
+
+
+def grid(
+    rows: int, cols: int, *, p_drop: float = 0.0, p_diagonal: float = 0.0, seed: Optional[int] = None,
+    directed: bool = False, weighted: bool = False, chunk_size: int = DEFAULT_CHUNK,
+) -> EdgeStream:
+    """
+    2D lattice; with p_drop > 0 / p_diagonal > 0 it becomes road-like (missing street segments,
+    occasional diagonal shortcuts). weights are jittered euclidean segment lengths
+    """
+    if directed:
+        raise ValueError("grid generator produces undirected graphs only")
+    rng = np.random.default_rng(seed)
+    n = rows * cols
+    rows_per_chunk = max(1, chunk_size // max(1, 3 * cols))
+
+    def chunks() -> Iterator[EdgeChunk]:
+        for r0 in range(0, rows, rows_per_chunk):
+            r1 = min(rows, r0 + rows_per_chunk)
+            r, c = np.divmod(np.arange(r0 * cols, r1 * cols, dtype=np.int64), cols)
+            ids = r * cols + c
+
+            parts = [
+                (ids[c < cols - 1], ids[c < cols - 1] + 1, 1.0),
+                (ids[r < rows - 1], ids[r < rows - 1] + cols, 1.0),
+            ]
+            if p_diagonal > 0:
+                diag = (c < cols - 1) & (r < rows - 1) & (rng.random(ids.size) < p_diagonal)
+                parts.append((ids[diag], ids[diag] + cols + 1, np.sqrt(2.0)))
+
+            src = np.concatenate([p[0] for p in parts])
+            dst = np.concatenate([p[1] for p in parts])
+            length = np.concatenate([np.full(p[0].size, p[2]) for p in parts])
+
+            if p_drop > 0:
+                keep = rng.random(src.size) >= p_drop
+                src, dst, length = src[keep], dst[keep], length[keep]
+
+            weights = length * rng.uniform(0.8, 1.2, size=src.size) if weighted else None
+            yield src, dst, weights
+
+    return EdgeStream(n, False, weighted, chunks())
+
+
+def random_geometric(
+    n: int, radius: Optional[float] = None, avg_degree: float = 8.0, *, seed: Optional[int] = None,
+    directed: bool = False, weighted: bool = False, chunk_size: int = DEFAULT_CHUNK,
+) -> EdgeStream:
+    """
+    random geometric graph on the unit square: nodes within `radius` are connected
+    (radius defaults to the one giving ~avg_degree). points are bucketed into radius-sized
+    cells and only the 5 forward-neighbouring cells are compared, so the cost is O(n + m).
+    weights are euclidean distances
+    """
+    if directed:
+        raise ValueError("random_geometric generator produces undirected graphs only")
+    rng = np.random.default_rng(seed)
+    if radius is None:
+        radius = float(np.sqrt(avg_degree / (np.pi * max(n, 1))))
+    cells = max(1, int(1.0 / radius))
+    pts = rng.random((n, 2))
+
+    cx = np.minimum((pts[:, 0] * cells).astype(np.int64), cells - 1)
+    cy = np.minimum((pts[:, 1] * cells).astype(np.int64), cells - 1)
+    order = np.argsort(cy * cells + cx, kind="stable")
+    cell_of = (cy * cells + cx)[order]
+    counts = np.bincount(cell_of, minlength=cells * cells)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    r2 = radius * radius
+
+    def chunks() -> Iterator[EdgeChunk]:
+        step = max(1, chunk_size // 16)
+        for i0 in range(0, n, step):
+            i = np.arange(i0, min(n, i0 + step), dtype=np.int64)
+            x, y = cx[order[i]], cy[order[i]]
+
+            for dx, dy in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+                tx, ty = x + dx, y + dy
+                ok = (tx >= 0) & (tx < cells) & (ty < cells)
+                ii = i[ok]
+                target = ty[ok] * cells + tx[ok]
+                lens = counts[target]
+                if lens.sum() == 0:
+                    continue
+
+                a = np.repeat(ii, lens)
+                offsets = np.arange(lens.sum()) - np.repeat(np.cumsum(lens) - lens, lens)
+                b = np.repeat(starts[target], lens) + offsets
+                if dx == 0 and dy == 0:
+                    keep = b > a
+                    a, b = a[keep], b[keep]
+
+                diff = pts[order[a]] - pts[order[b]]
+                d2 = np.einsum("ij,ij->i", diff, diff)
+                close = d2 <= r2
+                src, dst = order[a[close]], order[b[close]]
+                weights = np.sqrt(d2[close]) if weighted else None
+                yield np.minimum(src, dst), np.maximum(src, dst), weights
+
+    return EdgeStream(n, False, weighted, chunks())
+
+
+GENERATORS: Dict[str, Callable[..., EdgeStream]] = {
+    "gnp": gnp,
+    "chung_lu": chung_lu,
+    "rmat": rmat,
+    "grid": grid,
+    "random_geometric": random_geometric,
+}
+
+
+def generate(spec: Mapping[str, Any], **defaults: Any) -> EdgeStream:
+    """
+    builds an EdgeStream from a spec such as {"model": "gnp", "n": 10**6, "p": 1e-5, "seed": 1};
+    `defaults` (e.g. directed/weighted from a GraphSource) are overridden by the spec
+    """
+    params = {**defaults, **spec}
+    model = params.pop("model", None)
+    try:
+        factory = GENERATORS[model]
+    except KeyError as e:
+        raise ValueError(f"unknown generator model '{model}'. available: {sorted(GENERATORS)}") from e
+    return factory(**params)
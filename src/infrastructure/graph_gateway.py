@@ -1,18 +1,34 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 import networkx as nx
+import numpy as np
 import os
 from pathlib import Path
 
 from src.domain.graph_model import Graph
+from src.domain.interning import Labels, StreamingInterner, load_node_table, save_node_table
+from src.domain.common.tracing import span
+from src.infrastructure.binary_format import (
+    BinaryGraphWriter, BinaryHeader, iter_binary_chunks, load_binary_networkx, read_header,
+)
+from src.infrastructure.compressed_format import (
+    COMPRESSED_SUFFIXES, CompressedHeader, iter_compressed_chunks, load_compressed_networkx, read_compressed_header,
+    write_compressed,
+)
+from src.infrastructure.edgelist_format import EDGELIST_SUFFIXES, EdgeListWriter, iter_edgelist_chunks
+from src.infrastructure.generators import DEFAULT_CHUNK, EdgeChunk, EdgeStream, generate
 
 
 @dataclass
 class GraphSource:
     """
     [DTO] specifying where to find a graph and how it should be interpreted
+    kind: "file" (edgelist path), "binary" (binary edge file path), "compressed" (compressed
+    archive path), "memory" (networkx graph) or "generator" (spec dict such as
+    {"model": "rmat", "scale": 20, "seed": 1})
     """
     kind: str
     name: str
@@ -26,6 +42,11 @@ class GraphGateway:
     """
     [GATEWAY] to external graph data
     """
+    def __init__(self):
+        # one interner per text edgelist streamed from, so every pass (and the output writer)
+        # agrees on the ids given to its labels
+        self._interners: Dict[Tuple[str, float], StreamingInterner] = {}
+
     def load(self, source: GraphSource) -> Graph:
         print(f"\n[GATEWAY] loading graph '{source.name}' from {source.kind}...")
 
@@ -44,25 +65,59 @@ class GraphGateway:
             def lazy_loader():
                 print(f"\n[LAZY LOAD] reading file {path}")
 
-                create_using = nx.DiGraph if source.directed else nx.Graph
-
-                if source.weighted:
-                    return nx.read_edgelist(
-                        str(path),
-                        nodetype=int,
-                        create_using=create_using,
-                        data=(('weight', float),)
-                    )
-                else:
-                    return nx.read_edgelist(
-                        str(path),
-                        nodetype=int,
-                        create_using=create_using
-                        # default: data=True
-                    )
+                # labels of any type are interned to dense ids in order of first appearance (the
+                # node order read_edgelist would give); the table resolves them back on output
+                interner = StreamingInterner()
+                G = nx.DiGraph() if source.directed else nx.Graph()
+                with span("parse", path=str(path), format="edgelist"):
+                    for src, dst, weights in iter_edgelist_chunks(path, weighted=source.weighted, interner=interner):
+                        G.add_nodes_from(range(G.number_of_nodes(), len(interner)))
+                        if weights is None:
+                            # extra columns (e.g. weights of a weighted file) are ignored
+                            G.add_edges_from(zip(src.tolist(), dst.tolist()))
+                        else:
+                            G.add_weighted_edges_from(zip(src.tolist(), dst.tolist(), weights.tolist()))
+                    G.graph["node_table"] = interner.table()
+                return G
+
+            return Graph.from_loader(name=source.name, loader_f=lazy_loader)
+
+        elif source.kind == "binary":
+            path = source.value
+            if path is None or not os.path.exists(path):
+                raise FileNotFoundError(f"file not found: {path}")
+
+            def lazy_loader():
+                print(f"\n[LAZY LOAD] reading binary graph {path}")
+                with span("parse", path=str(path), format="binary"):
+                    return self._with_labels(load_binary_networkx(path), path)
 
             return Graph.from_loader(name=source.name, loader_f=lazy_loader)
 
+        elif source.kind == "compressed":
+            path = source.value
+            if path is None or not os.path.exists(path):
+                raise FileNotFoundError(f"file not found: {path}")
+
+            def lazy_loader():
+                print(f"\n[LAZY LOAD] decoding compressed graph {path}")
+                with span("parse", path=str(path), format="compressed"):
+                    return self._with_labels(load_compressed_networkx(path), path)
+
+            return Graph.from_loader(name=source.name, loader_f=lazy_loader)
+
+        elif source.kind == "generator":
+            spec = dict(source.value or {})
+            if "model" not in spec:
+                raise ValueError(f"error: generator spec for graph '{source.name}' needs a 'model'")
+
+            def lazy_loader():
+                print(f"\n[LAZY LOAD] generating {spec['model']} graph")
+                with span("parse", format="generator", model=spec["model"]):
+                    return self._stream_to_networkx(self._edge_stream(source))
+
+            return Graph.from_loader(name=source.name, loader_f=lazy_loader, metadata={"generator": spec})
+
         elif source.kind == "memory":
             if source.value is None:
                 return nx.DiGraph() if source.directed else nx.Graph()
@@ -72,3 +127,192 @@ class GraphGateway:
 
         else:
             raise ValueError(f"unknown source kind: {source.kind}")
+
+    def stream_to_binary(self, source: GraphSource, path: str | os.PathLike) -> BinaryHeader:
+        """
+        streams a generator source chunk by chunk into a binary edge file, never building
+        a networkx object; load the result with GraphSource(kind="binary", value=path)
+        """
+        if source.kind != "generator":
+            raise ValueError(f"streaming to binary is supported for generator sources, got: {source.kind}")
+
+        stream = self._edge_stream(source)
+        with span("generate", model=source.value.get("model"), path=str(path)) as s:
+            with BinaryGraphWriter(path, directed=stream.directed, weighted=stream.weighted, n=stream.n) as w:
+                for src, dst, weights in stream.chunks:
+                    w.write(src, dst, weights)
+            header = read_header(path)
+            save_node_table(None, path)  # generated ids are the labels
+            s.set(nodes=header.n, edges=header.m)
+
+        print(f"[GATEWAY] wrote '{source.name}' ({header.n} nodes, {header.m} edges) to {path}")
+        return header
+
+    # STREAMING
+
+    def iter_edge_chunks(self, source: GraphSource, chunk_size: int = DEFAULT_CHUNK) -> Iterator[EdgeChunk]:
+        """
+        [ITERATOR] (src, dst, weights) chunks of at most chunk_size edges read straight from the
+        source, no graph object is built; every call starts a new pass over the source
+        """
+        if source.kind == "file":
+            if source.value is None or not os.path.exists(source.value):
+                raise FileNotFoundError(f"file not found: {source.value}")
+            yield from iter_edgelist_chunks(source.value, weighted=source.weighted, chunk_size=chunk_size,
+                                            interner=self._interner(source.value))
+
+        elif source.kind == "binary":
+            if source.value is None or not os.path.exists(source.value):
+                raise FileNotFoundError(f"file not found: {source.value}")
+            yield from iter_binary_chunks(source.value, chunk_size=chunk_size)
+
+        elif source.kind == "compressed":
+            if source.value is None or not os.path.exists(source.value):
+                raise FileNotFoundError(f"file not found: {source.value}")
+            yield from iter_compressed_chunks(source.value, chunk_size=chunk_size)
+
+        elif source.kind == "generator":
+            for src, dst, weights in self._edge_stream(source).chunks:
+                # generator chunks have their own size, re-slice them to the requested one
+                for i in range(0, len(src), chunk_size):
+                    yield src[i:i + chunk_size], dst[i:i + chunk_size], \
+                        None if weights is None else weights[i:i + chunk_size]
+
+        elif source.kind == "memory":
+            G = source.value if source.value is not None else nx.Graph()
+            index = {v: i for i, v in enumerate(G.nodes())}
+            edges = iter(G.edges(data="weight", default=1.0))
+            while True:
+                block = list(islice(edges, chunk_size))
+                if not block:
+                    return
+                yield np.array([index[u] for u, _, _ in block], dtype=np.int64), \
+                    np.array([index[v] for _, v, _ in block], dtype=np.int64), \
+                    np.array([w for _, _, w in block], dtype=np.float64) if source.weighted else None
+
+        else:
+            raise ValueError(f"unknown source kind: {source.kind}")
+
+    def stream_shape(self, source: GraphSource) -> Tuple[Optional[int], bool, bool]:
+        """
+        (n, directed, weighted) of what iter_edge_chunks yields, without a pass over the edges;
+        n is None for text edgelists, where it is only known after reading them
+        """
+        if source.kind == "binary":
+            header = read_header(source.value)
+            return header.n, header.directed, header.weighted
+        if source.kind == "compressed":
+            header = read_compressed_header(source.value)
+            return header.n, header.directed, header.weighted
+        if source.kind == "generator":
+            stream = self._edge_stream(source)  # chunks are generated lazily, nothing runs yet
+            return stream.n, stream.directed, stream.weighted
+        if source.kind == "memory" and source.value is not None:
+            return source.value.number_of_nodes(), source.value.is_directed(), source.weighted
+        return None, source.directed, source.weighted
+
+    def stream_labels(self, source: GraphSource) -> Optional[Labels]:
+        """
+        labels of the ids iter_edge_chunks yields: the interner of a text edgelist (growing as it
+        is read), the stored table of a binary/compressed file; None when ids are the labels
+        """
+        if source.kind == "file":
+            return self._interner(source.value)
+        if source.kind in ("binary", "compressed"):
+            return load_node_table(source.value)
+        return None
+
+    def write_edge_chunks(self, chunks: Iterable[EdgeChunk], path: str | os.PathLike, *, directed: bool = False,
+                          weighted: bool = False, n: Optional[int] = None, labels: Optional[Labels] = None,
+                          reference: Optional[str | os.PathLike] = None) -> GraphSource:
+        """
+        appends edge chunks to `path` as they arrive: a text edgelist for .edgelist/.txt/.edges
+        paths (ids written as their `labels`, when given), a compressed archive for .gcz paths
+        (edges gathered first, lists need sorting; optionally against a `reference` archive),
+        the binary edge format otherwise. the last two store ids only: `labels` go to a sidecar
+        table (see interning.save_node_table) that is attached again on load. returns the source
+        that loads the written file
+        """
+        path = os.fspath(path)
+        if path.endswith(EDGELIST_SUFFIXES):
+            with EdgeListWriter(path, weighted=weighted, labels=labels) as w:
+                for src, dst, weights in chunks:
+                    w.write(src, dst, weights)
+            n, m = w.close()
+            kind = "file"
+        elif path.endswith(COMPRESSED_SUFFIXES):
+            src, dst, weights = self._gather(chunks, weighted)
+            header = write_compressed(path, src, dst, weights, n=n, directed=directed, reference=reference)
+            n, m, kind = header.n, header.m, "compressed"
+        else:
+            with BinaryGraphWriter(path, directed=directed, weighted=weighted, n=n) as w:
+                for src, dst, weights in chunks:
+                    w.write(src, dst, weights)
+            header = w.close()
+            n, m, kind = header.n, header.m, "binary"
+        if kind != "file":
+            save_node_table(labels, path)
+
+        print(f"[GATEWAY] wrote {m} edges over {n} node ids to {path}")
+        name = os.path.splitext(os.path.basename(path))[0]
+        return GraphSource(kind=kind, name=name, value=path, directed=directed, weighted=weighted)
+
+    def archive(self, graph: Graph, path: str | os.PathLike, reference: Optional[str | os.PathLike] = None) \
+            -> CompressedHeader:
+        """
+        writes a loaded graph to a compressed archive (.gcz), optionally as a delta against the
+        `reference` archive of the graph it was derived from. node ids must be dense ints 0..n-1
+        (every gateway source but memory graphs has them, see interning)
+        """
+        csr = graph.to_csr()
+        if not np.array_equal(np.asarray(csr.nodes), np.arange(csr.n)):
+            raise ValueError(f"graph '{graph.name}' has no dense int node ids, it cannot be archived")
+        weights = csr.weights if graph.is_weighted() else None
+        with span("archive", graph=graph.name, path=os.fspath(path)) as s:
+            header = write_compressed(path, csr.src, csr.dst, weights, n=csr.n, directed=csr.directed,
+                                      reference=reference)
+            save_node_table(graph.node_table, path)
+            s.set(nodes=header.n, edges=header.m, bytes=os.path.getsize(path))
+        print(f"[GATEWAY] archived '{graph.name}' ({header.m} edges, {os.path.getsize(path)} bytes) to {path}")
+        return header
+
+    @staticmethod
+    def _with_labels(G: nx.Graph | nx.DiGraph, path: str | os.PathLike) -> nx.Graph | nx.DiGraph:
+        table = load_node_table(path)
+        if table is not None:
+            if len(table) < G.number_of_nodes():
+                raise ValueError(f"label table of {path} has {len(table)} labels for {G.number_of_nodes()} nodes")
+            G.graph["node_table"] = table
+        return G
+
+    def _interner(self, path: str | os.PathLike) -> StreamingInterner:
+        key = (os.fspath(path), os.path.getmtime(path))
+        if key not in self._interners:
+            self._interners[key] = StreamingInterner()
+        return self._interners[key]
+
+    @staticmethod
+    def _gather(chunks: Iterable[EdgeChunk], weighted: bool) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        src, dst, weights = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)], [np.zeros(0)]
+        for s, d, w in chunks:
+            src.append(s)
+            dst.append(d)
+            if weighted:
+                weights.append(w)
+        return np.concatenate(src), np.concatenate(dst), np.concatenate(weights) if weighted else None
+
+    @staticmethod
+    def _edge_stream(source: GraphSource) -> EdgeStream:
+        return generate(source.value, directed=source.directed, weighted=source.weighted)
+
+    @staticmethod
+    def _stream_to_networkx(stream: EdgeStream) -> nx.Graph | nx.DiGraph:
+        G = nx.DiGraph() if stream.directed else nx.Graph()
+        G.add_nodes_from(range(stream.n))
+        for src, dst, weights in stream.chunks:
+            if weights is None:
+                G.add_edges_from(zip(src.tolist(), dst.tolist()))
+            else:
+                G.add_weighted_edges_from(zip(src.tolist(), dst.tolist(), weights.tolist()))
+        return G
+
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from src.domain.graph_model import Graph
 from src.domain.experiment import Experiment, RunID
@@ -21,6 +21,20 @@ class GraphRepository(ABC):
     def list_names(self) -> List[str]:
         pass
 
+    @abstractmethod
+    def delete(self, name: str) -> None:
+        """removes the graph together with every index stored alongside it"""
+        pass
+
+    @abstractmethod
+    def save_index(self, name: str, kind: str, index: Any) -> None:
+        """stores a derived query index (e.g. 'landmarks') alongside the graph `name`"""
+        pass
+
+    @abstractmethod
+    def get_index(self, name: str, kind: str) -> Optional[Any]:
+        pass
+
 
 class ExperimentRepository(ABC):
     """
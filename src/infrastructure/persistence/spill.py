@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import pickle
+from typing import Any, Dict, Tuple
+
+import networkx as nx
+import numpy as np
+
+from src.infrastructure.binary_format import BinaryGraphWriter, iter_binary_chunks
+
+# spill files of evicted graphs: the edges in the binary edge format (node rows instead of labels,
+# in G.edges() order, so edge masks of views stay aligned after a reload) plus a pickled sidecar
+# with the node labels and whatever attributes the binary records cannot hold
+
+SPILL_CHUNK = 1 << 20
+
+
+def spill_paths(directory: str | os.PathLike, key: str) -> Tuple[str, str]:
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in key)
+    base = os.path.join(os.fspath(directory), safe)
+    return base + ".bin", base + ".meta"
+
+
+def spill_graph(G: nx.Graph | nx.DiGraph, directory: str | os.PathLike, key: str, weighted: bool) -> Tuple[str, str]:
+    """writes G to (edge file, sidecar) under `directory`; multigraphs are not supported"""
+    if G.is_multigraph():
+        raise ValueError("multigraphs cannot be spilled to the binary edge format")
+    bin_path, meta_path = spill_paths(directory, key)
+    nodes = list(G.nodes())
+    row = {v: i for i, v in enumerate(nodes)}
+    meta: Dict[str, Any] = {
+        "nodes": nodes,
+        "directed": G.is_directed(),
+        "graph": dict(G.graph),
+        "node_attrs": {i: dict(d) for i, (_, d) in enumerate(G.nodes(data=True)) if d},
+        "edge_attrs": {},
+    }
+
+    with BinaryGraphWriter(bin_path, directed=G.is_directed(), weighted=weighted, n=len(nodes)) as writer:
+        src, dst, weights = [], [], []
+        for i, (u, v, d) in enumerate(G.edges(data=True)):
+            src.append(row[u])
+            dst.append(row[v])
+            if weighted:
+                weights.append(d["weight"])
+            extra = {k: x for k, x in d.items() if not (weighted and k == "weight")}
+            if extra:
+                meta["edge_attrs"][i] = extra
+            if len(src) == SPILL_CHUNK:
+                writer.write(np.array(src), np.array(dst), np.array(weights) if weighted else None)
+                src, dst, weights = [], [], []
+        writer.write(np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64),
+                     np.array(weights, dtype=np.float64) if weighted else None)
+
+    with open(meta_path, "wb") as f:
+        pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return bin_path, meta_path
+
+
+def load_spilled(bin_path: str, meta_path: str) -> nx.Graph | nx.DiGraph:
+    """rebuilds the graph written by spill_graph: same labels, attributes, node and edge order"""
+    with open(meta_path, "rb") as f:
+        meta = pickle.load(f)
+    nodes, node_attrs, edge_attrs = meta["nodes"], meta["node_attrs"], meta["edge_attrs"]
+    G = nx.DiGraph() if meta["directed"] else nx.Graph()
+    G.graph.update(meta["graph"])
+    G.add_nodes_from((v, node_attrs.get(i, {})) for i, v in enumerate(nodes))
+
+    offset = 0
+    for src, dst, weights in iter_binary_chunks(bin_path, chunk_size=SPILL_CHUNK):
+        ws = weights.tolist() if weights is not None else None
+        edges = []
+        for j, (u, v) in enumerate(zip(src.tolist(), dst.tolist())):
+            d = dict(edge_attrs.get(offset + j, ()))
+            if ws is not None:
+                d["weight"] = ws[j]
+            edges.append((nodes[u], nodes[v], d))
+        G.add_edges_from(edges)
+        offset += len(src)
+    return G
+
+
+def remove_spilled(bin_path: str, meta_path: str) -> None:
+    for path in (bin_path, meta_path):
+        if os.path.exists(path):
+            os.remove(path)
@@ -1,22 +1,131 @@
-from typing import List, Optional, Dict
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, List, Optional, Dict, Tuple
 
 from src.infrastructure.persistence.repo import GraphRepository, ExperimentRepository
-from src.domain.graph_model import Graph
+from src.infrastructure.persistence.spill import load_spilled, remove_spilled, spill_graph
+from src.domain.graph_model import Graph, GraphView
 from src.domain.experiment import Experiment, RunID
 
 class InMemoryGraphRepository(GraphRepository):
-    def __init__(self):
-        self._storage: Dict[str, Graph] = {}
+    """
+    graphs kept in memory in least-recently-used order. with a `memory_budget` (bytes, checked
+    against Graph.estimated_bytes on every save/get) the least recently used graphs beyond the
+    budget are evicted: originals are spilled to a binary file and turned back into lazy proxies
+    (Graph.unload) that reload on access, views just drop their cached arrays. the most recently
+    used graph (with its parent, for a view) always stays resident
+    """
+    def __init__(self, memory_budget: Optional[int] = None, spill_dir: Optional[str] = None):
+        self._storage: "OrderedDict[str, Graph]" = OrderedDict()
+        self._indexes: Dict[Tuple[str, str], Any] = {}
+        self.memory_budget = memory_budget
+        self._spill_dir = spill_dir
+        self._spilled: Dict[str, Tuple[str, str]] = {}  # name -> spill paths
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.spilled_bytes = 0
 
     def save(self, graph: Graph) -> None:
+        if self._storage.get(graph.name) is graph:
+            graph.invalidate()  # saved again after an in-place edit: its cached arrays may be stale
         self._storage[graph.name] = graph
+        self._storage.move_to_end(graph.name)
+        self._enforce_budget()
 
     def get(self, name: str) -> Optional[Graph]:
-        return self._storage.get(name)
+        graph = self._storage.get(name)
+        if graph is None:
+            return None
+        if graph.is_loaded or isinstance(graph, GraphView):
+            self.hits += 1
+        else:
+            self.misses += 1  # spilled (or never loaded): the returned proxy loads on first access
+        # a view is only as resident as its parent: both become most recently used
+        parent = graph.parent if isinstance(graph, GraphView) else None
+        if parent is not None and self._storage.get(parent.name) is parent:
+            self._storage.move_to_end(parent.name)
+        self._storage.move_to_end(name)
+        self._enforce_budget()
+        return graph
 
     def list_names(self) -> List[str]:
         return sorted(list(self._storage.keys()))
 
+    def delete(self, name: str) -> None:
+        self._storage.pop(name, None)
+        for key in [k for k in self._indexes if k[0] == name]:
+            del self._indexes[key]
+        spilled = self._spilled.pop(name, None)
+        if spilled is not None:
+            remove_spilled(*spilled)
+
+    def save_index(self, name: str, kind: str, index: Any) -> None:
+        if name not in self._storage:
+            raise KeyError(f"cannot store a '{kind}' index for unknown graph '{name}'")
+        self._indexes[(name, kind)] = index
+
+    def get_index(self, name: str, kind: str) -> Optional[Any]:
+        return self._indexes.get((name, kind))
+
+    # MEMORY BUDGET
+
+    def resident_bytes(self) -> int:
+        return sum(graph.estimated_bytes() for graph in self._storage.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "spilled_bytes": self.spilled_bytes,
+            "resident_bytes": self.resident_bytes(),
+            "memory_budget": self.memory_budget,
+        }
+
+    def _enforce_budget(self) -> None:
+        if self.memory_budget is None:
+            return
+        sizes = {name: graph.estimated_bytes() for name, graph in self._storage.items()}
+        total = sum(sizes.values())
+        newest = list(self._storage)[-2:]
+        newest = newest[-1:] if len(newest) < 2 or not self._is_parent_of(newest[0], newest[1]) else newest
+        for name in list(self._storage):  # least recently used first
+            if total <= self.memory_budget:
+                break
+            if name in newest or sizes[name] == 0:
+                continue
+            graph = self._storage[name]
+            if not isinstance(graph, GraphView) and graph.to_networkx(copy=False).is_multigraph():
+                continue  # no spill format for parallel edges: pinned
+            self._evict(name, graph)
+            total -= sizes[name] - graph.estimated_bytes()
+
+    def _is_parent_of(self, name: str, view_name: str) -> bool:
+        view = self._storage[view_name]
+        return isinstance(view, GraphView) and view.parent is self._storage[name]
+
+    def _evict(self, name: str, graph: Graph) -> None:
+        print(f"[REPOSITORY] evicting '{name}' ({graph.estimated_bytes()} bytes) over the memory budget")
+        self.evictions += 1
+        if isinstance(graph, GraphView):
+            graph.unload()
+            return
+
+        for other in self._storage.values():
+            if isinstance(other, GraphView) and other.parent is graph:
+                other.unload()  # its networkx view still references the parent's graph
+
+        # always written again: the spill file is the only copy once unloaded, and an in-place edit
+        # since the last reload (a changed weight, attribute) leaves no trace to compare against
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="graph-spill-")
+        paths = spill_graph(graph.to_networkx(copy=False), self._spill_dir, name, weighted=graph.is_weighted())
+        self._spilled[name] = paths
+        self.spilled_bytes += sum(os.path.getsize(p) for p in paths)
+        graph.unload(lambda: load_spilled(*paths))
+
 
 class InMemoryExperimentRepository(ExperimentRepository):
     def __init__(self):
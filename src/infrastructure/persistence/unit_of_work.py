@@ -3,6 +3,7 @@ from typing import List
 from src.infrastructure.persistence.repo import GraphRepository, ExperimentRepository
 from src.domain.graph_model import Graph
 from src.domain.experiment import Experiment
+from src.domain.common.tracing import span
 
 class UnitOfWork:
     """
@@ -25,10 +26,11 @@ class UnitOfWork:
     def commit(self):
         print("\n[UNIT OF WORK] committing transaction...")
 
-        for g in self._new_graphs:
-            self.graph_repo.save(g)
-        for e in self._new_experiments:
-            self.experiment_repo.save(e)
+        with span("commit", graphs=len(self._new_graphs), experiments=len(self._new_experiments)):
+            for g in self._new_graphs:
+                self.graph_repo.save(g)
+            for e in self._new_experiments:
+                self.experiment_repo.save(e)
 
         self.committed = True
 
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class ResultSink(ABC):
+    """
+    append-only writer for result rows; every row is flushed (or buffered in a bounded
+    batch) as soon as it arrives, so memory stays flat regardless of the sweep size
+    """
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self.rows_written = 0
+
+    @abstractmethod
+    def write(self, row: Dict[str, Any]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+class JsonlSink(ResultSink):
+    def __init__(self, path: str | os.PathLike):
+        super().__init__(path)
+        self._f = open(self.path, "a", encoding="utf-8")
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self._f.write(json.dumps(row, default=_json_default) + "\n")
+        self._f.flush()
+        self.rows_written += 1
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class CsvSink(ResultSink):
+    """flat columns; nested values (params, metric summaries) are stored as json strings"""
+    def __init__(self, path: str | os.PathLike, columns: Sequence[str]):
+        super().__init__(path)
+        self.columns = list(columns)
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._f = open(self.path, "a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._f, fieldnames=self.columns, extrasaction="ignore")
+        if new_file:
+            self._writer.writeheader()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        flat = {
+            k: json.dumps(v, default=_json_default) if isinstance(v, (dict, list)) else v
+            for k, v in row.items()
+        }
+        self._writer.writerow(flat)
+        self._f.flush()
+        self.rows_written += 1
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class ParquetSink(ResultSink):
+    """
+    buffers at most `batch_size` rows and writes them as one parquet row group;
+    needs the optional pyarrow dependency
+    """
+    def __init__(self, path: str | os.PathLike, columns: Sequence[str], batch_size: int = 256):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("parquet output needs pyarrow: pip install pyarrow") from e
+        super().__init__(path)
+        self._pa, self._pq = pa, pq
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self._buffer: List[Dict[str, Any]] = []
+        self._writer = None
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self._buffer.append({
+            k: json.dumps(row.get(k), default=_json_default) if isinstance(row.get(k), (dict, list)) else row.get(k)
+            for k in self.columns
+        })
+        self.rows_written += 1
+        if len(self._buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        columns = {c: [r[c] for r in self._buffer] for c in self.columns}
+        if self._writer is None:
+            table = self._pa.table(columns)
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = self._pa.table(columns, schema=self._writer.schema)
+        self._writer.write_table(table)
+        self._buffer = []
+
+    def close(self) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+SINK_FORMATS = ("jsonl", "csv", "parquet")
+
+
+def open_sink(path: str | os.PathLike, columns: Sequence[str], fmt: Optional[str] = None) -> ResultSink:
+    """picks the sink from `fmt` or from the file extension (.jsonl, .csv, .parquet)"""
+    fmt = fmt or os.path.splitext(os.fspath(path))[1].lstrip(".").lower()
+    if fmt in ("jsonl", "json", "ndjson"):
+        return JsonlSink(path)
+    if fmt == "csv":
+        return CsvSink(path, columns)
+    if fmt in ("parquet", "pq"):
+        return ParquetSink(path, columns)
+    raise ValueError(f"unknown result format '{fmt}'. available: {list(SINK_FORMATS)}")
@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import multiprocessing as mp
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from src.domain.common.tracing import Tracer, span, peak_rss
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.registry import MetricRegistry
+from src.domain.sparsifiers.registry import SparsifierRegistry
+from src.domain.transforms.registry import TransformRegistry
+from src.infrastructure.binary_format import open_binary
+from src.infrastructure.compressed_format import CompressedGraph, write_compressed
+from src.infrastructure.graph_gateway import GraphGateway, GraphSource
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+
+REPORT_SCHEMA = 1
+KINDS = ("sparsifier", "transform", "metric")
+
+
+# GRAPH FAMILIES
+# each family maps a target edge count `m` to a generator spec (average degree ~8)
+
+def _gnp(m: int, seed: int) -> Dict[str, Any]:
+    n = max(2, m // 4)
+    return {"model": "gnp", "n": n, "p": min(1.0, m / (n * (n - 1) / 2)), "seed": seed}
+
+
+def _powerlaw(m: int, seed: int) -> Dict[str, Any]:
+    return {"model": "chung_lu", "n": max(2, m // 4), "avg_degree": 8.0, "seed": seed}
+
+
+def _rmat(m: int, seed: int) -> Dict[str, Any]:
+    return {"model": "rmat", "scale": max(1, int(round(math.log2(max(m, 16) / 8)))), "edge_factor": 8, "seed": seed}
+
+
+def _grid(m: int, seed: int) -> Dict[str, Any]:
+    side = max(2, int(math.sqrt(m / 2)))
+    return {"model": "grid", "rows": side, "cols": side, "seed": seed}
+
+
+def _road(m: int, seed: int) -> Dict[str, Any]:
+    side = max(2, int(math.sqrt(m / 2)))
+    return {"model": "grid", "rows": side, "cols": side, "p_drop": 0.1, "p_diagonal": 0.05, "seed": seed}
+
+
+def _geometric(m: int, seed: int) -> Dict[str, Any]:
+    return {"model": "random_geometric", "n": max(2, m // 4), "avg_degree": 8.0, "seed": seed}
+
+
+FAMILIES: Dict[str, Callable[[int, int], Dict[str, Any]]] = {
+    "gnp": _gnp,
+    "powerlaw": _powerlaw,
+    "rmat": _rmat,
+    "grid": _grid,
+    "road": _road,
+    "geometric": _geometric,
+}
+
+
+def build_graph(family: str, m: int, seed: int) -> Graph:
+    try:
+        spec = FAMILIES[family](m, seed)
+    except KeyError as e:
+        raise KeyError(f"unknown graph family '{family}'. available: {sorted(FAMILIES)}") from e
+    graph = GraphGateway().load(GraphSource(kind="generator", value=spec, name=f"{family}-{m}"))
+    graph.to_networkx(copy=False)  # generation is not part of the measurement
+    return graph
+
+
+def geometric_sizes(min_edges: int = 1_000, max_edges: int = 10_000_000, steps_per_decade: int = 1) -> List[int]:
+    """edge counts growing geometrically from min_edges to max_edges (inclusive)"""
+    decades = math.log10(max_edges / min_edges)
+    steps = int(round(decades * steps_per_decade))
+    return [int(round(min_edges * 10 ** (i / steps_per_decade))) for i in range(steps + 1)]
+
+
+# BENCHMARK CONFIGURATION
+
+@dataclass
+class BenchmarkConfig:
+    families: List[str] = field(default_factory=lambda: sorted(FAMILIES))
+    sizes: List[int] = field(default_factory=lambda: geometric_sizes(1_000, 100_000))
+    kinds: List[str] = field(default_factory=lambda: list(KINDS))
+    plugins: Optional[List[str]] = None  # None -> every registered plugin
+    time_cap: float = 60.0               # seconds per case
+    memory_cap: Optional[int] = 4 << 30  # bytes of address space per case
+    seed: int = 420
+    isolate: bool = True                 # run every case in its own process
+
+
+def registered_plugins(kinds: List[str]) -> List[Tuple[str, str]]:
+    listing = {
+        "sparsifier": SparsifierRegistry.list,
+        "transform": TransformRegistry.list,
+        "metric": MetricRegistry.list,
+    }
+    return [(kind, name) for kind in kinds for name in listing[kind]()]
+
+
+# SINGLE CASE
+
+def run_case(kind: str, plugin: str, family: str, size: int, seed: int) -> Dict[str, Any]:
+    """builds the input graph and measures one plugin on it"""
+    graph = build_graph(family, size, seed)
+    row: Dict[str, Any] = {
+        "kind": kind, "plugin": plugin, "family": family, "size": size,
+        "nodes": graph.node_count, "edges": graph.edge_count,
+    }
+    rss_before = peak_rss()
+
+    with Tracer(memory="rss"):
+        with span(f"{kind}:{plugin}", category="benchmark") as s:
+            if kind == "metric":
+                MetricRegistry.get(plugin).compute(graph, RunParams({}))
+            elif kind == "sparsifier":
+                SparsifierRegistry.get(plugin).execute(graph, RunParams({}))
+            else:
+                TransformRegistry.get(plugin).execute(graph, RunParams({}))
+
+    row.update(status="ok", wall_time=s.wall_time, cpu_time=s.cpu_time, peak_memory=s.peak_memory)
+    if rss_before is not None and s.peak_memory is not None:
+        row["memory_delta"] = s.peak_memory - rss_before
+    return row
+
+
+def _case_worker(conn, memory_cap: Optional[int], args: Tuple) -> None:
+    if memory_cap and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_cap, memory_cap))
+    try:
+        conn.send(run_case(*args))
+    except MemoryError:
+        conn.send({"status": "memory"})
+    except Exception as e:
+        conn.send({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_case_capped(kind: str, plugin: str, family: str, size: int, config: BenchmarkConfig) -> Dict[str, Any]:
+    """runs a case in a child process, killing it when it exceeds the time cap"""
+    key = {"kind": kind, "plugin": plugin, "family": family, "size": size}
+    args = (kind, plugin, family, size, config.seed)
+
+    if not config.isolate:
+        try:
+            return run_case(*args)
+        except Exception as e:
+            return {**key, "status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    recv, send = mp.Pipe(duplex=False)
+    proc = mp.Process(target=_case_worker, args=(send, config.memory_cap, args), daemon=True)
+    proc.start()
+    send.close()
+
+    if recv.poll(config.time_cap):
+        try:
+            row = recv.recv()
+        except EOFError:
+            row = {"status": "crashed"}
+    else:
+        row = {"status": "timeout"}
+
+    if proc.is_alive():
+        proc.kill()
+    proc.join()
+    if row.get("status") == "crashed" and proc.exitcode:
+        row["error"] = f"exit code {proc.exitcode}"
+    return {**key, **row}
+
+
+# SUITE
+
+def fit_scaling(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """least-squares fit of log(wall_time) = exponent * log(edges) + c for each plugin and family"""
+    groups: Dict[Tuple[str, str, str], List[Tuple[int, float]]] = {}
+    for r in rows:
+        if r.get("status") == "ok" and r.get("wall_time", 0) > 0 and r.get("edges", 0) > 0:
+            groups.setdefault((r["kind"], r["plugin"], r["family"]), []).append((r["edges"], r["wall_time"]))
+
+    fits = []
+    for (kind, plugin, family), points in sorted(groups.items()):
+        if len({m for m, _ in points}) < 2:
+            continue
+        x = np.log([m for m, _ in points])
+        y = np.log([t for _, t in points])
+        exponent, intercept = np.polyfit(x, y, 1)
+        residual = y - (exponent * x + intercept)
+        total = np.sum((y - y.mean()) ** 2)
+        r2 = 1.0 - float(np.sum(residual ** 2) / total) if total > 0 else 1.0
+        fits.append({
+            "kind": kind, "plugin": plugin, "family": family,
+            "exponent": float(exponent), "intercept": float(intercept), "r2": r2, "points": len(points),
+        })
+    return fits
+
+
+def run_suite(config: BenchmarkConfig, log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """
+    runs every selected plugin over every family at increasing sizes; once a plugin fails or
+    exceeds a cap on a family, larger sizes of that family are skipped for it
+    """
+    plugins = [
+        (kind, name) for kind, name in registered_plugins(config.kinds)
+        if config.plugins is None or name in config.plugins
+    ]
+    rows: List[Dict[str, Any]] = []
+
+    for kind, plugin in plugins:
+        for family in config.families:
+            for size in sorted(config.sizes):
+                row = run_case_capped(kind, plugin, family, size, config)
+                rows.append(row)
+
+                detail = f"{row['wall_time']:.4f}s" if row["status"] == "ok" else row["status"]
+                log(f"[benchmark] {kind}:{plugin} on {family} m={size}: {detail}")
+
+                if row["status"] != "ok":
+                    break
+
+    return {
+        "schema": REPORT_SCHEMA,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "networkx": nx.__version__,
+            "cpu_count": os.cpu_count(),
+        },
+        "config": asdict(config),
+        "results": rows,
+        "fits": fit_scaling(rows),
+    }
+
+
+# COMPRESSION
+
+def run_compression(families: List[str], sizes: List[int], seed: int = 420, keep: float = 0.5,
+                    probes: int = 1000, log: Callable[[str], None] = print) -> List[Dict[str, Any]]:
+    """
+    compression ratio (against the binary edge format) and decode throughput of compressed
+    archives: every generated graph is archived on its own, then a random `keep` fraction of its
+    edges (a sparsified variant) both standalone and by reference to the parent archive
+    """
+    gateway = GraphGateway()
+    rng = np.random.default_rng(seed)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for family in families:
+            for size in sorted(sizes):
+                spec = FAMILIES[family](size, seed)
+                binary = os.path.join(tmp, f"{family}-{size}.gbin")
+                header = gateway.stream_to_binary(GraphSource(kind="generator", name=family, value=spec), binary)
+                _, records = open_binary(binary)
+                src, dst = np.array(records["u"]), np.array(records["v"])
+                mask = rng.random(len(src)) < keep
+
+                parent = os.path.join(tmp, f"{family}-{size}.gcz")
+                cases = [("graph", parent, src, dst, None),
+                         ("variant", os.path.join(tmp, "variant.gcz"), src[mask], dst[mask], None),
+                         ("variant_ref", os.path.join(tmp, "variant_ref.gcz"), src[mask], dst[mask], parent)]
+                for case, path, s, d, reference in cases:
+                    start = time.perf_counter()
+                    written = write_compressed(path, s, d, n=header.n, directed=header.directed, reference=reference)
+                    encode_time = time.perf_counter() - start
+
+                    archive = CompressedGraph(path)
+                    start = time.perf_counter()
+                    decoded = sum(len(chunk) for chunk, _, _ in archive.iter_chunks())
+                    decode_time = time.perf_counter() - start
+                    start = time.perf_counter()
+                    for u in rng.integers(0, max(header.n, 1), size=probes).tolist():
+                        archive.stored_neighbors(u)
+                    access_time = (time.perf_counter() - start) / probes
+
+                    raw_bytes = written.m * records.dtype.itemsize
+                    row = {
+                        "family": family, "size": size, "case": case, "nodes": written.n, "edges": written.m,
+                        "bytes": archive.nbytes, "bits_per_edge": 8 * archive.nbytes / max(written.m, 1),
+                        "ratio": raw_bytes / archive.nbytes,
+                        "reference_blocks": float((archive.modes == 1).mean()) if written.blocks else 0.0,
+                        "encode_time": encode_time,
+                        "decode_edges_per_second": decoded / decode_time if decode_time else 0.0,
+                        "random_access_seconds": access_time,
+                    }
+                    rows.append(row)
+                    log(f"[benchmark] compression {family} m={size} {case}: {row['bits_per_edge']:.2f} bits/edge, "
+                        f"x{row['ratio']:.1f}, {row['decode_edges_per_second'] / 1e6:.1f}M edges/s decoded")
+    return rows
+
+
+# REPORTS
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    if report.get("schema") != REPORT_SCHEMA:
+        raise ValueError(f"unsupported benchmark report schema in {path}: {report.get('schema')}")
+    return report
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    time_tolerance: float = 0.25,
+    exponent_tolerance: float = 0.15,
+    min_seconds: float = 1e-3,
+) -> List[Dict[str, Any]]:
+    """
+    flags cases that got slower than baseline * (1 + time_tolerance) (ignoring differences
+    below min_seconds), cases that stopped finishing, and fits whose exponent grew
+    """
+    def case_key(r):
+        return r["kind"], r["plugin"], r["family"], r["size"]
+
+    def fit_key(f):
+        return f["kind"], f["plugin"], f["family"]
+
+    regressions = []
+    before = {case_key(r): r for r in baseline["results"]}
+
+    for r in current["results"]:
+        b = before.get(case_key(r))
+        if b is None or b["status"] != "ok":
+            continue
+        if r["status"] != "ok":
+            regressions.append({"type": "status", "case": case_key(r), "baseline": "ok", "current": r["status"]})
+            continue
+        slower = r["wall_time"] - b["wall_time"]
+        if r["wall_time"] > b["wall_time"] * (1 + time_tolerance) and slower > min_seconds:
+            regressions.append({
+                "type": "time", "case": case_key(r),
+                "baseline": b["wall_time"], "current": r["wall_time"], "ratio": r["wall_time"] / b["wall_time"],
+            })
+
+    fits_before = {fit_key(f): f for f in baseline["fits"]}
+    for f in current["fits"]:
+        b = fits_before.get(fit_key(f))
+        if b is not None and f["exponent"] > b["exponent"] + exponent_tolerance:
+            regressions.append({
+                "type": "exponent", "case": fit_key(f), "baseline": b["exponent"], "current": f["exponent"],
+            })
+
+    return regressions
+
+
+# ENTRY POINT
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="scaling benchmark for sparsifiers, transforms and metrics")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the benchmark suite and write a json report")
+    run.add_argument("--out", default="results/benchmark.json")
+    run.add_argument("--families", nargs="+", default=sorted(FAMILIES))
+    run.add_argument("--kinds", nargs="+", default=list(KINDS), choices=KINDS)
+    run.add_argument("--plugins", nargs="+", default=None)
+    run.add_argument("--min-edges", type=float, default=1e3)
+    run.add_argument("--max-edges", type=float, default=1e5)
+    run.add_argument("--steps-per-decade", type=int, default=1)
+    run.add_argument("--time-cap", type=float, default=60.0, help="seconds per case")
+    run.add_argument("--memory-cap", type=float, default=4.0, help="GiB per case, 0 disables")
+    run.add_argument("--seed", type=int, default=420)
+
+    cmp = sub.add_parser("compare", help="compare two reports and flag regressions")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--time-tolerance", type=float, default=0.25)
+    cmp.add_argument("--exponent-tolerance", type=float, default=0.15)
+
+    comp = sub.add_parser("compression", help="compression ratio and decode throughput of compressed archives")
+    comp.add_argument("--out", default="results/compression.json")
+    comp.add_argument("--families", nargs="+", default=sorted(FAMILIES))
+    comp.add_argument("--min-edges", type=float, default=1e4)
+    comp.add_argument("--max-edges", type=float, default=1e6)
+    comp.add_argument("--keep", type=float, default=0.5, help="edge fraction of the sparsified variant")
+    comp.add_argument("--seed", type=int, default=420)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compression":
+        rows = run_compression(args.families, geometric_sizes(int(args.min_edges), int(args.max_edges)),
+                               seed=args.seed, keep=args.keep)
+        save_report({"schema": REPORT_SCHEMA, "created_at": datetime.now(timezone.utc).isoformat(),
+                     "compression": rows}, args.out)
+        print(f"[benchmark] report saved to {args.out}")
+        return 0
+
+    if args.command == "run":
+        config = BenchmarkConfig(
+            families=args.families,
+            sizes=geometric_sizes(int(args.min_edges), int(args.max_edges), args.steps_per_decade),
+            kinds=args.kinds,
+            plugins=args.plugins,
+            time_cap=args.time_cap,
+            memory_cap=int(args.memory_cap * (1 << 30)) or None,
+            seed=args.seed,
+        )
+        report = run_suite(config)
+        save_report(report, args.out)
+        for f in report["fits"]:
+            print(f"[benchmark] {f['kind']}:{f['plugin']} on {f['family']}: "
+                  f"time ~ m^{f['exponent']:.2f} (r2={f['r2']:.2f}, {f['points']} sizes)")
+        print(f"[benchmark] report saved to {args.out}")
+        return 0
+
+    regressions = compare_reports(
+        load_report(args.baseline), load_report(args.current),
+        time_tolerance=args.time_tolerance, exponent_tolerance=args.exponent_tolerance,
+    )
+    for r in regressions:
+        print(f"[benchmark] REGRESSION ({r['type']}) {r['case']}: {r['baseline']} -> {r['current']}")
+    print(f"[benchmark] {len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
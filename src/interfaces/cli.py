@@ -1,4 +1,266 @@
 from __future__ import annotations
 
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+try:
+    import tomllib
+except ImportError:  # python < 3.11
+    tomllib = None
+
+BASE_COLUMNS = [
+    "job", "graph", "algorithm", "params", "status", "error",
+    "nodes_before", "edges_before", "nodes_after", "edges_after", "execution_time", "timings",
+]
+
+
+@dataclass(frozen=True)
+class SweepJob:
+    index: int
+    graph: Dict[str, Any]
+    algorithm: str
+    params: Dict[str, Any]
+    metrics: List[str]
+
+
+@dataclass
+class SweepSpec:
+    """
+    graphs x algorithms x param grid x metrics, e.g.
+    {
+      "graphs": [{"name": "toy", "kind": "file", "value": "src/data/toy.edgelist", "weighted": true},
+                 {"name": "er", "kind": "generator", "value": {"model": "gnp", "n": 1000, "p": 0.01, "seed": 1}}],
+      "algorithms": ["identity_stub", {"name": "random", "grid": {"p": [0.1, 0.5], "seed": [1, 2]}}],
+      "metrics": ["diameter", "degree_distribution"]
+    }
+    """
+    graphs: List[Dict[str, Any]]
+    algorithms: List[Dict[str, Any]]
+    metrics: List[str] = field(default_factory=list)
+
+    @staticmethod
+    def load(path: str) -> "SweepSpec":
+        if path.endswith(".toml"):
+            if tomllib is None:
+                raise RuntimeError("toml sweep specs need python 3.11+, use json instead")
+            with open(path, "rb") as f:
+                raw = tomllib.load(f)
+        else:
+            with open(path, encoding="utf-8") as f:
+                raw = json.load(f)
+        return SweepSpec.from_dict(raw)
+
+    @staticmethod
+    def from_dict(raw: Dict[str, Any]) -> "SweepSpec":
+        graphs = raw.get("graphs") or []
+        algorithms = [{"name": a} if isinstance(a, str) else dict(a) for a in raw.get("algorithms") or []]
+        if not graphs or not algorithms:
+            raise ValueError("sweep spec needs at least one graph and one algorithm")
+        for g in graphs:
+            if "name" not in g:
+                raise ValueError(f"graph entry without a name: {g}")
+        return SweepSpec(graphs=list(graphs), algorithms=algorithms, metrics=list(raw.get("metrics") or []))
+
+    @staticmethod
+    def _param_grid(algorithm: Dict[str, Any]) -> List[Dict[str, Any]]:
+        fixed = dict(algorithm.get("params") or {})
+        grid = {k: v if isinstance(v, list) else [v] for k, v in (algorithm.get("grid") or {}).items()}
+        keys = sorted(grid)
+        return [{**fixed, **dict(zip(keys, combo))} for combo in itertools.product(*(grid[k] for k in keys))]
+
+    def __len__(self) -> int:
+        return len(self.graphs) * sum(len(self._param_grid(a)) for a in self.algorithms)
+
+    def jobs(self) -> Iterator[SweepJob]:
+        """lazy expansion, the full job list is never materialized"""
+        index = itertools.count()
+        for graph in self.graphs:
+            for algorithm in self.algorithms:
+                for params in self._param_grid(algorithm):
+                    yield SweepJob(next(index), graph, algorithm["name"], params, self.metrics)
+
+
+# WORKER
+# one ExperimentService per process; imported graphs are reused by later jobs on the same graph
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _worker_service():
+    if "service" not in _WORKER:
+        from src.application.experiment_service import ExperimentService
+        from src.infrastructure.persistence.stubs import InMemoryGraphRepository, InMemoryExperimentRepository
+        _WORKER["service"] = ExperimentService(InMemoryGraphRepository(), InMemoryExperimentRepository())
+        _WORKER["graphs"] = {}
+    return _WORKER["service"], _WORKER["graphs"]
+
+
+def run_job(job: SweepJob, source: Optional[Dict[str, Any]] = None, cache_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    runs one sweep job and turns its DTO into a flat result row (never raises). `source` overrides
+    where the graph is read from (e.g. a worker's local copy), `cache_key` what the imported graph
+    is cached under (default: its name)
+    """
+    from src.infrastructure.graph_gateway import GraphSource
+
+    row: Dict[str, Any] = {
+        "job": job.index, "graph": job.graph["name"], "algorithm": job.algorithm, "params": job.params,
+    }
+    service, graphs = _worker_service()
+    try:
+        cache_key = cache_key or job.graph["name"]
+        key = graphs.get(cache_key)
+        if key is None:
+            key = graphs[cache_key] = service.import_graph(GraphSource(**(source or job.graph)))
+
+        dto = service.run_experiment(key, job.algorithm, job.metrics, dict(job.params))
+
+        timings: Dict[str, float] = {}
+        for s in dto.spans:
+            timings[s.name] = timings.get(s.name, 0.0) + s.wall_time
+
+        row.update(
+            status="ok", error=None,
+            nodes_before=dto.nodes_before, edges_before=dto.edges_before,
+            nodes_after=dto.nodes_after, edges_after=dto.edges_after,
+            execution_time=dto.metadata.get("execution_time"), timings=timings,
+        )
+        for m, name in zip(dto.metric_results, job.metrics):
+            row[f"metric:{name}"] = dict(m.summary)
+
+        # only the originals are worth keeping around between jobs
+        for name in service.list_graphs():
+            if name not in graphs.values():
+                service.graph_repo.delete(name)
+    except Exception as e:
+        row.update(status="error", error=f"{type(e).__name__}: {e}")
+    return row
+
+
+# DRIVER
+
+class ProgressLine:
+    """live 'done/total | jobs/s | ETA' line on stderr"""
+    def __init__(self, total: int, stream: TextIO = sys.stderr, every: float = 0.5):
+        self.total = total
+        self.stream = stream
+        self.every = every
+        self.done = 0
+        self.failed = 0
+        self._start = time.perf_counter()
+        self._last = 0.0
+
+    def update(self, ok: bool, force: bool = False) -> None:
+        self.done += 1
+        self.failed += not ok
+        now = time.perf_counter()
+        if not force and now - self._last < self.every and self.done < self.total:
+            return
+        self._last = now
+        elapsed = now - self._start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.done) / rate if rate > 0 else float("inf")
+        eta_str = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta != float("inf") else "--:--:--"
+        self.stream.write(
+            f"\r[cli] {self.done}/{self.total} jobs | {rate:.2f} jobs/s | ETA {eta_str} | failed {self.failed}"
+        )
+        if self.done >= self.total:
+            self.stream.write("\n")
+        self.stream.flush()
+
+
+def run_sweep(spec: SweepSpec, sink, workers: int = 1, progress: Optional[ProgressLine] = None,
+              coordinator=None) -> int:
+    """
+    streams every finished row into the sink; with workers > 1 at most 2 * workers jobs are in
+    flight, so neither pending futures nor results pile up. with a (started) distributed
+    Coordinator the jobs go to its workers instead. returns the number of failed jobs
+    """
+    progress = progress or ProgressLine(len(spec))
+    failed = 0
+
+    def finish(row: Dict[str, Any]) -> None:
+        nonlocal failed
+        sink.write(row)
+        failed += row["status"] != "ok"
+        progress.update(row["status"] == "ok")
+
+    if coordinator is not None:
+        coordinator.run(spec.jobs(), finish, window=max(2 * workers, 16))
+        return failed
+
+    if workers <= 1:
+        for job in spec.jobs():
+            finish(run_job(job))
+        return failed
+
+    jobs = spec.jobs()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(run_job, job) for job in itertools.islice(jobs, 2 * workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(future.result())
+            for job in itertools.islice(jobs, len(done)):
+                pending.add(pool.submit(run_job, job))
+    return failed
+
+
 def run_cli(argv: list[str] | None = None) -> int:
-    raise SystemExit("CLI not implemented yet, use --smoke")
+    from src.infrastructure.result_sinks import SINK_FORMATS, open_sink
+
+    parser = argparse.ArgumentParser(description="run a sweep of graphs x algorithms x params x metrics")
+    parser.add_argument("spec", help="sweep spec file (.json or .toml)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1, in-process)")
+    parser.add_argument("--out", default="results/sweep.jsonl", help="result file, appended row by row")
+    parser.add_argument("--format", choices=SINK_FORMATS, default=None, help="default: from --out extension")
+    parser.add_argument("--quiet", action="store_true", help="silence pipeline logs on stdout")
+    parser.add_argument("--listen", default=None, metavar="HOST:PORT",
+                        help="distributed: serve the jobs to workers (python -m src.interfaces.distributed HOST:PORT); "
+                             "--workers local ones are started too")
+    parser.add_argument("--task-timeout", type=float, default=600.0, help="distributed: seconds before a task is re-queued")
+    parser.add_argument("--authkey", default=None,
+                        help="distributed: shared secret of the workers (default: $GSP_AUTHKEY; required unless "
+                             "listening on loopback, where a random one is generated)")
+    args = parser.parse_args(argv)
+
+    spec = SweepSpec.load(args.spec)
+    columns = BASE_COLUMNS + [f"metric:{m}" for m in spec.metrics]
+    print(f"[cli] {len(spec)} jobs, {args.workers} worker(s) -> {args.out}", file=sys.stderr)
+
+    def sweep(sink) -> int:
+        if args.listen is None:
+            return run_sweep(spec, sink, workers=args.workers)
+        from src.interfaces.distributed import Coordinator, parse_address, resolve_authkey, spawn_workers, stop_workers
+        address = parse_address(args.listen)
+        with Coordinator(address, resolve_authkey(address, args.authkey), task_timeout=args.task_timeout) as coordinator:
+            local = spawn_workers(coordinator.address, args.workers, coordinator.authkey)
+            try:
+                failed = run_sweep(spec, sink, workers=args.workers, coordinator=coordinator)
+            except BaseException:
+                stop_workers(local, timeout=0)
+                raise
+        stop_workers(local)
+        print(f"[cli] distributed: {coordinator.stats}", file=sys.stderr)
+        return failed
+
+    with open_sink(args.out, columns, args.format) as sink:
+        if args.quiet:
+            with open(os.devnull, "w") as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    failed = sweep(sink)
+                finally:
+                    sys.stdout = stdout
+        else:
+            failed = sweep(sink)
+
+    print(f"[cli] done: {len(spec) - failed} ok, {failed} failed -> {args.out}", file=sys.stderr)
+    return 1 if failed else 0
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import ipaddress
+import itertools
+import json
+import multiprocessing as mp
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict
+from multiprocessing.managers import BaseManager
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from src.domain.interning import LABELS_SUFFIX, label_sidecar
+from src.interfaces.cli import SweepJob, run_job
+
+# coordinator/worker backend for sweeps: the coordinator serves a task board over a
+# multiprocessing.managers socket, workers (local processes or other machines) lease
+# (graph, algorithm, params, metrics) tasks from it and post the result rows back. a lease that
+# is not completed within the task timeout goes back to the queue. graph files are shipped on
+# demand and cached by workers under their content hash, so each host fetches a graph once.
+# the board speaks pickle: whoever knows the authkey can run code on the coordinator, so there is
+# no built-in key. a coordinator reachable from other hosts needs $GSP_AUTHKEY (or --authkey)
+
+AUTHKEY_ENV = "GSP_AUTHKEY"
+FILE_KINDS = ("file", "binary", "compressed")
+CLOSED = "closed"
+PAYLOAD_BLOCK = 1 << 20
+WORKER_POLL = 0.2  # seconds an idle worker waits before asking again
+
+Address = Tuple[str, int]
+
+
+def is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def resolve_authkey(address: Address, authkey: Optional[str] = None) -> bytes:
+    """
+    the shared secret of a coordinator: --authkey, else $GSP_AUTHKEY, else (loopback only) a
+    random one that is printed for the workers. refuses to serve other hosts without a chosen key
+    """
+    authkey = authkey or os.environ.get(AUTHKEY_ENV)
+    if authkey:
+        return authkey.encode()
+    if not is_loopback(address[0]):
+        raise ValueError(f"refusing to listen on {address[0]} without a shared secret: "
+                         f"set ${AUTHKEY_ENV} or pass --authkey (the task board runs pickled data)")
+    authkey = secrets.token_hex(16)
+    print(f"[COORDINATOR] generated authkey {authkey} (workers: {AUTHKEY_ENV}={authkey})", file=sys.stderr)
+    return authkey.encode()
+
+
+def content_hash(graph: Dict[str, Any]) -> str:
+    """
+    hash of what a graph entry loads: file bytes (and label table) for file kinds, the spec for
+    generators, plus the flags changing how it is read (the name does not count)
+    """
+    digest = hashlib.sha256(json.dumps(
+        {"kind": graph.get("kind"), "directed": graph.get("directed", False), "weighted": graph.get("weighted", False)},
+        sort_keys=True).encode())
+    if graph.get("kind") in FILE_KINDS:
+        sidecar = label_sidecar(graph["value"])
+        for path in [graph["value"]] + ([sidecar] if os.path.exists(sidecar) else []):
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(PAYLOAD_BLOCK), b""):
+                    digest.update(block)
+    else:
+        digest.update(json.dumps(graph.get("value"), sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+# TASK BOARD
+
+class TaskBoard:
+    """
+    [COORDINATOR] state shared with the workers: queued tasks, leases with deadlines, finished
+    rows and the graph files workers may fetch. every method is called from the manager's
+    connection threads, hence the lock
+    """
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._leases: Dict[int, Tuple[Dict[str, Any], str, float]] = {}
+        self._done: set = set()
+        self._rows: List[Dict[str, Any]] = []
+        self._files: Dict[str, str] = {}
+        self._closed = False
+        self.requeued = 0
+        self.duplicates = 0
+        self.payloads = 0
+
+    def submit(self, task: Dict[str, Any]) -> None:
+        with self._lock:
+            self._queue.append(task)
+
+    def publish(self, digest: str, path: str) -> None:
+        with self._lock:
+            self._files[digest] = path
+
+    def take(self, worker: str) -> Optional[Dict[str, Any] | str]:
+        """next task for `worker`, None when there is nothing to do yet, CLOSED once the sweep is over"""
+        with self._lock:
+            now = time.monotonic()
+            for task_id, (task, _, deadline) in list(self._leases.items()):
+                if deadline < now:
+                    # presumed lost with its worker: first in line again
+                    del self._leases[task_id]
+                    self._queue.appendleft(task)
+                    self.requeued += 1
+            if self._queue:
+                task = self._queue.popleft()
+                self._leases[task["id"]] = (task, worker, now + self.timeout)
+                return task
+            return CLOSED if self._closed else None
+
+    def complete(self, worker: str, task_id: int, row: Dict[str, Any]) -> bool:
+        """stores the row of a task; a late copy of an already finished (requeued) task is dropped"""
+        with self._lock:
+            self._leases.pop(task_id, None)
+            if task_id in self._done:
+                self.duplicates += 1
+                return False
+            self._done.add(task_id)
+            self._queue = deque(t for t in self._queue if t["id"] != task_id)
+            self._rows.append({**row, "worker": worker})
+            return True
+
+    def drain(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows, self._rows = self._rows, []
+            return rows
+
+    def has(self, digest: str) -> bool:
+        with self._lock:
+            return digest in self._files
+
+    def payload(self, digest: str, offset: int) -> bytes:
+        """one block of a published graph file, from `offset` (empty past the end)"""
+        with self._lock:
+            path = self._files[digest]
+            if offset == 0:
+                self.payloads += 1
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(PAYLOAD_BLOCK)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"queued": len(self._queue), "leased": len(self._leases), "done": len(self._done),
+                    "requeued": self.requeued, "duplicates": self.duplicates, "payloads": self.payloads}
+
+
+_BOARD: Optional[TaskBoard] = None
+
+
+def _init_board(timeout: float) -> None:
+    global _BOARD
+    _BOARD = TaskBoard(timeout)
+
+
+def _get_board() -> TaskBoard:
+    return _BOARD
+
+
+class BoardManager(BaseManager):
+    pass
+
+
+BoardManager.register("board", callable=_get_board)
+
+
+# COORDINATOR
+
+class Coordinator:
+    """
+    runs the task board in a manager process listening on `address` (port 0 picks a free one,
+    see .address), authenticated with `authkey` (see resolve_authkey when None). jobs are fed through a bounded window, result rows come back through
+    `finish` as they arrive
+    """
+    def __init__(self, address: Address = ("127.0.0.1", 0), authkey: Optional[bytes] = None,
+                 task_timeout: float = 600.0, poll: float = 0.05):
+        authkey = authkey or resolve_authkey(address)
+        self.authkey = authkey
+        self.task_timeout = task_timeout
+        self.poll = poll
+        self._manager = BoardManager(address=address, authkey=authkey)
+        self.address: Optional[Address] = None
+        self.board = None
+        self.stats: Dict[str, int] = {}
+
+    def __enter__(self) -> "Coordinator":
+        self._manager.start(initializer=_init_board, initargs=(self.task_timeout,))
+        self.address = self._manager.address
+        self.board = self._manager.board()
+        print(f"[COORDINATOR] task board listening on {self.address[0]}:{self.address[1]}", file=sys.stderr)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self.board is not None:
+            self.stats = self.board.stats()
+            self.board.close()
+            time.sleep(2 * WORKER_POLL)  # lets idle workers see the board close before it goes away
+        self._manager.shutdown()
+
+    def run(self, jobs: Iterable[SweepJob], finish: Callable[[Dict[str, Any]], None], window: int = 64) -> None:
+        """hands out every job, at most `window` queued or running at a time"""
+        digests: Dict[str, str] = {}
+        jobs = iter(jobs)
+        outstanding = 0
+        while True:
+            for job in itertools.islice(jobs, max(0, window - outstanding)):
+                name = job.graph["name"]
+                if name not in digests:
+                    digests[name] = content_hash(job.graph)
+                    if job.graph.get("kind") in FILE_KINDS:
+                        self.board.publish(digests[name], os.path.abspath(job.graph["value"]))
+                        if os.path.exists(label_sidecar(job.graph["value"])):
+                            self.board.publish(digests[name] + LABELS_SUFFIX, os.path.abspath(label_sidecar(job.graph["value"])))
+                self.board.submit({"id": job.index, "job": asdict(job), "digest": digests[name]})
+                outstanding += 1
+            if outstanding == 0:
+                return
+            rows = self.board.drain()
+            for row in rows:
+                finish(row)
+            outstanding -= len(rows)
+            if not rows:
+                time.sleep(self.poll)
+
+
+# WORKER
+
+class GraphCache:
+    """worker-side graph files, one per content hash; fetched from the coordinator when missing"""
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def source(self, graph: Dict[str, Any], digest: str, board) -> Dict[str, Any]:
+        if graph.get("kind") not in FILE_KINDS:
+            return graph  # generators are rebuilt from their spec
+        suffix = os.path.splitext(graph["value"])[1]
+        path = os.path.join(self.directory, digest + suffix)
+        if not os.path.exists(path):
+            if board.has(digest + LABELS_SUFFIX):  # the label table first: a visible graph file is complete
+                self._fetch(board, digest + LABELS_SUFFIX, label_sidecar(path))
+            self._fetch(board, digest, path)
+        return {**graph, "value": path}
+
+    @staticmethod
+    def _fetch(board, digest: str, path: str) -> None:
+        partial = f"{path}.{os.getpid()}.part"
+        with open(partial, "wb") as f:
+            while True:
+                block = board.payload(digest, f.tell())
+                if not block:
+                    break
+                f.write(block)
+        os.replace(partial, path)  # atomic: workers sharing the directory never see half a file
+
+
+def run_worker(address: Address, authkey: bytes, cache_dir: Optional[str] = None,
+               poll: float = WORKER_POLL, name: Optional[str] = None) -> int:
+    """
+    [WORKER] leases tasks until the coordinator closes the board (or goes away); returns the
+    number of tasks completed. graphs imported once are reused by later tasks with the same hash
+    """
+    manager = BoardManager(address=tuple(address), authkey=authkey)
+    manager.connect()
+    board = manager.board()
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    cache = GraphCache(cache_dir or os.path.join(os.path.expanduser("~"), ".cache", "gsp-graphs"))
+    completed = 0
+    try:
+        while True:
+            task = board.take(name)
+            if task == CLOSED:
+                return completed
+            if task is None:
+                time.sleep(poll)
+                continue
+            job = SweepJob(**task["job"])
+            try:
+                source = cache.source(job.graph, task["digest"], board)
+                row = run_job(job, source=source, cache_key=task["digest"])
+            except Exception as e:  # fetching failed, the row still goes back
+                row = {"job": job.index, "graph": job.graph["name"], "algorithm": job.algorithm,
+                       "params": job.params, "status": "error", "error": f"{type(e).__name__}: {e}"}
+            board.complete(name, task["id"], row)
+            completed += 1
+    except (EOFError, ConnectionError, BrokenPipeError):
+        return completed  # coordinator shut down
+
+
+def spawn_workers(address: Address, count: int, authkey: bytes,
+                  cache_dir: Optional[str] = None) -> List[mp.Process]:
+    """
+    local worker processes, e.g. to test the protocol on localhost. not daemonic, since jobs may
+    open process pools of their own: stop them with stop_workers()
+    """
+    workers = []
+    for i in range(count):
+        proc = mp.Process(target=_quiet_worker, args=(address, authkey, cache_dir, f"local-{i}"))
+        proc.start()
+        workers.append(proc)
+    return workers
+
+
+def stop_workers(workers: List[mp.Process], timeout: float = 10.0) -> None:
+    """waits for workers to leave a closed board, terminates the ones still running after `timeout`"""
+    deadline = time.monotonic() + timeout
+    for proc in workers:
+        proc.join(timeout=max(0.0, deadline - time.monotonic()))
+    for proc in workers:
+        if proc.is_alive():
+            proc.terminate()
+            proc.join()
+
+
+def _quiet_worker(address: Address, authkey: bytes, cache_dir: Optional[str], name: str) -> None:
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        run_worker(address, authkey, cache_dir, name=name)
+
+
+def parse_address(text: str) -> Address:
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+# ENTRY POINT
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="sweep worker: leases tasks from a coordinator (main.py --batch SPEC --listen HOST:PORT)")
+    parser.add_argument("connect", help="coordinator address, host:port")
+    parser.add_argument("--cache", default=None, help="graph cache directory (default: ~/.cache/gsp-graphs)")
+    parser.add_argument("--authkey", default=None, help=f"shared secret (default: ${AUTHKEY_ENV})")
+    args = parser.parse_args(argv)
+
+    authkey = args.authkey or os.environ.get(AUTHKEY_ENV)
+    if not authkey:
+        parser.error(f"no shared secret: set ${AUTHKEY_ENV} or pass --authkey (printed by the coordinator)")
+    done = run_worker(parse_address(args.connect), authkey.encode(), args.cache)
+    print(f"[WORKER] {done} task(s) completed", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import Any, Hashable, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+
+def edge_index_arrays(G: nx.Graph, nodes: Optional[Sequence[Hashable]] = None) -> Tuple[List[Any], np.ndarray, np.ndarray]:
+    """(node list, src, dst) with endpoints as positions in the node list"""
+    nodes = list(G.nodes()) if nodes is None else list(nodes)
+    index = {v: i for i, v in enumerate(nodes)}
+    m = G.number_of_edges()
+    src = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int64, count=m)
+    dst = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int64, count=m)
+    return nodes, src, dst
+
+
+# MULTILEVEL FORCE-DIRECTED LAYOUT
+
+def _match(n: int, src: np.ndarray, dst: np.ndarray, rng: np.random.Generator, rounds: int = 3) -> np.ndarray:
+    """
+    handshake matching: every free node proposes its incident edge with the highest random
+    priority, edges proposed by both endpoints are contracted. returns fine -> coarse ids
+    """
+    mate = np.full(n, -1, dtype=np.int64)
+    for _ in range(rounds):
+        free = (mate[src] < 0) & (mate[dst] < 0) & (src != dst)
+        if not free.any():
+            break
+        s, d = src[free], dst[free]
+        priority = rng.random(s.size)
+        best = np.full(n, -1.0)
+        np.maximum.at(best, s, priority)
+        np.maximum.at(best, d, priority)
+        chosen = (best[s] == priority) & (best[d] == priority)
+        mate[s[chosen]] = d[chosen]
+        mate[d[chosen]] = s[chosen]
+
+    leader = np.where(mate >= 0, np.minimum(np.arange(n), mate), np.arange(n))
+    _, mapping = np.unique(leader, return_inverse=True)
+    return mapping
+
+
+def _force_iterations(pos: np.ndarray, src: np.ndarray, dst: np.ndarray, iterations: int,
+                      temperature: float, grid: int, chunk: int = 1 << 14) -> np.ndarray:
+    """
+    fruchterman-reingold steps; edge attraction is exact, node repulsion is approximated by the
+    mass centroids of a grid x grid partition of the bounding box (barnes-hut style far field),
+    so one iteration is O(m + n * grid^2) instead of O(n^2)
+    """
+    n = len(pos)
+    if n <= 1:
+        return pos
+    k = np.sqrt(1.0 / n)
+
+    for it in range(iterations):
+        disp = np.zeros_like(pos)
+
+        # repulsion from cell centroids
+        lo, hi = pos.min(axis=0), pos.max(axis=0)
+        span = np.maximum(hi - lo, 1e-9)
+        cell = np.minimum(((pos - lo) / span * grid).astype(np.int64), grid - 1)
+        cid = cell[:, 0] * grid + cell[:, 1]
+        mass = np.bincount(cid, minlength=grid * grid).astype(np.float64)
+        occupied = mass > 0
+        cx = np.bincount(cid, weights=pos[:, 0], minlength=grid * grid)[occupied] / mass[occupied]
+        cy = np.bincount(cid, weights=pos[:, 1], minlength=grid * grid)[occupied] / mass[occupied]
+        centroids = np.stack([cx, cy], axis=1)
+        mass = mass[occupied]
+
+        for i0 in range(0, n, chunk):
+            delta = pos[i0:i0 + chunk, None, :] - centroids[None, :, :]
+            dist2 = np.maximum(np.einsum("ijk,ijk->ij", delta, delta), (0.01 * k) ** 2)
+            disp[i0:i0 + chunk] += np.einsum("ij,ijk->ik", k * k * mass / dist2, delta)
+
+        # attraction along edges
+        delta = pos[dst] - pos[src]
+        dist = np.maximum(np.linalg.norm(delta, axis=1), 1e-9)
+        pull = delta * (dist / k)[:, None]
+        for axis in range(2):
+            disp[:, axis] += np.bincount(src, weights=pull[:, axis], minlength=n)
+            disp[:, axis] -= np.bincount(dst, weights=pull[:, axis], minlength=n)
+
+        # displacement capped by a linearly cooling temperature
+        t = temperature * (1.0 - it / iterations)
+        length = np.maximum(np.linalg.norm(disp, axis=1), 1e-9)
+        pos = pos + disp / length[:, None] * np.minimum(length, t)[:, None]
+
+    return pos
+
+
+def multilevel_layout(n: int, src: np.ndarray, dst: np.ndarray, seed: int = 420, coarsest: int = 100,
+                      iterations: int = 50, refine_iterations: int = 15, grid: int = 16) -> np.ndarray:
+    """
+    coarsens the graph by repeated matchings down to ~`coarsest` nodes, lays the coarsest graph
+    out, then interpolates positions back level by level with a few refining force iterations.
+    returns an (n, 2) array scaled into [-1, 1]
+    """
+    rng = np.random.default_rng(seed)
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+
+    levels: List[Tuple[int, np.ndarray, np.ndarray, np.ndarray]] = []
+    cur_n, cur_src, cur_dst = n, src, dst
+    while cur_n > coarsest:
+        mapping = _match(cur_n, cur_src, cur_dst, rng)
+        next_n = int(mapping.max()) + 1 if cur_n else 0
+        if next_n > 0.95 * cur_n:  # matching stalled (e.g. stars, isolated nodes)
+            break
+        levels.append((cur_n, cur_src, cur_dst, mapping))
+        a, b = mapping[cur_src], mapping[cur_dst]
+        key = np.unique(np.minimum(a, b) * next_n + np.maximum(a, b))
+        cur_n, cur_src, cur_dst = next_n, key // next_n, key % next_n
+        keep = cur_src != cur_dst
+        cur_src, cur_dst = cur_src[keep], cur_dst[keep]
+
+    pos = rng.random((cur_n, 2))
+    pos = _force_iterations(pos, cur_src, cur_dst, iterations, temperature=0.1, grid=grid)
+
+    for level_n, level_src, level_dst, mapping in reversed(levels):
+        scale = np.sqrt(1.0 / level_n)
+        pos = pos[mapping] + rng.normal(scale=0.1 * scale, size=(level_n, 2))
+        pos = _force_iterations(pos, level_src, level_dst, refine_iterations, temperature=2 * scale, grid=grid)
+
+    if len(pos):
+        pos = pos - pos.mean(axis=0)
+        pos = pos / max(np.abs(pos).max(), 1e-9)
+    return pos
+
+
+# RASTERIZATION
+
+def rasterize_edges(pos: np.ndarray, src: np.ndarray, dst: np.ndarray, resolution: int,
+                    bounds: Tuple[float, float, float, float], chunk: int = 1 << 16,
+                    max_samples: int = 256) -> np.ndarray:
+    """
+    accumulates points sampled along every edge (about one per pixel of its length) into a
+    resolution x resolution histogram; returns counts indexed as image[y, x]
+    """
+    x0, x1, y0, y1 = bounds
+    image = np.zeros((resolution, resolution), dtype=np.float64)
+    px = resolution / max(x1 - x0, 1e-9)
+
+    for i0 in range(0, len(src), chunk):
+        a, b = pos[src[i0:i0 + chunk]], pos[dst[i0:i0 + chunk]]
+        samples = np.clip(np.ceil(np.linalg.norm((b - a) * px, axis=1)), 2, max_samples).astype(np.int64)
+        edge = np.repeat(np.arange(len(a)), samples)
+        t = (np.arange(samples.sum()) - np.repeat(np.cumsum(samples) - samples, samples)) / np.repeat(samples - 1, samples)
+        points = a[edge] + (b[edge] - a[edge]) * t[:, None]
+        h, _, _ = np.histogram2d(points[:, 1], points[:, 0], bins=resolution, range=[[y0, y1], [x0, x1]])
+        image += h
+
+    return image
@@ -1,6 +1,5 @@
 from __future__ import annotations
 import os
-import networkx as nx
 
 from src.application.experiment_service import ExperimentService
 from src.infrastructure.graph_gateway import GraphSource
@@ -21,9 +20,9 @@ def run_smoke() -> None:
         print(f"[smoke] loading from file: {data_path}")
         source = GraphSource(kind="file", value=data_path, name="toy-graph")
     else:
-        print("[smoke] file not found, using in-memory fallback")
-        g = nx.erdos_renyi_graph(20, 0.3, seed=42)
-        source = GraphSource(kind="memory", value=g, name="mock-demo-graph")
+        print("[smoke] file not found, using generated fallback")
+        spec = {"model": "gnp", "n": 20, "p": 0.3, "seed": 42}
+        source = GraphSource(kind="generator", value=spec, name="mock-demo-graph")
 
     graph_key = service.import_graph(source)
     print(f"\n[smoke] graph imported successfully: '{graph_key}'")
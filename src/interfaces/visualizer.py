@@ -1,29 +1,136 @@
-import networkx as nx
-import matplotlib.pyplot as plt
+import hashlib
 import os
 
+import matplotlib
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+
+from src.interfaces.layout import edge_index_arrays, multilevel_layout, rasterize_edges
+
+LAYOUT_CACHE_DIR = os.path.join("results", ".layout_cache")
+SPRING_NODE_THRESHOLD = 2_000   # above this the multilevel layout replaces nx.spring_layout
+RASTER_EDGE_THRESHOLD = 20_000  # above this edges are rasterized instead of drawn as artists
+SCATTER_NODE_THRESHOLD = 50_000
+
+
+def graph_fingerprint(G) -> str:
+    """content hash of the node list and edge list (in iteration order)"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(b"D" if G.is_directed() else b"U")
+    nodes, src, dst = edge_index_arrays(G)
+    h.update("\n".join(map(repr, nodes)).encode())
+    h.update(src.tobytes())
+    h.update(dst.tobytes())
+    return h.hexdigest()
+
+
+def cached_layout(G, cache_dir: str = LAYOUT_CACHE_DIR, seed: int = 420) -> dict:
+    """
+    node -> (x, y) positions, computed once per graph content and cached on disk;
+    small graphs use nx.spring_layout, large ones the multilevel layout
+    """
+    path = os.path.join(cache_dir, f"{graph_fingerprint(G)}_{seed}.npy") if cache_dir else None
+    nodes = list(G.nodes())
+
+    if path and os.path.exists(path):
+        coords = np.load(path)
+        if len(coords) == len(nodes):
+            print(f"[visualizer] layout loaded from cache {path}")
+            return dict(zip(nodes, coords))
+
+    if len(nodes) <= SPRING_NODE_THRESHOLD:
+        pos = nx.spring_layout(G, seed=seed, k=1.5)
+        coords = np.array([pos[v] for v in nodes]) if nodes else np.empty((0, 2))
+    else:
+        _, src, dst = edge_index_arrays(G, nodes)
+        coords = multilevel_layout(len(nodes), src, dst, seed=seed)
+
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(path, coords)
+    return dict(zip(nodes, coords))
+
+
+def _removed_edges(original_nx, modified_nx) -> list:
+    return [(u, v) for u, v in original_nx.edges() if not modified_nx.has_edge(u, v)]
+
+
+def _bounds(coords: np.ndarray, margin: float = 0.05):
+    if len(coords) == 0:
+        return -1.0, 1.0, -1.0, 1.0
+    lo, hi = coords.min(axis=0), coords.max(axis=0)
+    pad = np.maximum(hi - lo, 1e-9) * margin
+    return lo[0] - pad[0], hi[0] + pad[0], lo[1] - pad[1], hi[1] + pad[1]
+
+
+def _draw_raster(ax, G, pos: dict, layers, resolution: int) -> None:
+    """
+    layers: [(edge list, rgb color)]; every layer is rasterized into a log-scaled density and
+    alpha-composited, so drawing cost no longer depends on the number of edge artists
+    """
+    nodes = list(G.nodes())
+    index = {v: i for i, v in enumerate(nodes)}
+    coords = np.array([pos[v] for v in nodes]) if nodes else np.empty((0, 2))
+    bounds = _bounds(coords)
+
+    canvas = np.ones((resolution, resolution, 3))
+    for edges, color in layers:
+        if not edges:
+            continue
+        src = np.fromiter((index[u] for u, _ in edges), dtype=np.int64, count=len(edges))
+        dst = np.fromiter((index[v] for _, v in edges), dtype=np.int64, count=len(edges))
+        density = np.log1p(rasterize_edges(coords, src, dst, resolution, bounds))
+        alpha = (density / max(density.max(), 1e-9))[:, :, None]
+        canvas = canvas * (1 - alpha) + np.asarray(matplotlib.colors.to_rgb(color)) * alpha
+
+    ax.imshow(canvas, origin="lower", extent=bounds, interpolation="nearest", aspect="auto")
+    if len(nodes) <= SCATTER_NODE_THRESHOLD:
+        ax.scatter(coords[:, 0], coords[:, 1], s=1, c="deeppink", alpha=0.5, linewidths=0, rasterized=True)
+    ax.set_axis_off()
+
+
+def _draw_panel(ax, G, pos: dict, layers, node_color: str, resolution: int, raster_threshold: int) -> None:
+    if sum(len(edges) for edges, _ in layers) > raster_threshold:
+        _draw_raster(ax, G, pos, layers, resolution)
+        return
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_size=20, node_color=node_color, alpha=0.5)
+    for edges, color in layers:
+        nx.draw_networkx_edges(G, pos, edgelist=edges, ax=ax, edge_color=color, alpha=0.5)
+    ax.set_axis_off()
+
 
-def save_comparison_plot(original_nx, modified_nx, title: str, filename: str):
-    plt.figure(figsize=(10, 5))
+def save_comparison_plot(original_nx, modified_nx, title: str, filename: str, pos: dict = None,
+                         cache_dir: str = LAYOUT_CACHE_DIR, raster_threshold: int = RASTER_EDGE_THRESHOLD,
+                         resolution: int = 800):
+    """
+    side-by-side plot of the original and the modified graph on the original's (cached) layout;
+    when the modified graph lives on the original's nodes, edges removed by the reduction are
+    drawn in a contrasting color
+    """
+    pos = pos or cached_layout(original_nx, cache_dir=cache_dir)
+    fig, (left, right) = plt.subplots(1, 2, figsize=(10, 5))
 
     # plotting original
-    plt.subplot(1, 2, 1)
-    plt.title(f"original\n(|V|={len(original_nx)}, |E|={len(original_nx.edges)})")
-    pos = nx.spring_layout(original_nx, seed=420, k=1.5)
-    nx.draw(original_nx, pos, node_size=20, node_color='deeppink', edge_color='pink', alpha=0.5)
+    left.set_title(f"original\n(|V|={len(original_nx)}, |E|={len(original_nx.edges)})")
+    _draw_panel(left, original_nx, pos, [(list(original_nx.edges()), "pink")], "deeppink",
+                resolution, raster_threshold)
 
     # plotting modified
-    plt.subplot(1, 2, 2)
-    plt.title(f"modified\n(|V|={len(modified_nx)}, |E|={len(modified_nx.edges)})")
-    if set(modified_nx.nodes()).issubset(set(original_nx.nodes())):
-        nx.draw(modified_nx, pos, node_size=20, node_color='hotpink', edge_color='lightpink', alpha=0.5)
+    if set(modified_nx.nodes()).issubset(pos.keys()):
+        removed = _removed_edges(original_nx, modified_nx)
+        right.set_title(f"modified\n(|V|={len(modified_nx)}, |E|={len(modified_nx.edges)}, removed={len(removed)})")
+        _draw_panel(right, original_nx, pos, [(removed, "lightsteelblue"), (list(modified_nx.edges()), "hotpink")],
+                    "hotpink", resolution, raster_threshold)
     else:
-        nx.draw(modified_nx, node_size=20, node_color='deeppink')
+        right.set_title(f"modified\n(|V|={len(modified_nx)}, |E|={len(modified_nx.edges)})")
+        _draw_panel(right, modified_nx, cached_layout(modified_nx, cache_dir=cache_dir),
+                    [(list(modified_nx.edges()), "lightpink")], "deeppink", resolution, raster_threshold)
 
-    plt.suptitle(title)
+    fig.suptitle(title)
 
     os.makedirs("results", exist_ok=True)
     out_path = f"results/{filename}"
-    plt.savefig(out_path)
-    plt.close()
-    print(f"[visualizer] comparison saved to {out_path}")
\ No newline at end of file
+    fig.savefig(out_path)
+    plt.close(fig)
+    print(f"[visualizer] comparison saved to {out_path}")
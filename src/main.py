@@ -1,6 +1,5 @@
 import sys
 import argparse
-from src.interfaces.smoke import run_smoke
 
 
 def main(args=None):
@@ -9,15 +8,24 @@ def main(args=None):
 
     parser = argparse.ArgumentParser(description="graph sparsification pipeline")
     parser.add_argument("--smoke", action="store_true", help="run a quick smoke test")
+    parser.add_argument("--batch", metavar="SPEC", help="run a sweep spec (see src/interfaces/cli.py for options)")
 
-    parsed_args = parser.parse_args(args)
+    parsed_args, rest = parser.parse_known_args(args)
 
     if parsed_args.smoke:
         print("running smoke test...")
+        from src.interfaces.smoke import run_smoke  # deferred: keeps startup free of networkx/numpy
         run_smoke()
         return 0
 
-    print("no arguments provided, try --smoke")
+    if parsed_args.batch:
+        from src.interfaces.cli import run_cli
+        return run_cli([parsed_args.batch, *rest])
+
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+
+    print("no arguments provided, try --smoke or --batch SPEC")
     return 0
 
 
@@ -0,0 +1,47 @@
+from __future__ import annotations
+import copy
+
+from src.interfaces.benchmark import BenchmarkConfig, compare_reports, geometric_sizes, run_compression, run_suite
+
+
+def test_suite_fits_and_flags_regressions():
+    # 1. tiny in-process run
+    config = BenchmarkConfig(
+        families=["gnp"],
+        sizes=[200, 800],
+        kinds=["sparsifier", "metric"],
+        plugins=["random", "mst", "degree_distribution"],
+        isolate=False,
+    )
+    report = run_suite(config, log=lambda _: None)
+
+    statuses = {(r["plugin"], r["size"]): r["status"] for r in report["results"]}
+    assert statuses[("random", 800)] == "ok"
+    assert statuses[("mst", 200)] == "error"
+    assert ("mst", 800) not in statuses  # larger sizes are skipped after a failure
+    assert {f["plugin"] for f in report["fits"]} == {"random", "degree_distribution"}
+
+    # 2. comparison against itself is clean, a slowed-down copy is flagged
+    assert compare_reports(report, report) == []
+
+    slower = copy.deepcopy(report)
+    for r in slower["results"]:
+        if r["status"] == "ok":
+            r["wall_time"] = r["wall_time"] * 3 + 0.01
+    slower["fits"][0]["exponent"] += 1.0
+
+    types = {r["type"] for r in compare_reports(report, slower)}
+    assert types == {"time", "exponent"}
+
+
+def test_geometric_sizes():
+    assert geometric_sizes(1_000, 10_000_000) == [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+    assert geometric_sizes(100, 10_000, steps_per_decade=2) == [100, 316, 1_000, 3_162, 10_000]
+
+
+def test_compression_benchmark_reports_ratio_and_throughput():
+    rows = run_compression(["rmat"], [4_000], probes=10, log=lambda _: None)
+    by_case = {r["case"]: r for r in rows}
+    assert set(by_case) == {"graph", "variant", "variant_ref"}
+    assert all(r["ratio"] > 1 and r["decode_edges_per_second"] > 0 for r in rows)
+    assert by_case["variant_ref"]["bytes"] < by_case["variant"]["bytes"]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import multiprocessing as mp
+
+import networkx as nx
+import numpy as np
+
+from src.domain.centrality import estimate_betweenness, kendall_tau, sample_size, vertex_diameter_bound
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.registry import MetricRegistry
+
+
+def test_sampled_betweenness_within_epsilon_and_worker_independent():
+    # 1. setup
+    nx_g = nx.gnm_random_graph(200, 600, seed=3)
+    csr = Graph.from_networkx(nx_g).to_csr()
+    epsilon = 0.03
+
+    inline = estimate_betweenness(csr, epsilon=epsilon, delta=0.1, workers=1)
+    pooled = estimate_betweenness(csr, epsilon=epsilon, delta=0.1, workers=2)
+
+    # 2. same seeded blocks whatever the worker count; RK normalizes over n(n-1) ordered pairs
+    assert np.array_equal(inline.values, pooled.values)
+    assert inline.samples == sample_size(inline.vertex_diameter, epsilon, 0.1)
+    exact = nx.betweenness_centrality(nx_g, normalized=True)
+    n = csr.n
+    truth = np.array([exact[v] for v in csr.nodes]) * (n - 2) / n
+    assert np.abs(inline.values - truth).max() <= epsilon
+
+
+def test_kendall_tau_ties_and_order():
+    assert kendall_tau(np.array([1.0, 2.0, 3.0]), np.array([10.0, 20.0, 30.0])) == 1.0
+    assert kendall_tau(np.array([1.0, 2.0, 3.0]), np.array([3.0, 2.0, 1.0])) == -1.0
+
+
+def test_betweenness_metric_compares_top_k_with_original():
+    # 1. setup: two 10-cliques joined by a 5-node path, which carries every cross pair
+    G = Graph.from_networkx(nx.barbell_graph(10, 5), name="barbell")
+    bridge = {9, 10, 11, 12, 13, 14, 15, 20}  # path nodes and the two clique ends it attaches to
+    params = RunParams({"epsilon": 0.05, "top_k": 7, "seed": 1})
+
+    same = MetricRegistry.get("betweenness").compute(G.view(), params).summary
+    assert same["top_k_kendall_tau"] == 1.0 and same["top_k_overlap"] == 1.0
+
+    # 2. a reduction thinning the cliques only: the bridge still tops the ranking
+    inside = np.array([not ({u, v} & set(range(10, 15))) and (u + v) % 2 == 1 for u, v in G.edges()])
+    H = G.view(~inside | (np.arange(G.edge_count) % 3 == 0))
+    result = MetricRegistry.get("betweenness").compute(H, params)
+    assert set(result.artifacts["top_nodes"]) <= bridge
+    assert result.summary["top_k_overlap"] == 1.0
+
+    # 3. an explicit reference for a graph that is not a view
+    exact = max(nx.betweenness_centrality(nx.barbell_graph(10, 5)).values())
+    standalone = Graph.from_networkx(H.to_networkx(), name="copy")
+    summary = MetricRegistry.get("betweenness").compute(standalone, RunParams({**params.values, "reference": G})).summary
+    assert abs(summary["original_max"] - exact * (G.node_count - 2) / G.node_count) <= 0.05
+
+
+def test_vertex_diameter_bound_is_sound_with_directions_and_weights():
+    # 1. directed path 0 -> ... -> 199, every node also pointing into a hub: 2 hops undirected, VD 200
+    D = nx.DiGraph()
+    nx.add_path(D, range(200))
+    D.add_edges_from((v, "hub") for v in range(200))
+    assert vertex_diameter_bound(Graph.from_networkx(D).to_csr()) >= 200
+
+    # 2. weighted path with heavy shortcuts through a hub: the shortest paths walk the whole path
+    W = nx.path_graph(100)
+    nx.set_edge_attributes(W, 1.0, "weight")
+    W.add_weighted_edges_from((v, "hub", 1000.0) for v in range(100))
+    assert vertex_diameter_bound(Graph.from_networkx(W).to_csr()) >= 100
+
+    # 3. unweighted undirected keeps the BFS bound, a smaller component counts with its size
+    U = nx.disjoint_union(nx.star_graph(50), nx.path_graph(30))
+    assert vertex_diameter_bound(Graph.from_networkx(U).to_csr()) == 30
+
+
+def _estimate_in_daemon(send):
+    csr = Graph.from_networkx(nx.gnm_random_graph(60, 200, seed=1)).to_csr()
+    send.send(estimate_betweenness(csr, epsilon=0.2, workers=4, samples=600).samples)
+
+
+def test_pools_fall_back_to_inline_in_daemonic_processes():
+    # isolated benchmark cases run in daemonic processes, which cannot start pools
+    recv, send = mp.Pipe(duplex=False)
+    proc = mp.Process(target=_estimate_in_daemon, args=(send,), daemon=True)
+    proc.start()
+    assert recv.poll(30) and recv.recv() == 600
+    proc.join()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+import numpy as np
+import pytest
+
+from src.infrastructure.binary_format import open_binary
+from src.infrastructure.generators import generate
+from src.infrastructure.graph_gateway import GraphGateway, GraphSource
+
+
+def test_generator_streams_into_binary_format(tmp_path):
+    # 1. setup: weighted random geometric graph written through the gateway
+    gateway = GraphGateway()
+    source = GraphSource(kind="generator", name="rgg", weighted=True,
+                         value={"model": "random_geometric", "n": 500, "seed": 3})
+
+    header = gateway.stream_to_binary(source, tmp_path / "rgg.gbin")
+    _, records = open_binary(tmp_path / "rgg.gbin")
+    assert header.n == 500 and header.weighted and not header.directed
+    assert header.m == len(records) > 0
+    assert (records["u"] < records["v"]).all() and (records["w"] > 0).all()
+
+    # 2. the binary file and the in-memory generator describe the same graph
+    from_file = gateway.load(GraphSource(kind="binary", value=str(tmp_path / "rgg.gbin"), name="rgg-file"))
+    generated = gateway.load(source)
+    assert sorted(from_file.edges()) == sorted(generated.edges())
+    assert from_file.is_weighted()
+
+
+def test_gnp_edge_count_and_pairs():
+    # 1. expected m = p * n(n-1)/2 = 19990, standard deviation ~141
+    src, dst, _ = generate({"model": "gnp", "n": 2000, "p": 0.01, "seed": 1, "chunk_size": 4096}).concat()
+    assert abs(len(src) - 19990) < 5 * 141
+    # 2. undirected pairs are (v, w) with v < w, each drawn at most once
+    assert (src < dst).all() and dst.max() < 2000
+    assert len(np.unique(src * 2000 + dst)) == len(src)
+
+    d_src, d_dst, _ = generate({"model": "gnp", "n": 500, "p": 0.02, "seed": 1, "directed": True}).concat()
+    assert (d_src != d_dst).all() and abs(len(d_src) - 0.02 * 500 * 499) < 5 * np.sqrt(0.02 * 500 * 499)
+
+
+def test_chung_lu_edge_count_and_skew():
+    stream = generate({"model": "chung_lu", "n": 5000, "avg_degree": 6, "seed": 2})
+    src, dst, _ = stream.concat()
+    # 1. n * avg_degree / 2 draws, minus the self-loops dropped
+    assert stream.n == 5000 and 14_000 < len(src) <= 15_000
+    assert (src < dst).all() and dst.max() < 5000
+    # 2. the expected degrees fall off with the node id
+    degree = np.bincount(np.concatenate([src, dst]), minlength=5000)
+    assert degree[:50].mean() > 10 * degree[-2500:].mean()
+
+
+def test_rmat_size_and_range():
+    stream = generate({"model": "rmat", "scale": 10, "edge_factor": 8, "seed": 3, "weighted": True})
+    src, dst, weights = stream.concat()
+    # edge_factor * 2^scale samples, self-loops dropped
+    assert stream.n == 1024 and 0.9 * 8192 < len(src) <= 8192
+    assert (src < dst).all() and dst.max() < 1024
+    assert len(weights) == len(src) and ((weights >= 1.0) & (weights <= 10.0)).all()
+
+
+def test_grid_shape_and_road_variant():
+    # 1. a full 30 x 40 lattice: rows * (cols - 1) horizontal + (rows - 1) * cols vertical edges
+    full = generate({"model": "grid", "rows": 30, "cols": 40, "chunk_size": 100})
+    src, dst, _ = full.concat()
+    assert full.n == 1200 and len(src) == 30 * 39 + 29 * 40
+    assert set(np.unique(dst - src).tolist()) == {1, 40}
+    whole, _, _ = generate({"model": "grid", "rows": 30, "cols": 40}).concat()
+    assert np.array_equal(np.sort(whole), np.sort(src))  # row blocks cover the lattice exactly once
+
+    # 2. road-like variant: some segments dropped, diagonal (r, c) -> (r + 1, c + 1) shortcuts added
+    spec = {"model": "grid", "rows": 30, "cols": 40, "p_drop": 0.1, "p_diagonal": 0.2, "seed": 4}
+    r_src, r_dst, _ = generate(spec).concat()
+    steps = r_dst - r_src
+    assert set(np.unique(steps).tolist()) == {1, 40, 41}
+    assert np.count_nonzero(steps != 41) < len(src)
+
+    with pytest.raises(ValueError):
+        generate({"model": "grid", "rows": 3, "cols": 3, "directed": True})
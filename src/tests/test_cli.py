@@ -0,0 +1,42 @@
+from __future__ import annotations
+import csv
+import io
+import json
+
+from src.interfaces.cli import ProgressLine, SweepSpec, run_cli, run_sweep
+from src.infrastructure.result_sinks import JsonlSink
+
+
+SPEC = {
+    "graphs": [{"name": "er", "kind": "generator", "value": {"model": "gnp", "n": 60, "p": 0.1, "seed": 1}}],
+    "algorithms": ["identity_stub", {"name": "random", "grid": {"p": [0.3, 0.6], "seed": [1, 2]}}, "mst"],
+    "metrics": ["diameter"],
+}
+
+
+def test_sweep_streams_rows(tmp_path):
+    # 1. expansion: 1 graph x (1 + 2*2 + 1) parameter combinations
+    spec = SweepSpec.from_dict(SPEC)
+    assert len(spec) == 6
+    assert [j.params for j in spec.jobs() if j.algorithm == "random"][-1] == {"p": 0.6, "seed": 2}
+
+    # 2. in-process run into a jsonl sink
+    with JsonlSink(tmp_path / "out.jsonl") as sink:
+        failed = run_sweep(spec, sink, workers=1, progress=ProgressLine(len(spec), stream=io.StringIO()))
+
+    rows = [json.loads(line) for line in open(tmp_path / "out.jsonl")]
+    assert failed == 1 and len(rows) == 6
+    assert {r["status"] for r in rows if r["algorithm"] == "mst"} == {"error"}
+    ok = [r for r in rows if r["status"] == "ok"]
+    assert all("diameter" in r["metric:diameter"] and r["timings"]["transform"] >= 0 for r in ok)
+
+
+def test_cli_with_workers_writes_csv(tmp_path):
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(SPEC))
+
+    rc = run_cli([str(spec_path), "--workers", "2", "--out", str(tmp_path / "out.csv"), "--quiet"])
+
+    rows = list(csv.DictReader(open(tmp_path / "out.csv")))
+    assert rc == 1  # mst is not implemented
+    assert sorted(int(r["job"]) for r in rows) == list(range(6))
@@ -0,0 +1,49 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+
+import src.domain.triangles as triangles
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.registry import MetricRegistry
+from src.domain.triangles import count_triangles, sample_wedges
+
+
+def test_triangle_counts_match_networkx_for_every_method(monkeypatch):
+    # 1. setup: self-loop and clustered tail
+    nx_g = nx.powerlaw_cluster_graph(500, 4, 0.4, seed=1)
+    nx_g.add_edge(0, 0)
+    csr = Graph.from_networkx(nx_g).to_csr()
+    expected = nx.clustering(nx_g)
+    local = np.array([expected[v] for v in csr.nodes])
+
+    monkeypatch.setattr(triangles, "WEDGE_BUDGET", 100)  # many node ranges
+    for method, workers in (("forward", 1), ("forward", 2), ("matrix", 1)):
+        result = count_triangles(csr, method=method, workers=workers)
+        # 2. same coefficients as networkx on the undirected projection
+        assert result.triangles == sum(nx.triangles(nx_g).values()) // 3
+        assert np.allclose(result.local, local)
+        assert np.isclose(result.transitivity, nx.transitivity(nx_g))
+        assert np.isclose(result.average, nx.average_clustering(nx_g))
+
+    sampled = sample_wedges(csr, epsilon=0.02, delta=0.01)
+    assert abs(sampled.transitivity - nx.transitivity(nx_g)) <= 0.02
+    assert abs(sampled.average - nx.average_clustering(nx_g)) <= 0.02
+    assert sampled.local is None
+
+
+def test_clustering_metric_reports_loss_against_original():
+    # 1. setup: K5 minus one edge, which sat in 3 of its 10 triangles
+    G = Graph.from_networkx(nx.complete_graph(5), name="k5")
+    mask = np.array([{u, v} != {0, 1} for u, v in G.edges()])
+    H = G.view(mask)
+
+    result = MetricRegistry.get("clustering").compute(H, RunParams())
+    # 2. 7 triangles over 2 * C(3, 2) + 3 * C(4, 2) = 24 wedges
+    assert result.summary["triangles"] == 7 and result.summary["triangles_kept"] == 0.7
+    assert np.isclose(result.summary["transitivity"], 3 * 7 / 24)
+    assert result.summary["original_transitivity"] == 1.0
+    local = dict(zip(result.artifacts["nodes"], result.artifacts["local_clustering"]))
+    assert local[0] == 1.0 and np.isclose(local[2], 5 / 6)
+
+    approx = MetricRegistry.get("clustering").compute(H, RunParams({"approximate": True})).summary
+    assert approx["samples"] > 0 and "local_clustering" not in approx
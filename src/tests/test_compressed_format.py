@@ -0,0 +1,58 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.infrastructure.compressed_format import CompressedGraph, decode_varints, encode_varints, write_compressed
+from src.infrastructure.graph_gateway import GraphGateway, GraphSource
+
+
+def test_compressed_archive_round_trips_with_random_access(tmp_path):
+    # 1. varints: every length from 1 to 10 bytes
+    values = np.array([0, 127, 128, 300, 2 ** 35, 2 ** 64 - 1], dtype=np.uint64)
+    encoded, lengths = encode_varints(values)
+    assert lengths.tolist() == [1, 1, 2, 2, 6, 10]
+    assert decode_varints(encoded)[0].tolist() == values.tolist()
+
+    # 2. directed weighted graph with self-loops and lists pointing below their node
+    G = nx.gnm_random_graph(500, 4000, seed=4, directed=True)
+    G.add_edge(7, 7)
+    edges = np.array(list(G.edges()))
+    weights = np.arange(len(edges), dtype=np.float64)
+    write_compressed(tmp_path / "g.gcz", edges[:, 0], edges[:, 1], weights, n=500, directed=True, stride=16)
+    archive = CompressedGraph(tmp_path / "g.gcz")
+
+    decoded = {}
+    for src, dst, w in archive.iter_chunks(chunk_size=300):
+        decoded.update(zip(zip(src.tolist(), dst.tolist()), w.tolist()))
+    assert decoded == dict(zip(map(tuple, edges.tolist()), weights.tolist()))
+    for u in (0, 7, 250, 499):
+        assert archive.stored_neighbors(u).tolist() == sorted(G.successors(u))
+
+
+def test_variants_compress_against_their_parent_archive(tmp_path):
+    # 1. setup: parent archive, half of its edges plus two new ones as the variant
+    G = nx.gnm_random_graph(2000, 16000, seed=5)
+    edges = np.array(list(G.edges()))
+    write_compressed(tmp_path / "parent.gcz", edges[:, 0], edges[:, 1], n=2000)
+    variant = np.concatenate([edges[::2], [[0, 1999], [3, 4]]])
+    plain = write_compressed(tmp_path / "plain.gcz", variant[:, 0], variant[:, 1], n=2000)
+    delta = write_compressed(tmp_path / "sub" / "delta.gcz", variant[:, 0], variant[:, 1], n=2000,
+                             reference=tmp_path / "parent.gcz")
+
+    # 2. same edges, fewer bytes, parent found relative to the archive
+    assert delta.parent == "../parent.gcz" and delta.m == plain.m
+    assert (tmp_path / "sub" / "delta.gcz").stat().st_size < (tmp_path / "plain.gcz").stat().st_size
+    gateway = GraphGateway()
+    H = gateway.load(GraphSource(kind="compressed", name="delta", value=str(tmp_path / "sub" / "delta.gcz")))
+    assert set(map(frozenset, H.edges())) == set(map(frozenset, variant.tolist()))
+    assert H.node_count == 2000
+
+    # 3. graphs archive through the gateway; a changed parent is refused
+    gateway.archive(H, tmp_path / "again.gcz", reference=tmp_path / "parent.gcz")
+    again, adjacency = CompressedGraph(tmp_path / "again.gcz"), H.to_networkx(copy=False)
+    for u in (0, 1000, 1999):  # undirected: the list of the smaller endpoint holds the edge
+        assert again.stored_neighbors(u).tolist() == sorted(w for w in adjacency[u] if w >= u)
+    write_compressed(tmp_path / "parent.gcz", edges[1:, 0], edges[1:, 1], n=2000)
+    with pytest.raises(ValueError):
+        list(CompressedGraph(tmp_path / "sub" / "delta.gcz").iter_chunks())
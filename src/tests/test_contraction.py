@@ -0,0 +1,47 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+
+from src.domain.contraction import ContractionHierarchy
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.registry import MetricRegistry
+from src.domain.sparsifiers.registry import SparsifierRegistry
+from src.domain.transforms.registry import TransformRegistry
+
+
+def test_queries_match_dijkstra_with_and_without_core():
+    # 1. setup: weighted digraph, some pairs unreachable
+    nx_g = nx.gnm_random_graph(150, 400, seed=3, directed=True)
+    rng = np.random.default_rng(3)
+    nx.set_edge_attributes(nx_g, {e: float(rng.integers(1, 10)) for e in nx_g.edges()}, "weight")
+    G = Graph.from_networkx(nx_g, name="weighted")
+
+    for core_degree in (4, 64):
+        ch = ContractionHierarchy.build(G, core_degree=core_degree)
+        overlay = ContractionHierarchy.from_networkx(ch.to_networkx())
+        assert overlay.shortcuts == ch.shortcuts and overlay.core == ch.core
+
+        # 2. both the built and the reloaded hierarchy answer exactly
+        nodes = ch.csr.nodes
+        for s, t in rng.integers(0, 150, (80, 2)).tolist():
+            try:
+                expected = nx.dijkstra_path_length(nx_g, nodes[s], nodes[t])
+            except nx.NetworkXNoPath:
+                expected = np.inf
+            assert ch.query(s, t)[0] == expected
+            index = overlay.csr.index
+            assert overlay.query(index[nodes[s]], index[nodes[t]])[0] == expected
+
+
+def test_transform_and_query_benchmark_against_original():
+    G = Graph.from_networkx(nx.grid_2d_graph(12, 12), name="grid")
+    overlay = TransformRegistry.get("contraction_hierarchy").execute(G, RunParams({}))
+    assert overlay.metadata["shortcuts"] > 0
+
+    summary = MetricRegistry.get("ch_query").compute(overlay, RunParams({"reference": G, "queries": 50})).summary
+    assert summary["stretch"] == 1.0 and summary["lost_pairs"] == 0
+
+    H = SparsifierRegistry.get("random").run(G, RunParams({"p": 0.7}))
+    summary = MetricRegistry.get("ch_query").compute(H, RunParams({"queries": 50})).summary
+    assert summary["stretch"] >= 1.0
+    assert {"preprocess_time", "shortcuts", "query_us", "original_query_us", "query_speedup"} <= summary.keys()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.degree_distribution import DegreeDistribution, log_binned, power_law_tail
+from src.domain.sparsifiers.registry import SparsifierRegistry
+
+
+def test_csr_degrees_match_networkx():
+    for nx_g in [nx.gnm_random_graph(80, 300, seed=1), nx.gnm_random_graph(80, 300, seed=1, directed=True)]:
+        G = Graph.from_networkx(nx_g, name="gnm")
+        H = SparsifierRegistry.get("random").run(G, RunParams({"p": 0.5}))
+
+        for graph in (G, H):
+            expected = [d for _, d in graph.to_networkx(copy=False).degree()]
+            assert graph.to_csr().degree().tolist() == expected
+
+
+def test_tail_fit_recovers_exponent():
+    # 1. setup: discrete power law samples with alpha = 2.5
+    samples = np.random.default_rng(0).zipf(2.5, 100_000)
+    counts = np.bincount(samples)
+
+    # 2. fit and bins
+    fit = power_law_tail(counts)
+    assert abs(fit["alpha"] - 2.5) < 0.1
+    binned = log_binned(counts)
+    assert binned["ccdf"][0] == 1.0
+    assert np.isclose((binned["pdf"] * np.diff(binned["bin_edges"])).sum(), 1.0)
+
+
+def test_ks_against_parent_of_view():
+    G = Graph.from_networkx(nx.gnm_random_graph(200, 1000, seed=2), name="gnm")
+    metric = DegreeDistribution()
+
+    same = metric.compute(SparsifierRegistry.get("identity_stub").run(G, RunParams({})), RunParams({}))
+    halved = metric.compute(SparsifierRegistry.get("random").run(G, RunParams({"p": 0.5})), RunParams({}))
+    assert same.summary["ks_vs_original"] == 0.0
+    assert halved.summary["ks_vs_original"] > 0.3
@@ -0,0 +1,77 @@
+from __future__ import annotations
+import json
+import shutil
+
+import pytest
+
+from src.interfaces.cli import SweepSpec, run_cli, run_sweep
+from src.interfaces.distributed import CLOSED, Coordinator, TaskBoard, resolve_authkey, spawn_workers, stop_workers
+from src.interfaces.distributed import main as worker_main
+
+
+def test_board_requeues_expired_leases_and_drops_late_results():
+    # 1. a lease past its deadline goes back to the queue
+    board = TaskBoard(timeout=0.0)
+    board.submit({"id": 0})
+    assert board.take("a") == {"id": 0}
+    assert board.take("b") == {"id": 0} and board.stats()["requeued"] == 1
+
+    # 2. first result wins, the lost worker's late copy is dropped
+    assert board.complete("b", 0, {"status": "ok"})
+    assert not board.complete("a", 0, {"status": "ok"})
+    assert board.drain() == [{"status": "ok", "worker": "b"}]
+    assert board.take("a") is None
+    board.close()
+    assert board.take("a") == CLOSED
+
+
+def test_sweep_runs_on_localhost_workers_with_content_cache(tmp_path):
+    # 1. setup: the same edgelist under two names, plus a generator
+    shutil.copy("src/data/toy.edgelist", tmp_path / "toy.edgelist")
+    spec = SweepSpec.from_dict({
+        "graphs": [{"name": "toy", "kind": "file", "value": str(tmp_path / "toy.edgelist")},
+                   {"name": "toy_again", "kind": "file", "value": str(tmp_path / "toy.edgelist")},
+                   {"name": "er", "kind": "generator", "value": {"model": "gnp", "n": 60, "p": 0.1, "seed": 1}}],
+        "algorithms": [{"name": "random", "grid": {"p": [0.3, 0.6], "seed": [1, 2]}}],
+        "metrics": ["diameter"],
+    })
+    rows = []
+
+    class Sink:
+        def write(self, row):
+            rows.append(row)
+
+    # 2. three workers on localhost, sharing one cache directory
+    with Coordinator(task_timeout=60.0) as coordinator:
+        workers = spawn_workers(coordinator.address, 3, coordinator.authkey, cache_dir=str(tmp_path / "cache"))
+        failed = run_sweep(spec, Sink(), workers=3, coordinator=coordinator)
+    stop_workers(workers)
+
+    assert failed == 0 and sorted(r["job"] for r in rows) == list(range(12))
+    assert all(r["status"] == "ok" and "diameter" in r["metric:diameter"] for r in rows)
+    assert len(list((tmp_path / "cache").iterdir())) == 1  # both names hash to one cached file
+    assert coordinator.stats["done"] == 12 and not any(p.is_alive() for p in workers)
+
+
+def test_cli_listen_starts_local_workers(tmp_path):
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps({
+        "graphs": [{"name": "er", "kind": "generator", "value": {"model": "gnp", "n": 40, "p": 0.1, "seed": 1}}],
+        "algorithms": ["identity_stub"],
+    }))
+    rc = run_cli([str(spec_path), "--listen", "127.0.0.1:0", "--workers", "2", "--out", str(tmp_path / "out.jsonl"),
+                  "--quiet"])
+    rows = [json.loads(line) for line in open(tmp_path / "out.jsonl")]
+    assert rc == 0 and rows[0]["worker"].startswith("local-")
+
+
+def test_coordinator_needs_a_chosen_secret_beyond_loopback(monkeypatch):
+    monkeypatch.delenv("GSP_AUTHKEY", raising=False)
+    with pytest.raises(ValueError):
+        resolve_authkey(("0.0.0.0", 5000))
+    with pytest.raises(SystemExit):
+        worker_main(["127.0.0.1:5000"])  # workers have no key to fall back to either
+
+    # loopback gets a fresh random key per coordinator, a chosen one is used as is
+    assert resolve_authkey(("127.0.0.1", 0)) != resolve_authkey(("localhost", 0))
+    assert resolve_authkey(("0.0.0.0", 5000), "s3cret") == b"s3cret"
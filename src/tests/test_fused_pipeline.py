@@ -0,0 +1,80 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+
+from src.application.experiment_service import ExperimentService
+from src.domain.graph_model import Graph, GraphView, RunParams
+from src.domain.transforms.registry import TransformRegistry
+from src.infrastructure.persistence.stubs import InMemoryExperimentRepository, InMemoryGraphRepository
+
+
+def _service(G: nx.Graph, name: str) -> ExperimentService:
+    service = ExperimentService(InMemoryGraphRepository(), InMemoryExperimentRepository())
+    service.graph_repo.save(Graph.from_networkx(G, name=name))
+    return service
+
+
+def test_fused_pipeline_matches_stage_by_stage_runs():
+    # 1. setup: weighted graph, coarsening in the middle
+    G = nx.gnm_random_graph(400, 3000, seed=2)
+    for i, (u, v) in enumerate(G.edges()):
+        G[u][v]["weight"] = 1.0 + i % 5
+    service = _service(G, "gnm")
+    params = {"seed": 3, "rho": 0.6, "mock_coarsening.reduction_ratio": 0.25}
+
+    # 2. one fused run vs. the same stages one experiment at a time
+    fused, lineage = service.run_pipeline("gnm", "simplify_parallel_edges|mock_coarsening|k_neighbor", params)
+    assert lineage == []
+    coarse = service.run_transform("gnm", "mock_coarsening", {"seed": 3, "reduction_ratio": 0.25})
+    service.graph_repo.save(coarse)
+    staged = service.run_sparsifier(coarse.name, "k_neighbor", {"seed": 3, "rho": 0.6})
+    assert fused.node_count == staged.node_count == 300
+    assert set(map(frozenset, fused.edges())) == set(map(frozenset, staged.edges()))
+
+    # 3. per-stage sizes and timings
+    stages = fused.metadata["stages"]
+    assert [s["stage"] for s in stages] == ["simplify_parallel_edges", "mock_coarsening", "k_neighbor"]
+    assert stages[0]["edges"] == 3000 and stages[1]["nodes"] == 300
+    assert all(s["time"] >= 0 for s in stages)
+
+
+def test_edge_only_pipeline_is_a_view_and_lineage_goes_to_the_unit_of_work():
+    # 1. setup
+    G = nx.gnm_random_graph(200, 1000, seed=1)
+    service = _service(G, "er")
+
+    # 2. mask-only stages compose into a view of the input, the same edges as the plain sparsifier
+    dto = service.run_experiment("er", "identity_stub|local_degree", ["diameter"], {"lineage": True})
+    result = service.get_graph("er_identity_stub_local_degree")
+    assert isinstance(result, GraphView) and result.parent is service.get_graph("er")
+    plain = service.run_sparsifier("er", "local_degree", {})
+    assert np.array_equal(result.edge_mask, plain.edge_mask)
+    assert dto.edges_after == plain.edge_count
+
+    # 3. the intermediate graph was stored too
+    assert "er_stage_0_identity_stub" in service.list_graphs()
+
+
+def test_simplify_parallel_edges_keeps_the_lightest_edge():
+    M = nx.MultiGraph()
+    M.add_weighted_edges_from([(0, 1, 3.0), (1, 0, 1.0), (1, 2, 2.0), (0, 1, 5.0)])
+    H = TransformRegistry.get("simplify_parallel_edges").run(Graph.from_networkx(M, name="multi"), RunParams({}))
+    assert sorted((min(u, v), max(u, v), w) for u, v, w in H.edges(data="weight")) == [(0, 1, 1.0), (1, 2, 2.0)]
+
+
+def test_pipeline_over_a_multigraph_returns_a_simple_graph():
+    # 1. setup: weighted 40-ring, every edge doubled by a heavier parallel copy
+    M = nx.MultiGraph()
+    M.add_weighted_edges_from([(i, (i + 1) % 40, 1.0) for i in range(40)])
+    M.add_weighted_edges_from([(i, (i + 1) % 40, 4.0) for i in range(40)])
+    service = _service(M, "multi_ring")
+
+    # 2. mask-only stages, yet no multigraph view: one lightest edge per pair survives
+    dto = service.run_experiment("multi_ring", "simplify_parallel_edges|k_neighbor", ["diameter", "apsp"],
+                                 {"rho": 1.0, "lineage": True})
+    result = service.get_graph("multi_ring_simplify_parallel_edges_k_neighbor")
+    assert not isinstance(result, GraphView)
+    assert not result.to_networkx(copy=False).is_multigraph()
+    assert sorted(w for _, _, w in result.edges(data="weight")) == [1.0] * 40
+    assert dto.edges_after == 40
+    assert not service.get_graph("multi_ring_stage_0_simplify_parallel_edges").to_networkx(copy=False).is_multigraph()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+
+from src.domain.graph_model import Graph, GraphView, RunParams
+from src.domain.sparsifiers.registry import SparsifierRegistry
+
+
+def test_view_shares_parent_and_materializes():
+    # 1. setup
+    nx_g = nx.cycle_graph(6)
+    nx.set_edge_attributes(nx_g, 2.0, "weight")
+    G = Graph.from_networkx(nx_g, name="cycle")
+
+    mask = np.array([True, False, True, True, False, True])
+    V = G.view(mask, name="cycle_view")
+
+    # 2. read api without materializing
+    assert isinstance(V, GraphView)
+    assert V.parent is G
+    assert V.node_count == 6
+    assert V.edge_count == 4
+    assert V.is_weighted()
+    assert V.to_networkx(copy=False).number_of_edges() == 4
+    assert V.edge_weight(1, 2) == 2.0
+
+    # 3. materialization is independent from the parent
+    H = V.materialize()
+    assert type(H) is Graph
+    assert sorted(H.edges()) == sorted(V.edges())
+    H.to_networkx(copy=False).remove_edge(1, 2)
+    assert G.to_networkx(copy=False).has_edge(1, 2)
+
+
+def test_sparsifiers_return_views_matching_materialized_graph():
+    nx_g = nx.gnm_random_graph(60, 240, seed=7)
+    G = Graph.from_networkx(nx_g, name="gnm")
+
+    for name, params in [("random", {"p": 0.3}), ("k_neighbor", {"rho": 0.5}), ("local_degree", {"rho": 0.5})]:
+        H = SparsifierRegistry.get(name).run(G, RunParams(params))
+
+        assert isinstance(H, GraphView)
+        assert H.parent is G
+        assert 0 < H.edge_count < G.edge_count
+        assert H.edge_count == H.to_networkx(copy=True).number_of_edges()
+
+
+def test_derived_structures_are_shared_and_invalidated():
+    # 1. setup: directed graph with two weak components
+    from src.application.experiment_service import ExperimentService
+    from src.domain.common.tracing import Tracer
+    from src.infrastructure.persistence.stubs import InMemoryGraphRepository, InMemoryExperimentRepository
+
+    nx_g = nx.DiGraph([(0, 1), (1, 2), (2, 0), (3, 4)])
+    G = Graph.from_networkx(nx_g, name="two_parts")
+    svc = ExperimentService(InMemoryGraphRepository(), InMemoryExperimentRepository())
+
+    # 2. both path metrics of one call build the undirected CSR and the LCC once
+    with Tracer() as tracer:
+        svc.compute_metrics(G, ["diameter", "avg_path_length"])
+    derived = [s.attrs["structure"] for s in tracer.spans if s.name == "derive"]
+    assert derived.count("undirected_csr") == 1 and derived.count("largest_component") == 1
+    assert G.lcc_nodes() == {0, 1, 2}
+
+    # 3. growing the graph in place drops the cached structures
+    nx_g.add_edge(2, 3)
+    assert G.lcc_nodes() == {0, 1, 2, 3, 4}
+    assert G.to_csr().m == 5
+    assert G.degree_map()[2] == 2
+
+
+def test_multigraph_views_keep_parallel_edges_apart():
+    # 1. setup: weighted 12-ring with a heavier parallel copy of every other edge
+    from src.application.experiment_service import ExperimentService
+    from src.infrastructure.persistence.stubs import InMemoryGraphRepository, InMemoryExperimentRepository
+
+    nx_g = nx.MultiGraph()
+    nx_g.add_weighted_edges_from([(i, (i + 1) % 12, 1.0) for i in range(12)])
+    nx_g.add_weighted_edges_from([(i, (i + 1) % 12, 5.0) for i in range(0, 12, 2)])
+    G = Graph.from_networkx(nx_g, name="multi_ring")
+
+    # 2. dropping only the light copies: the view keeps the heavy parallel ones, by key
+    light = np.array([d["weight"] == 1.0 for _, _, d in nx_g.edges(data=True)])
+    V = G.view(~light | (np.arange(G.edge_count) % 2 == 1))
+    assert V.to_networkx(copy=False).number_of_edges() == V.edge_count
+    assert V.edge_weight(0, 1) == 5.0 and V.edge_weight(1, 2) == 1.0
+
+    # 3. a sparsifier view goes through the networkx-backed metrics
+    H = SparsifierRegistry.get("random").run(G, RunParams({"p": 0.8, "seed": 3}))
+    svc = ExperimentService(InMemoryGraphRepository(), InMemoryExperimentRepository())
+    diameter, apsp = svc.compute_metrics(H, ["diameter", "apsp"], reference=G)
+    assert diameter.summary["diameter"] >= 6 and apsp.summary
+    assert H.to_networkx(copy=False).number_of_edges() == H.edge_count
+
+
+def test_count_preserving_edits_need_invalidate():
+    # 1. setup: cached CSR of a weighted path
+    from src.infrastructure.persistence.stubs import InMemoryGraphRepository
+
+    nx_g = nx.path_graph(4)
+    nx.set_edge_attributes(nx_g, 1.0, "weight")
+    G = Graph.from_networkx(nx_g, name="path")
+    assert G.to_csr().weights.tolist() == [1.0, 1.0, 1.0]
+
+    # 2. a weight edit and an edge swap keep the counts: cached until invalidated
+    nx_g[0][1]["weight"] = 7.0
+    nx_g.remove_edge(2, 3)
+    nx_g.add_edge(0, 3, weight=2.0)
+    assert G.to_csr().weights.tolist() == [1.0, 1.0, 1.0]
+    G.invalidate()
+    assert sorted(G.to_csr().weights.tolist()) == [1.0, 2.0, 7.0]
+
+    # 3. saving the edited graph again invalidates too
+    repo = InMemoryGraphRepository()
+    repo.save(G)
+    nx_g[1][2]["weight"] = 3.0
+    repo.save(G)
+    assert sorted(G.to_csr().weights.tolist()) == [2.0, 3.0, 7.0]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+
+from src.domain.graph_model import Graph, RunParams
+from src.domain.hyperanf import NeighbourhoodFunction, hyperanf
+from src.domain.metrics.registry import MetricRegistry
+
+
+def test_hyperanf_tracks_exact_neighbourhood_function():
+    # 1. setup: exact N(t) from all-pairs BFS, directed to check the out-edge orientation
+    nx_g = nx.gnp_random_graph(600, 0.004, seed=2, directed=True)
+    lengths = dict(nx.all_pairs_shortest_path_length(nx_g))
+    exact = np.cumsum(np.bincount([d for row in lengths.values() for d in row.values()])).astype(float)
+
+    nf = hyperanf(Graph.from_networkx(nx_g).to_csr(), log2m=8, seed=1)
+
+    # 2. same number of hops, every N(t) within a few counter standard deviations
+    assert len(nf.values) == len(exact)
+    assert np.all(np.abs(nf.values / exact - 1.0) <= 4 * nf.relative_std)
+    assert abs(NeighbourhoodFunction.average_distance(nf.values) - NeighbourhoodFunction.average_distance(exact)) \
+        <= 4 * nf.std(NeighbourhoodFunction.average_distance) + 0.05
+    assert np.all(np.diff(nf.values) >= 0)
+
+
+def test_distance_distribution_metric_against_original():
+    # 1. setup: cutting one edge of a 40-ring stretches it to a path, diameter 20 -> 39
+    ring = nx.cycle_graph(40)
+    G = Graph.from_networkx(ring, name="ring")
+    mask = np.ones(G.edge_count, dtype=bool)
+    mask[0] = False
+    u, v = list(G.edges())[0]
+    path = ring.copy()
+    path.remove_edge(u, v)
+
+    summary = MetricRegistry.get("distance_distribution").compute(G.view(mask), RunParams({"log2m": 8})).summary
+
+    # 2. hop count exact, average distances (zero distances included) within the jackknife error
+    def average(g):
+        hops = np.bincount([d for row in dict(nx.all_pairs_shortest_path_length(g)).values() for d in row.values()])
+        return NeighbourhoodFunction.average_distance(np.cumsum(hops).astype(float))
+
+    assert summary["hops"] == 39
+    assert abs(summary["average_distance"] - average(path)) <= 4 * summary["average_distance_std"]
+    assert abs(summary["original_average_distance"] - average(ring)) <= 0.1 * average(ring)
+    assert summary["effective_diameter"] > summary["original_effective_diameter"]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+import numpy as np
+import pytest
+
+from src.application.experiment_service import ExperimentService
+from src.domain.interning import NodeTable, StreamingInterner
+from src.infrastructure.graph_gateway import GraphGateway, GraphSource
+from src.infrastructure.persistence.stubs import InMemoryExperimentRepository, InMemoryGraphRepository
+
+
+def test_interning_tables_are_vectorized_bijections():
+    # 1. setup: 64-bit hash labels, beyond int64
+    labels = np.array([2 ** 63 + 5, 7, 2 ** 64 - 1, 7], dtype=np.uint64)
+    table, (ids,) = NodeTable.from_columns(labels)
+
+    # 2. sorted unique + searchsorted: dense int32 ids, labels resolved back
+    assert ids.dtype == np.int32 and ids.tolist() == [1, 0, 2, 0]
+    assert table.label(table.ids(labels)) == labels.tolist()
+    with pytest.raises(KeyError):
+        table.ids(np.array([8], dtype=np.uint64))
+
+    # 3. streaming: ids in first-seen order across chunks, integer tokens parsed once at the end
+    interner = StreamingInterner()
+    assert interner.intern(np.array(["30", "10", "30"])).tolist() == [0, 1, 0]
+    assert interner.intern(np.array(["20", "10"])).tolist() == [2, 1]
+    assert interner.table().labels.tolist() == [30, 10, 20]
+
+
+def test_string_labelled_edgelist_loads_on_dense_ids(tmp_path):
+    # 1. setup: a text edgelist with string labels (read_edgelist(nodetype=int) used to fail on it)
+    path = tmp_path / "words.edgelist"
+    path.write_text("# u v\nalpha beta\nbeta gamma\ngamma alpha\ngamma delta\n")
+    service = ExperimentService(InMemoryGraphRepository(), InMemoryExperimentRepository())
+    graph = service.gateway.load(GraphSource(kind="file", name="words", value=str(path)))
+
+    # 2. nodes are dense ids in order of appearance, the table resolves them
+    assert list(graph.nodes()) == [0, 1, 2, 3]
+    assert graph.node_labels([3, 0]) == ["delta", "alpha"]
+
+    # 3. derived graphs share the one table
+    view = graph.view(np.array([True, False, True, True]), name="words_view")
+    assert view.node_table is graph.node_table
+    (result,) = service.compute_metrics(graph, ["clustering"])
+    assert result.artifacts["nodes"] == ["alpha", "beta", "gamma", "delta"]
+
+    # 4. streamed output is written with the original labels
+    out = service.stream_sparsify(GraphSource(kind="file", name="words", value=str(path)), "random", {"p": 1.0},
+                                  str(tmp_path / "out.edgelist"))
+    assert (tmp_path / "out.edgelist").read_text().split("\n")[0] == "alpha beta"
+    assert service.get_graph(out).node_labels([0]) == ["alpha"]
+
+
+def test_gateway_reuses_interner_between_passes(tmp_path):
+    path = tmp_path / "ids.edgelist"
+    path.write_text("900 5\n5 77\n")
+    gateway = GraphGateway()
+    source = GraphSource(kind="file", name="ids", value=str(path))
+    first = [src.tolist() + dst.tolist() for src, dst, _ in gateway.iter_edge_chunks(source)]
+    second = [src.tolist() + dst.tolist() for src, dst, _ in gateway.iter_edge_chunks(source)]
+    assert first == second == [[0, 1, 1, 2]]
+    assert gateway.stream_labels(source).label([2]) == ["77"]
+
+
+def test_id_only_outputs_keep_the_label_table(tmp_path):
+    # 1. setup: integer labels that are not dense ids
+    path = tmp_path / "ids.edgelist"
+    path.write_text("900 5\n5 77\n")
+    service = ExperimentService(InMemoryGraphRepository(), InMemoryExperimentRepository())
+    source = GraphSource(kind="file", name="ids", value=str(path))
+
+    # 2. streamed to binary and compressed outputs: the labels come back on load
+    for out in ("out.gbin", "out.gcz"):
+        key = service.stream_sparsify(source, "random", {"p": 1.0}, str(tmp_path / out))
+        graph = service.get_graph(key)
+        assert graph.node_labels(graph.nodes()) == [900, 5, 77]
+
+    # 3. archiving a loaded graph writes its table too; a label-less rewrite drops the stale one
+    service.gateway.archive(service.gateway.load(source), tmp_path / "archived.gcz")
+    archived = service.gateway.load(GraphSource(kind="compressed", name="a", value=str(tmp_path / "archived.gcz")))
+    assert archived.node_labels([2]) == [77]
+    service.gateway.write_edge_chunks([(np.array([0]), np.array([1]), None)], tmp_path / "archived.gcz", n=2)
+    assert service.gateway.load(GraphSource(kind="compressed", name="b", value=str(tmp_path / "archived.gcz"))).node_table is None
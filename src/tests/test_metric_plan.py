@@ -0,0 +1,35 @@
+from __future__ import annotations
+import networkx as nx
+
+from src.application.experiment_service import ExperimentService
+from src.domain.common.tracing import Tracer
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.registry import MetricRegistry
+from src.domain.traversal import MultiSourceBFS
+from src.infrastructure.persistence.stubs import InMemoryExperimentRepository, InMemoryGraphRepository
+
+
+def test_traversal_metrics_share_one_pass(monkeypatch):
+    # 1. setup: disconnected, so the lcc and all-sources sets differ
+    nx_g = nx.disjoint_union(nx.connected_watts_strogatz_graph(120, 4, 0.2, seed=1), nx.path_graph(5))
+    names = ["diameter", "avg_path_length", "apsp", "degree_distribution"]
+    alone = {name: MetricRegistry.get(name).compute(Graph.from_networkx(nx_g), RunParams()).summary for name in names}
+
+    sweeps = []
+    original = MultiSourceBFS.iter_levels
+    monkeypatch.setattr(MultiSourceBFS, "iter_levels", lambda self, sources: sweeps.append(len(sources)) or original(self, sources))
+    svc = ExperimentService(InMemoryGraphRepository(), InMemoryExperimentRepository())
+    with Tracer() as tracer:
+        results = {r.metric: r.summary for r in svc.compute_metrics(Graph.from_networkx(nx_g), names)}
+
+    # 2. one sweep over all 125 sources (two 64-wide batches) feeds all three traversal metrics
+    assert sweeps == [64, 61]
+    assert results["diameter"]["diameter"] == alone["diameter"]["diameter"]
+    assert results["average path length"]["avg"] == alone["avg_path_length"]["avg"]
+    assert results["all pairs shortest paths"]["mean"] == alone["apsp"]["mean"]
+    assert results["all pairs shortest paths"]["plan_shared_by"] == 3
+    assert "plan_group" not in results["degree distribution"]
+
+    plan = next(s for s in tracer.spans if s.name == "metric_plan")
+    assert plan.attrs["traversal_passes"] == 1 and plan.attrs["passes_saved"] == 2
+    assert plan.attrs["standalone"] == ["degree_distribution"]
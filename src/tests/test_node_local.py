@@ -0,0 +1,49 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+
+from src.domain.graph_model import Graph, RunParams
+from src.domain.sparsifiers.registry import SparsifierRegistry
+from src.domain.transforms import node_local
+
+
+def _graph(G: nx.Graph, name: str) -> Graph:
+    return Graph.from_networkx(G, name=name)
+
+
+def test_node_local_masks_do_not_depend_on_worker_count(monkeypatch):
+    # 1. setup: small blocks so the node range splits into many partitions
+    monkeypatch.setattr(node_local, "BLOCK", 64)
+    G = nx.gnm_random_graph(600, 5000, seed=3)
+    for i, (u, v) in enumerate(G.edges()):
+        G[u][v]["weight"] = 1.0 + i % 7
+    graph = _graph(G, "gnm")
+
+    # 2. same seed: bit-identical masks for 1 and 3 workers; another seed differs
+    for name in ("k_neighbor", "local_degree"):
+        sparsifier = SparsifierRegistry.get(name)
+        serial = sparsifier.local_mask(graph, RunParams({"rho": 0.5, "seed": 7}))
+        parallel = sparsifier.local_mask(graph, RunParams({"rho": 0.5, "seed": 7, "workers": 3}))
+        assert np.array_equal(serial, parallel)
+    k_neighbor = SparsifierRegistry.get("k_neighbor")
+    assert not np.array_equal(k_neighbor.local_mask(graph, RunParams({"rho": 0.5, "seed": 7})),
+                              k_neighbor.local_mask(graph, RunParams({"rho": 0.5, "seed": 8})))
+
+
+def test_node_local_selections_keep_k_edges_per_node():
+    # 1. setup: a star plus a path, directed so every edge has one owner
+    G = nx.DiGraph()
+    G.add_edges_from((0, v) for v in range(1, 10))
+    G.add_edges_from([(1, 2), (2, 3), (3, 0)])
+    graph = _graph(G, "star")
+    edges = list(G.edges())
+
+    # 2. k_neighbor: max(1, floor(d^0.5)) out-edges per node
+    kept = [edges[i] for i in np.flatnonzero(SparsifierRegistry.get("k_neighbor").local_mask(graph, RunParams({"rho": 0.5})))]
+    assert sum(u == 0 for u, _ in kept) == 3
+    assert {(1, 2), (2, 3), (3, 0)} <= set(kept)
+
+    # 3. local_degree: the 3 highest-degree successors of the hub, ties to the lower id
+    kept = [edges[i] for i in np.flatnonzero(SparsifierRegistry.get("local_degree").local_mask(graph, RunParams({"rho": 0.5})))]
+    assert sorted(v for u, v in kept if u == 0) == [1, 2, 3]
+    assert len(kept) == 6
@@ -0,0 +1,47 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+
+from src.application.experiment_service import ExperimentService
+from src.domain.graph_model import Graph
+from src.domain.oracle import LandmarkIndex
+from src.infrastructure.graph_gateway import GraphSource
+from src.infrastructure.persistence.stubs import InMemoryGraphRepository, InMemoryExperimentRepository
+
+
+def test_bounds_and_astar_match_dijkstra(tmp_path):
+    # 1. setup: weighted digraph, not strongly connected
+    nx_g = nx.gnm_random_graph(120, 300, seed=3, directed=True)
+    rng = np.random.default_rng(3)
+    nx.set_edge_attributes(nx_g, {e: float(rng.integers(1, 10)) for e in nx_g.edges()}, "weight")
+    G = Graph.from_networkx(nx_g, name="weighted")
+
+    index = LandmarkIndex.build(G, landmarks=6)
+    pairs = [(int(u), int(v)) for u, v in rng.integers(0, 120, (100, 2))]
+    answer = index.query(pairs)
+
+    # 2. exact answers and bounds hold for every pair
+    for (u, v), lo, up, d in zip(pairs, answer.lower, answer.upper, answer.exact):
+        try:
+            expected = nx.dijkstra_path_length(nx_g, u, v)
+        except nx.NetworkXNoPath:
+            expected = np.inf
+        assert d == expected
+        assert lo <= expected <= up
+
+    # 3. persisted tables load back for the same graph only
+    path = index.save(tmp_path / "weighted.npz")
+    loaded = LandmarkIndex.load(path, G)
+    assert (loaded.forward == index.forward).all() and (loaded.backward == index.backward).all()
+
+
+def test_service_keeps_index_next_to_graph():
+    service = ExperimentService(InMemoryGraphRepository(), InMemoryExperimentRepository())
+    key = service.import_graph(GraphSource(kind="memory", name="cycle", value=nx.cycle_graph(30)))
+
+    index = service.build_index(key, landmarks=4)
+    assert service.build_index(key, landmarks=4) is index
+    assert index.query([(0, 15)]).exact[0] == 15
+
+    service.graph_repo.delete(key)
+    assert service.graph_repo.get_index(key, "landmarks") is None
@@ -0,0 +1,37 @@
+from __future__ import annotations
+import os
+import sys
+
+from src.domain.common.plugin_discovery import MANIFEST_FILE, PluginManifest
+
+
+PLUGIN = '''
+@register_thing("{name}")
+class {cls}:
+    INFO = Info(name="{name}", version="{version}")
+    node_local = True
+'''
+
+
+def test_manifest_is_static_and_rebuilt_on_change(tmp_path, monkeypatch):
+    # 1. setup: a throwaway plugin package whose modules would fail if imported
+    pkg = tmp_path / "manifest_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "alpha.py").write_text("raise RuntimeError('imported')\n" + PLUGIN.format(name="alpha", cls="A", version="1.2.0"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    manifest = PluginManifest("manifest_pkg", decorators=("register_thing",))
+
+    # 2. entries are read from source, nothing is imported
+    entry = manifest.get("alpha")
+    assert entry.module == "manifest_pkg.alpha" and entry.class_name == "A"
+    assert entry.version == "1.2.0"
+    assert entry.capabilities["node_local"] is True
+    assert "manifest_pkg.alpha" not in sys.modules
+    assert os.path.exists(pkg / MANIFEST_FILE)
+
+    # 3. a new module invalidates the cached json
+    (pkg / "beta.py").write_text(PLUGIN.format(name="beta", cls="B", version="0.1.0"))
+    rebuilt = PluginManifest("manifest_pkg", decorators=("register_thing",))
+    assert sorted(rebuilt.entries) == ["alpha", "beta"]
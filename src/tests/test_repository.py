@@ -0,0 +1,43 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+
+from src.domain.graph_model import Graph
+from src.infrastructure.persistence.stubs import InMemoryGraphRepository
+
+
+def test_memory_budget_spills_lru_graphs_and_reloads_them(tmp_path):
+    # 1. setup: labelled nodes and edge attributes beyond the weight
+    a = nx.relabel_nodes(nx.gnm_random_graph(300, 900, seed=1), lambda v: f"n{v}")
+    for i, (u, v) in enumerate(a.edges()):
+        a.edges[u, v].update(weight=float(i % 7 + 1), via=None if i % 3 else "x")
+    a.nodes["n0"]["rank"] = 5
+    A = Graph.from_networkx(a, name="a")
+    B = Graph.from_networkx(nx.gnm_random_graph(300, 900, seed=2), name="b")
+    view = A.view(np.arange(A.edge_count) % 2 == 0, name="a_half")
+    edges_before = list(view.edges())
+
+    repo = InMemoryGraphRepository(memory_budget=A.estimated_bytes() + 1, spill_dir=str(tmp_path))
+    repo.save(A)
+    repo.save(B)
+
+    # 2. a is the least recently used one: spilled and turned into a lazy proxy
+    assert not A.is_loaded and B.is_loaded
+    assert repo.evictions == 1 and repo.spilled_bytes > 0
+    assert repo.get("a") is A and repo.stats()["misses"] == 1
+
+    # 3. the reload restores labels, attributes and edge order, so masks still line up
+    assert list(A.to_networkx(copy=False).edges(data=True)) == list(a.edges(data=True))
+    assert A.to_networkx(copy=False).nodes["n0"]["rank"] == 5
+    assert list(view.edges()) == edges_before
+
+    repo.get("a")
+    assert repo.stats()["hits"] == 1 and not B.is_loaded  # a is back and now b goes over the budget
+
+    # 4. in-place edits of a reloaded graph survive the next eviction
+    A.to_networkx(copy=False).edges["n0", next(iter(a["n0"]))]["weight"] = 99.0
+    A.invalidate()  # the counts are unchanged, so the cached arrays would not notice the edit
+    repo.get("b").to_networkx(copy=False)
+    repo.get("b")
+    assert not A.is_loaded
+    assert A.to_networkx(copy=False).edges["n0", next(iter(a["n0"]))]["weight"] == 99.0
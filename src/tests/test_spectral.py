@@ -0,0 +1,61 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.registry import MetricRegistry
+from src.domain.spectral import laplacian, spectrum
+
+
+@pytest.mark.filterwarnings("error")  # tiny inputs skip lobpcg's own (warning) dense fallback
+def test_sparse_spectrum_matches_dense_with_components_and_repeats():
+    # 1. setup: two components, an isolated node and a 4-cycle (repeated eigenvalue 2)
+    nx_g = nx.disjoint_union(nx.petersen_graph(), nx.cycle_graph(4))
+    nx_g.add_node("isolated")
+    csr = Graph.from_networkx(nx_g).to_csr()
+
+    for normalized in (True, False):
+        dense = np.linalg.eigvalsh(laplacian(csr, normalized).toarray())
+        for method in ("lanczos", "shift_invert"):
+            result = spectrum(csr, k=4, normalized=normalized, method=method)
+            # 2. test setup only densifies; kernel deflation keeps all three zeros
+            assert np.allclose(result.smallest, dense[:4], atol=1e-6)
+            assert np.allclose(result.largest, dense[-4:], atol=1e-6)
+            assert result.zero_eigenvalues == 3
+
+
+def test_both_methods_find_repeated_small_eigenvalues_of_a_lattice():
+    # 1. setup: 30x30 grid, the smallest nonzero eigenvalues come in pairs
+    csr = Graph.from_networkx(nx.grid_2d_graph(30, 30)).to_csr()
+
+    for normalized in (True, False):
+        dense = np.linalg.eigvalsh(laplacian(csr, normalized).toarray())[:6]
+        assert np.isclose(dense[4], dense[5])
+        for method in ("lanczos", "shift_invert"):
+            # 2. test: the pair at positions 4 and 5 is reported twice by both solvers
+            result = spectrum(csr, k=6, normalized=normalized, method=method)
+            assert np.allclose(result.smallest, dense, atol=1e-6)
+
+
+def test_spectrum_metric_reports_gap_and_error_against_parent():
+    # 1. setup: a 40-ring; dropping one edge leaves a path, dropping two opposite ones two paths
+    G = Graph.from_networkx(nx.cycle_graph(40), name="ring")
+    params = RunParams({"k": 4})
+    same = MetricRegistry.get("laplacian_spectrum").compute(G.view(), params).summary
+    assert same["smallest_rel_error"] == 0.0 and same["largest_rel_error"] == 0.0
+
+    path = np.ones(G.edge_count, dtype=bool)
+    path[0] = False
+    summary = MetricRegistry.get("laplacian_spectrum").compute(G.view(path), params).summary
+
+    # 2. normalized lambda_2 in closed form: 1 - cos(2 pi / n) on the ring, 1 - cos(pi / (n - 1)) on the path
+    assert np.isclose(summary["original_algebraic_connectivity"], 1 - np.cos(2 * np.pi / 40), atol=1e-8)
+    assert np.isclose(summary["algebraic_connectivity"], 1 - np.cos(np.pi / 39), atol=1e-8)
+    assert summary["smallest_rel_error"] > 0.0
+
+    # 3. a cut reduction: one more zero eigenvalue, no connectivity left
+    cut = path.copy()
+    cut[[i for i, (u, v) in enumerate(G.edges()) if {u, v} == {20, 21}]] = False
+    split = MetricRegistry.get("laplacian_spectrum").compute(G.view(cut), params).summary
+    assert split["zero_eigenvalues"] == 2 and split["algebraic_connectivity"] == 0.0
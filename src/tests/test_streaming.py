@@ -0,0 +1,139 @@
+from __future__ import annotations
+import math
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.application.experiment_service import ExperimentService
+from src.domain.graph_model import Graph
+from src.domain.sparsifiers.local_degree import LocalDegreeEdgeFilter
+from src.infrastructure.generators import generate
+from src.infrastructure.graph_gateway import GraphSource
+from src.infrastructure.persistence.stubs import InMemoryGraphRepository, InMemoryExperimentRepository
+
+
+def _service() -> ExperimentService:
+    return ExperimentService(InMemoryGraphRepository(), InMemoryExperimentRepository())
+
+
+def test_stream_sparsify_registers_lazy_graph(tmp_path):
+    # 1. setup: generator -> binary file, then a chunked random pass over it
+    svc = _service()
+    spec = {"model": "gnp", "n": 2000, "p": 0.01, "seed": 7}
+    header = svc.gateway.stream_to_binary(GraphSource(kind="generator", name="gnp", value=spec), tmp_path / "gnp.gbin")
+    source = GraphSource(kind="binary", name="gnp", value=str(tmp_path / "gnp.gbin"))
+
+    key = svc.stream_sparsify(source, "random", {"p": 0.25}, str(tmp_path / "out.gbin"), chunk_size=1000)
+
+    # 2. nothing is loaded until the graph is used, the header keeps every node
+    H = svc.get_graph(key)
+    assert H._nx is None
+    assert H.metadata["edges_in"] == header.m and H.metadata["passes"] == 1
+    assert H.edge_count == H.metadata["edges_out"]
+    assert H.node_count == header.n
+    assert abs(H.edge_count / header.m - 0.25) < 0.05
+
+
+def test_streamed_local_degree_keeps_top_degree_neighbors(tmp_path):
+    # 1. setup: directed text edgelist, read back in small chunks
+    G = nx.gnm_random_graph(300, 3000, seed=2, directed=True)
+    path = tmp_path / "in.edgelist"
+    nx.write_edgelist(G, path, data=False)
+    source = GraphSource(kind="file", name="small", value=str(path), directed=True)
+
+    svc = _service()
+    key = svc.stream_sparsify(source, "local_degree", {"rho": 0.5}, str(tmp_path / "out.edgelist"), chunk_size=333)
+    graph = svc.get_graph(key)
+    H = graph.to_networkx(copy=False)
+    H = nx.relabel_nodes(H, dict(zip(H, graph.node_labels(H))))  # dense ids back to the file labels
+
+    # 2. every node keeps floor(d^rho) out-edges, none of them in a lower log2 degree bucket than a dropped one
+    out_degree = dict(G.out_degree())
+    bucket = {v: int(math.log2(d)) + 1 if d else 0 for v, d in out_degree.items()}
+    for v in G:
+        kept = [u for u in G.successors(v) if H.has_edge(v, u)]
+        dropped = [u for u in G.successors(v) if not H.has_edge(v, u)]
+        assert len(kept) == int(math.floor(out_degree[v] ** 0.5))
+        if kept and dropped:
+            assert min(bucket[u] for u in kept) >= max(bucket[u] for u in dropped)
+
+
+
+def test_local_degree_filter_cuts_do_not_depend_on_chunking():
+    # 1. setup: skewed degrees, so most nodes drop edges and need a histogram row
+    src, dst, _ = generate({"model": "chung_lu", "n": 3000, "avg_degree": 8, "seed": 3}).concat()
+
+    filters = []
+    for chunk_size in (len(src), 97):
+        edge_filter = LocalDegreeEdgeFilter(0.5)
+        edge_filter.prepare(lambda: ((src[i:i + chunk_size], dst[i:i + chunk_size], None)
+                                     for i in range(0, len(src), chunk_size)), 3000, False)
+        filters.append(edge_filter)
+
+    # 2. same cut buckets whatever the chunks; the pass-2 histogram counts as state
+    assert np.array_equal(filters[0].cut, filters[1].cut)
+    assert np.array_equal(filters[0].remaining, filters[1].remaining)
+    assert filters[0].histogram_bytes > 0
+    assert filters[0].state_bytes() >= filters[0].histogram_bytes + 3000 * (1 + 1 + 4 + 4)
+
+
+def test_streamed_local_degree_differs_from_run_only_inside_the_cut_bucket(tmp_path):
+    # 1. setup: the same directed graph through run() and through the stream
+    G = nx.gnm_random_graph(400, 4000, seed=5, directed=True)
+    svc = _service()
+    svc.graph_repo.save(Graph.from_networkx(G, name="gnm"))
+    exact = svc.run_sparsifier("gnm", "local_degree", {"rho": 0.6}).to_networkx(copy=False)
+
+    source = GraphSource(kind="memory", name="gnm", value=G, directed=True)
+    graph = svc.get_graph(svc.stream_sparsify(source, "local_degree", {"rho": 0.6},
+                                              str(tmp_path / "out.gbin"), chunk_size=500))
+    streamed = graph.to_networkx(copy=False)
+    streamed = nx.relabel_nodes(streamed, dict(zip(streamed, graph.node_labels(streamed))))
+    assert graph.metadata["approximate"] and graph.metadata["ranking"] == "log2_degree_bucket"
+
+    # 2. per node, the same number of kept neighbors from every log2 out-degree bucket
+    bucket = {v: int(math.log2(d)) + 1 if d else 0 for v, d in G.out_degree()}
+    differing = 0
+    for v in G:
+        ours, theirs = set(streamed.successors(v)), set(exact.successors(v))
+        assert sorted(bucket[u] for u in ours) == sorted(bucket[u] for u in theirs)
+        differing += len(ours - theirs)
+    # narrow degree spread: most cuts fall inside one bucket, where stream order decides
+    assert 0 < differing < exact.number_of_edges()
+
+
+def test_stream_sparsify_rejects_non_local_sparsifiers(tmp_path):
+    source = GraphSource(kind="memory", name="path", value=nx.path_graph(5))
+    with pytest.raises(ValueError):
+        _service().stream_sparsify(source, "k_neighbor", {}, str(tmp_path / "out.gbin"))
+
+
+def test_streaming_spanner_stretch_and_size():
+    # 1. setup
+    from src.domain.graph_model import Graph, RunParams
+    from src.domain.sparsifiers.registry import SparsifierRegistry
+
+    nx_g = nx.gnm_random_graph(300, 4000, seed=1)
+    k = 2
+    H = SparsifierRegistry.get("streaming_spanner").run(Graph.from_networkx(nx_g, name="gnm"), RunParams({"k": k}))
+    spanner = H.to_networkx(copy=True)
+
+    # 2. every dropped edge is spanned within 2k-1 hops, the size stays below n^{1+1/k} (girth > 2k)
+    for u, v in nx_g.edges():
+        assert nx.shortest_path_length(spanner, u, v) <= 2 * k - 1
+    assert H.edge_count < 300 ** (1 + 1 / k)
+    assert H.metadata["edges_per_second"] > 0
+    assert H.metadata["max_working_set"] >= 2 * H.edge_count
+
+
+def test_streaming_spanner_over_gateway_chunks(tmp_path):
+    svc = _service()
+    source = GraphSource(kind="generator", name="grid", value={"model": "grid", "rows": 30, "cols": 30})
+    key = svc.stream_sparsify(source, "streaming_spanner", {"k": 3}, str(tmp_path / "grid.gbin"), chunk_size=100)
+
+    H = svc.get_graph(key)
+    # the last streamed edge of every 4-cycle is already spanned within 3 <= 2k-1 hops
+    assert H.metadata["edges_out"] < H.metadata["edges_in"]
+    assert H.edge_count == H.metadata["spanner_edges"]
+    assert {"edges_per_second", "max_working_set", "state_bytes"} <= H.metadata.keys()
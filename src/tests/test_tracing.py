@@ -0,0 +1,37 @@
+from __future__ import annotations
+import json
+
+from src.application.experiment_service import ExperimentService
+from src.domain.common.tracing import Tracer
+from src.infrastructure.artifacts import write_chrome_trace
+from src.infrastructure.graph_gateway import GraphSource
+from src.infrastructure.persistence.stubs import InMemoryGraphRepository, InMemoryExperimentRepository
+
+
+def test_experiment_spans_and_trace_export(tmp_path):
+    # 1. setup (file source so the lazy load and parse show up)
+    path = tmp_path / "ring.edgelist"
+    path.write_text("\n".join(f"{i} {(i + 1) % 12}" for i in range(12)))
+
+    svc = ExperimentService(InMemoryGraphRepository(), InMemoryExperimentRepository())
+    gkey = svc.import_graph(GraphSource(kind="file", value=str(path), name="ring"))
+
+    # 2. running with exact per-span memory tracking
+    dto = svc.run_experiment(gkey, "random", ["diameter", "degree_distribution"], {"p": 0.5},
+                             tracer=Tracer(memory="tracemalloc"))
+
+    names = [s.name for s in dto.spans]
+    for expected in ("load", "parse", "transform", "metric:diameter", "metric:degree_distribution", "commit"):
+        assert expected in names
+
+    load = next(s for s in dto.spans if s.name == "load")
+    parse = next(s for s in dto.spans if s.name == "parse")
+    assert parse.depth == load.depth + 1
+    assert load.attrs["edges"] == 12
+    assert all(s.wall_time >= 0 and s.peak_memory is not None for s in dto.spans)
+
+    # 3. chrome trace export
+    out = write_chrome_trace(dto.spans, tmp_path / "trace.json")
+    events = json.loads(open(out).read())["traceEvents"]
+    assert len(events) == len(dto.spans)
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
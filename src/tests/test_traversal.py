@@ -0,0 +1,42 @@
+from __future__ import annotations
+import networkx as nx
+import numpy as np
+
+from src.domain.csr import CSRGraph
+from src.domain.graph_model import Graph, RunParams
+from src.domain.metrics.registry import MetricRegistry
+from src.domain.traversal import MultiSourceBFS, largest_component
+
+
+def test_distances_match_networkx_bfs():
+    # 1. setup: a directed graph and more sources than one 64-bit word
+    nx_g = nx.gnm_random_graph(150, 400, seed=2, directed=True)
+    csr = CSRGraph.from_networkx(nx_g)
+    sources = np.arange(csr.n)
+
+    # 2. every row equals a networkx single-source BFS
+    for words in (1, 2):
+        engine = MultiSourceBFS(csr, words=words)
+        dist = engine.distances_from(sources)
+        for s in (0, 70, 149):
+            expected = np.full(csr.n, -1)
+            for v, d in nx.single_source_shortest_path_length(nx_g, csr.nodes[s]).items():
+                expected[csr.index[v]] = d
+            assert (dist[s] == expected).all()
+
+        # 3. summaries agree with the distance rows
+        summary = engine.summarize(sources)
+        assert (summary.eccentricity == dist.max(axis=1)).all()
+        assert (summary.reached == (dist >= 0).sum(axis=1)).all()
+        assert (summary.distance_sum == np.where(dist >= 0, dist, 0).sum(axis=1)).all()
+
+
+def test_distance_metrics_match_networkx():
+    nx_g = nx.gnm_random_graph(200, 230, seed=1)
+    G = Graph.from_networkx(nx_g, name="sparse")
+    cc = nx_g.subgraph(max(nx.connected_components(nx_g), key=len))
+
+    assert len(largest_component(G.to_csr())) == len(cc)
+    assert MetricRegistry.get("diameter").compute(G, RunParams({})).summary["diameter"] == nx.diameter(cc)
+    avg = MetricRegistry.get("avg_path_length").compute(G, RunParams({})).summary["avg"]
+    assert np.isclose(avg, nx.average_shortest_path_length(cc))
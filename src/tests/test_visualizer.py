@@ -0,0 +1,33 @@
+from __future__ import annotations
+import os
+
+import networkx as nx
+import numpy as np
+
+from src.interfaces.layout import edge_index_arrays, multilevel_layout, rasterize_edges
+from src.interfaces.visualizer import cached_layout
+
+
+def test_multilevel_layout_and_raster():
+    # 1. setup
+    G = nx.grid_2d_graph(40, 40)
+    nodes, src, dst = edge_index_arrays(G)
+
+    # 2. layout covers every node inside [-1, 1]
+    pos = multilevel_layout(len(nodes), src, dst, seed=1, coarsest=50)
+    assert pos.shape == (len(nodes), 2)
+    assert np.isfinite(pos).all() and np.abs(pos).max() <= 1.0 + 1e-9
+
+    # 3. every edge lands in the histogram
+    image = rasterize_edges(pos, src, dst, resolution=64, bounds=(-1.0, 1.0, -1.0, 1.0))
+    assert image.shape == (64, 64)
+    assert image.sum() >= 2 * len(src)
+
+
+def test_cached_layout_roundtrip(tmp_path):
+    G = nx.gnm_random_graph(30, 60, seed=3)
+    first = cached_layout(G, cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+
+    second = cached_layout(G, cache_dir=str(tmp_path))
+    assert all(np.allclose(first[v], second[v]) for v in G.nodes())